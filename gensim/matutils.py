@@ -1099,6 +1099,57 @@ def jaccard_distance(set1, set2):
     return 1. - float(len(set1 & set2)) / float(union_cardinality)
 
 
+def kmeans(data, k, iterations, rand):
+    """Cluster the rows of `data` into `k` clusters with Lloyd's algorithm.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Matrix of shape (num_points, dim).
+    k : int
+        Number of clusters, must be `<= num_points`.
+    iterations : int
+        Number of Lloyd iterations.
+    rand : :class:`numpy.random.RandomState`
+        Random state used to pick the initial centroids.
+
+    Returns
+    -------
+    numpy.ndarray
+        Centroids of shape (k, dim).
+
+    """
+    centroids = data[rand.choice(len(data), k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = nearest_centroids(data, centroids)
+        counts = np.bincount(assignment, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, data)
+        nonempty = counts > 0
+        centroids[nonempty] = sums[nonempty] / counts[nonempty, np.newaxis]
+    return centroids
+
+
+def nearest_centroids(data, centroids):
+    """Get the index of the closest centroid (by euclidean distance) for each row of `data`.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Matrix of shape (num_points, dim).
+    centroids : numpy.ndarray
+        Matrix of shape (num_centroids, dim).
+
+    Returns
+    -------
+    numpy.ndarray
+        Index of the closest centroid, for each row of `data`.
+
+    """
+    dists = (centroids ** 2).sum(axis=1) - 2 * np.dot(data, centroids.T)
+    return dists.argmin(axis=1)
+
+
 try:
     # try to load fast, cythonized code if possible
     from gensim._matutils import logsumexp, mean_absolute_difference, dirichlet_expectation
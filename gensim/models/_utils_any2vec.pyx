@@ -145,3 +145,74 @@ cpdef compute_ngrams_bytes(word, unsigned int min_n, unsigned int max_n):
                 ngrams.append(ngram)
             n += 1
     return ngrams
+
+
+cpdef ft_ngram_hashes_bytes_batch(words, unsigned int min_n, unsigned int max_n, unsigned int num_buckets):
+    """Hash the ngrams of many words at once, in CSR form.
+
+    The ngrams are the same as those of :func:`compute_ngrams_bytes`, hashed with :func:`ft_hash_bytes`,
+    but the hashes are computed incrementally over the UTF-8 bytes, without creating the ngrams themselves.
+
+    Parameters
+    ----------
+    words : list of str
+        The words whose ngrams need to be hashed.
+    min_n : unsigned int
+        The minimum ngram length.
+    max_n : unsigned int
+        The maximum ngram length.
+    num_buckets : unsigned int
+        The number of buckets.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        `indptr` (int64) and `indices` (uint32): the buckets of the i-th word are `indices[indptr[i]:indptr[i + 1]]`.
+
+    """
+    if num_buckets == 0:
+        raise ValueError("cannot hash ngrams into zero buckets")
+
+    cdef list encoded = [('<%s>' % word).encode("utf-8") for word in words]
+    cdef Py_ssize_t num_words = len(encoded)
+    cdef Py_ssize_t capacity = 0
+    cdef bytes utf8_word
+
+    # each ngram starts at a character, and at most (max_n - min_n + 1) ngrams start at any character
+    for utf8_word in encoded:
+        capacity += len(utf8_word)
+    capacity *= max_n - min(min_n, max_n) + 1
+
+    indptr = np.zeros(num_words + 1, dtype=np.int64)
+    indices = np.empty(capacity, dtype=np.uint32)
+    cdef np.int64_t[:] indptr_view = indptr
+    cdef np.uint32_t[:] indices_view = indices
+
+    cdef const unsigned char *bytez
+    cdef size_t num_bytes, i, j, n
+    cdef Py_ssize_t w, pos = 0
+    cdef uint32_t h
+
+    for w in range(num_words):
+        utf8_word = encoded[w]
+        bytez = utf8_word
+        num_bytes = len(utf8_word)
+        for i in range(num_bytes):
+            if bytez[i] & _MB_MASK == _MB_START:
+                continue
+
+            h = 2166136261
+            j, n = i, 1
+            while j < num_bytes and n <= max_n:
+                h = (h ^ <uint32_t>(<int8_t>bytez[j])) * 16777619
+                j += 1
+                while j < num_bytes and (bytez[j] & _MB_MASK) == _MB_START:
+                    h = (h ^ <uint32_t>(<int8_t>bytez[j])) * 16777619
+                    j += 1
+                if n >= min_n and not (n == 1 and (i == 0 or j == num_bytes)):
+                    indices_view[pos] = h % num_buckets
+                    pos += 1
+                n += 1
+        indptr_view[w + 1] = pos
+
+    return indptr, indices[:pos].copy()
@@ -385,6 +385,8 @@ class Doc2Vec(BaseWordEmbeddingsModel):
         """Resets the current word vectors. """
         self.wv.vectors_norm = None
         self.wv.vectors_docs_norm = None
+        self.wv.norms = None
+        self.docvecs.norms = None
 
     def reset_from(self, other_model):
         """Copy shareable data structures from another (possibly pre-trained) model.
@@ -813,7 +815,7 @@ class Doc2Vec(BaseWordEmbeddingsModel):
                 fname, prefix=prefix, fvocab=fvocab, total_vec=total_vec,
                 binary=binary, write_first_line=write_first_line)
 
-    def init_sims(self, replace=False):
+    def init_sims(self, replace=False, norms_only=False):
         """Pre-compute L2-normalized vectors.
 
         Parameters
@@ -821,9 +823,11 @@ class Doc2Vec(BaseWordEmbeddingsModel):
         replace : bool
             If True - forget the original vectors and only keep the normalized ones to saved RAM (also you can't
             continue training if call it with `replace=True`).
+        norms_only : bool
+            If True - only keep the L2 norms of the vectors, and normalize inside the similarity computations.
 
         """
-        self.docvecs.init_sims(replace=replace)
+        self.docvecs.init_sims(replace=replace, norms_only=norms_only)
 
     @classmethod
     def load(cls, *args, **kwargs):
@@ -590,6 +590,8 @@ class FastText(BaseWordEmbeddingsModel):
             >>> model.train(sentences_2, total_examples=model.corpus_count, epochs=model.epochs)
 
         """
+        if self.wv.bucket_rows is not None:
+            raise RuntimeError("cannot update the vocabulary of a model whose ngram buckets were pruned")
         if not update:
             self.wv.init_ngrams_weights(self.trainables.seed)
         elif not len(self.wv.vocab):
@@ -628,6 +630,8 @@ class FastText(BaseWordEmbeddingsModel):
         self.wv.vectors_norm = None
         self.wv.vectors_vocab_norm = None
         self.wv.vectors_ngrams_norm = None
+        self.wv.norms = None
+        self.wv.ngram_norms = None
         self.wv.buckets_word = None
 
     def estimate_memory(self, vocab_size=None, report=None):
@@ -798,13 +802,16 @@ class FastText(BaseWordEmbeddingsModel):
         if sentences is not None and not isinstance(sentences, Iterable):
             raise TypeError("sentences must be an iterable of list, got %r instead" % sentences)
 
+        if self.wv.bucket_rows is not None:
+            raise RuntimeError("cannot continue training a model whose ngram buckets were pruned")
+
         super(FastText, self).train(
             sentences=sentences, corpus_file=corpus_file, total_examples=total_examples, total_words=total_words,
             epochs=epochs, start_alpha=start_alpha, end_alpha=end_alpha, word_count=word_count,
             queue_factor=queue_factor, report_delay=report_delay, callbacks=callbacks)
         self.wv.adjust_vectors()
 
-    def init_sims(self, replace=False):
+    def init_sims(self, replace=False, norms_only=False):
         """
         Precompute L2-normalized vectors.
 
@@ -812,6 +819,8 @@ class FastText(BaseWordEmbeddingsModel):
         ----------
         replace : bool
             If True, forget the original vectors and only keep the normalized ones to save RAM.
+        norms_only : bool
+            If True, only keep the L2 norms of the vectors, and normalize inside the similarity computations.
 
         """
         # init_sims() resides in KeyedVectors because it deals with input layer mainly, but because the
@@ -819,7 +828,7 @@ class FastText(BaseWordEmbeddingsModel):
         # The normalizing of input layer happens inside of KeyedVectors.
         if replace and hasattr(self.trainables, 'syn1'):
             del self.trainables.syn1
-        self.wv.init_sims(replace)
+        self.wv.init_sims(replace=replace, norms_only=norms_only)
 
     def clear_sims(self):
         """Remove all L2-normalized word vectors from the model, to free up memory.
@@ -895,7 +904,7 @@ class FastText(BaseWordEmbeddingsModel):
 
         """
         kwargs['ignore'] = kwargs.get(
-            'ignore', ['vectors_norm', 'vectors_vocab_norm', 'vectors_ngrams_norm', 'buckets_word'])
+            'ignore', ['vectors_norm', 'vectors_vocab_norm', 'vectors_ngrams_norm', 'buckets_word', 'ngram_cache'])
         super(FastText, self).save(*args, **kwargs)
 
     @classmethod
@@ -1322,5 +1331,7 @@ def save_facebook_model(model, path, encoding="utf-8", lr_update_rate=100, word_
     -------
     None
     """
+    if model.wv.bucket_rows is not None:
+        raise ValueError("the Facebook format cannot store a model whose ngram buckets were pruned")
     fb_fasttext_parameters = {"lr_update_rate": lr_update_rate, "word_ngrams": word_ngrams}
     gensim.models._fasttext_bin.save(model, path, fb_fasttext_parameters, encoding)
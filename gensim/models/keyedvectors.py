@@ -160,9 +160,13 @@ and so on.
 
 from __future__ import division  # py3 "true division"
 
+from collections import OrderedDict
 from itertools import chain
 import logging
+from mmap import mmap as memory_map, ACCESS_READ
+from multiprocessing.pool import ThreadPool
 from numbers import Integral
+import os
 
 try:
     from queue import Queue, Empty
@@ -177,13 +181,19 @@ import numpy as np
 from gensim import utils, matutils  # utility fnc for pickling, common scipy operations etc
 from gensim.corpora.dictionary import Dictionary
 from six import string_types, integer_types
-from six.moves import zip, range
-from scipy import stats
+from six.moves import zip, range, map
+from scipy import sparse, stats
 from gensim.utils import deprecated
 from gensim.models.utils_any2vec import (
     _save_word2vec_format,
     _load_word2vec_format,
+    _load_word_counts,
+    _is_seekable_local,
+    _word2vec_scan_binary,
+    _word2vec_scan_text,
+    _word2vec_read_vector,
     ft_ngram_hashes,
+    ft_ngram_hashes_batch,
 )
 from gensim.similarities.termsim import TermSimilarityIndex, SparseTermSimilarityMatrix
 
@@ -379,6 +389,7 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
     def __init__(self, vector_size):
         super(WordEmbeddingsKeyedVectors, self).__init__(vector_size=vector_size)
         self.vectors_norm = None
+        self.norms = None
         self.index2word = []
 
     @property
@@ -386,6 +397,24 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
     def wv(self):
         return self
 
+    def add(self, entities, weights, replace=False):
+        """Append entities and theirs vectors in a manual way.
+
+        See :meth:`~gensim.models.keyedvectors.BaseKeyedVectors.add` for the parameters. If only the L2 norms
+        of the vectors are kept (`init_sims(norms_only=True)`), the norms of the new and replaced vectors
+        are computed too.
+
+        """
+        if isinstance(entities, string_types):
+            entities = [entities]
+            weights = np.array(weights).reshape(1, -1)
+        replaced = [self.vocab[entity].index for entity in entities if entity in self.vocab] if replace else []
+        super(WordEmbeddingsKeyedVectors, self).add(entities, weights, replace=replace)
+        if getattr(self, 'norms', None) is not None:
+            self.norms = np.concatenate((self.norms, _row_norms(self.vectors[len(self.norms):])))
+            if replaced:
+                self.norms[replaced] = _row_norms(self.vectors[replaced])
+
     @property
     def index2entity(self):
         return self.index2word
@@ -457,10 +486,12 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
 
         """
         if word in self.vocab:
+            index = self.vocab[word].index
             if use_norm:
-                result = self.vectors_norm[self.vocab[word].index]
+                vectors, norms = self._normalized_rows()
+                result = vectors[index] if norms is None else _upcast(vectors[index]) / norms[index]
             else:
-                result = self.vectors[self.vocab[word].index]
+                result = self.vectors[index]
 
             result.setflags(write=False)
             return result
@@ -488,7 +519,8 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
         """
         return super(WordEmbeddingsKeyedVectors, self).closer_than(w1, w2)
 
-    def most_similar(self, positive=None, negative=None, topn=10, restrict_vocab=None, indexer=None):
+    def most_similar(self, positive=None, negative=None, topn=10, restrict_vocab=None, indexer=None,
+                     blocksize=None, workers=1):
         """Find the top-N most similar words.
         Positive words contribute positively towards the similarity, negative words negatively.
 
@@ -511,6 +543,12 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
             are searched for most-similar values. For example, restrict_vocab=10000 would
             only check the first 10000 word vectors in the vocabulary order. (This may be
             meaningful if you've sorted the vocabulary by descending frequency.)
+        blocksize : int, optional
+            If set, scan the vectors in blocks of `blocksize` rows and keep only a running top-N,
+            instead of computing the similarities to the whole vocabulary at once. The result is exact,
+            but the extra memory stays proportional to `blocksize + topn`. Ignored if `topn` is None.
+        workers : int, optional
+            Number of threads that scan the blocks in parallel, used only if `blocksize` is set.
 
         Returns
         -------
@@ -534,6 +572,113 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
             # allow calls like most_similar('dog'), as a shorthand for most_similar(['dog'])
             positive = [positive]
 
+        mean, all_words = self._weighted_mean(positive, negative)
+
+        if indexer is not None and isinstance(topn, int):
+            return indexer.most_similar(mean, topn)
+
+        limited, norms = self._normalized_rows(restrict_vocab)
+        if topn and blocksize:
+            best, dists = _blocked_topn(limited, mean, topn + len(all_words), blocksize, workers=workers, norms=norms)
+            # ignore (don't return) words from the input
+            result = [(self.index2word[sim], float(dist)) for sim, dist in zip(best, dists) if sim not in all_words]
+            return result[:topn]
+
+        dists = _dot_normed(limited, norms, mean)
+        if not topn:
+            return dists
+        best = matutils.argsort(dists, topn=topn + len(all_words), reverse=True)
+        # ignore (don't return) words from the input
+        result = [(self.index2word[sim], float(dists[sim])) for sim in best if sim not in all_words]
+        return result[:topn]
+
+    def _normalized_rows(self, restrict_vocab=None):
+        """Get the vectors to compute cosine similarities against, and the norms to divide their dot products by.
+
+        Parameters
+        ----------
+        restrict_vocab : int, optional
+            Only return the first `restrict_vocab` rows.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            `vectors_norm` and None, or `vectors` and their L2 norms if :meth:`init_sims`
+            was called with `norms_only=True`.
+
+        """
+        if self.vectors_norm is None and getattr(self, 'norms', None) is not None:
+            vectors, norms = self.vectors, self.norms
+        else:
+            vectors, norms = self.vectors_norm, None
+        if restrict_vocab is not None:
+            vectors = vectors[:restrict_vocab]
+            norms = None if norms is None else norms[:restrict_vocab]
+        return vectors, norms
+
+    def _unit_rows(self, indexes):
+        """Get the L2-normalized vectors at positions `indexes`, as a float32 matrix.
+
+        Call :meth:`init_sims` first.
+
+        """
+        vectors, norms = self._normalized_rows()
+        rows = vectors[indexes].astype(REAL)
+        return rows if norms is None else rows / norms[indexes, newaxis]
+
+    def _similarities_to(self, queries, restrict_vocab=None):
+        """Get the dot products of `queries` with the L2-normalized vectors.
+
+        Call :meth:`init_sims` first.
+
+        Parameters
+        ----------
+        queries : numpy.ndarray
+            Query vectors, of shape (num_queries, vector_size).
+        restrict_vocab : int, optional
+            Only score the first `restrict_vocab` vectors.
+
+        Returns
+        -------
+        numpy.ndarray
+            Cosine similarities of unit-length queries, of shape (num_queries, number of scored vectors).
+
+        """
+        limited, norms = self._normalized_rows(restrict_vocab)
+        return _dot_normed(limited, norms, queries.T).T
+
+    def get_normed_vectors(self):
+        """Get all L2-normalized vectors as a matrix, e.g. to build a similarity index from them.
+
+        Returns
+        -------
+        numpy.ndarray
+            `vectors_norm`, or a new normalized copy of `vectors` if only their norms are stored.
+
+        """
+        self.init_sims()
+        vectors, norms = self._normalized_rows()
+        if norms is None:
+            return vectors
+        return _upcast(vectors) / norms[:, newaxis]
+
+    def _weighted_mean(self, positive, negative):
+        """Compute the unit-length weighted mean of the input words / vectors, helper for
+        :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.most_similar`.
+
+        Parameters
+        ----------
+        positive : list of {str, numpy.ndarray, (str, float), (numpy.ndarray, float)}
+            Words or vectors that contribute positively, with an optional explicit weight.
+        negative : list of {str, numpy.ndarray, (str, float), (numpy.ndarray, float)}
+            Words or vectors that contribute negatively, with an optional explicit weight.
+
+        Returns
+        -------
+        (numpy.ndarray, set of int)
+            The L2-normalized mean vector, and indexes of the input words found in the vocabulary.
+
+        """
         # add weights for each word, if not already present; default to 1.0 for positive and -1.0 for negative words
         positive = [
             (word, 1.0) if isinstance(word, string_types + (ndarray,)) else word
@@ -548,28 +693,99 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
         all_words, mean = set(), []
         for word, weight in positive + negative:
             if isinstance(word, ndarray):
-                mean.append(weight * word)
+                mean.append(weight * _upcast(word))
             else:
-                mean.append(weight * self.word_vec(word, use_norm=True))
+                mean.append(weight * _upcast(self.word_vec(word, use_norm=True)))
                 if word in self.vocab:
                     all_words.add(self.vocab[word].index)
         if not mean:
             raise ValueError("cannot compute similarity with no input")
         mean = matutils.unitvec(array(mean).mean(axis=0)).astype(REAL)
+        return mean, all_words
 
-        if indexer is not None and isinstance(topn, int):
-            return indexer.most_similar(mean, topn)
+    def most_similar_batch(self, positive, negative=None, topn=10, restrict_vocab=None, chunksize=256):
+        """Find the top-N most similar words for many queries at once.
 
-        limited = self.vectors_norm if restrict_vocab is None else self.vectors_norm[:restrict_vocab]
-        dists = dot(limited, mean)
-        if not topn:
-            return dists
-        best = matutils.argsort(dists, topn=topn + len(all_words), reverse=True)
-        # ignore (don't return) words from the input
-        result = [(self.index2word[sim], float(dists[sim])) for sim in best if sim not in all_words]
-        return result[:topn]
+        Gives the same results as calling :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.most_similar`
+        once per query, but the similarities of a whole chunk of queries are computed with a single
+        matrix-matrix multiplication against `vectors_norm`, followed by a partial sort of each row.
+        Quantized vectors score each query with
+        :meth:`~gensim.models.keyedvectors.QuantizedKeyedVectors.cosine_similarities_to` instead.
+
+        Parameters
+        ----------
+        positive : list of {str, numpy.ndarray, list of {str, numpy.ndarray}}
+            One item per query: the word(s) or vector(s) that contribute positively to that query.
+        negative : list of {str, numpy.ndarray, list of {str, numpy.ndarray}}, optional
+            One item per query, aligned with `positive`: the word(s) or vector(s) that contribute negatively.
+        topn : int, optional
+            Number of top-N similar words to return for each query.
+        restrict_vocab : int, optional
+            Optional integer which limits the range of vectors which
+            are searched for most-similar values. For example, restrict_vocab=10000 would
+            only check the first 10000 word vectors in the vocabulary order. (This may be
+            meaningful if you've sorted the vocabulary by descending frequency.)
+        chunksize : int, optional
+            Number of queries scored by a single matrix multiplication. The temporary similarity matrix
+            holds `chunksize x len(vocab)` floats.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            Indexes of the most similar words (positions in `index2word`) and their cosine similarities,
+            both of shape `(len(positive), topn)`. Each row is ordered by decreasing similarity.
+            Words from the query itself are never returned: a row with fewer than `topn` words left is padded
+            with index -1 and similarity `-inf`, and `topn` is reduced if no row has that many words left.
+
+        Examples
+        --------
+        .. sourcecode:: pycon
+
+            >>> from gensim.test.utils import common_texts
+            >>> from gensim.models import Word2Vec
+            >>>
+            >>> wv = Word2Vec(common_texts, size=20, min_count=1).wv
+            >>> ids, sims = wv.most_similar_batch(['graph', 'trees', ['human', 'computer']], topn=3)
+            >>> ids.shape
+            (3, 3)
+
+        """
+        if negative is None:
+            negative = [[] for _ in positive]
+        if len(positive) != len(negative):
+            raise ValueError("positive and negative must contain one item per query")
 
-    def similar_by_word(self, word, topn=10, restrict_vocab=None):
+        self.init_sims()
+        num_words = len(self.index2word) if restrict_vocab is None else min(restrict_vocab, len(self.index2word))
+
+        means, inputs = [], []
+        for pos, neg in zip(positive, negative):
+            if isinstance(pos, string_types + (ndarray,)):
+                pos = [pos]
+            if isinstance(neg, string_types + (ndarray,)):
+                neg = [neg]
+            mean, all_words = self._weighted_mean(pos, neg)
+            means.append(mean)
+            inputs.append([index for index in all_words if index < num_words])
+        # words from the input are never returned, so a row has at most `num_words - len(excluded)` results
+        topn = max(0, min(int(topn), num_words - min([len(excluded) for excluded in inputs] or [0])))
+
+        ids = zeros((len(means), topn), dtype=np.int64)
+        sims = zeros((len(means), topn), dtype=REAL)
+        if not means or not topn:
+            return ids, sims
+
+        for chunk_start in range(0, len(means), chunksize):
+            chunk_end = min(len(means), chunk_start + chunksize)
+            dists = self._similarities_to(vstack(means[chunk_start:chunk_end]), restrict_vocab)
+            for row, excluded in enumerate(inputs[chunk_start:chunk_end]):
+                # ignore (don't return) words from the input
+                dists[row, excluded] = -np.inf
+            ids[chunk_start:chunk_end], sims[chunk_start:chunk_end] = _argsort_rows(dists, topn)
+        ids[sims == -np.inf] = -1  # rows with more input words than the others run out of words
+        return ids, sims
+
+    def similar_by_word(self, word, topn=10, restrict_vocab=None, blocksize=None, workers=1):
         """Find the top-N most similar words.
 
         Parameters
@@ -584,6 +800,12 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
             are searched for most-similar values. For example, restrict_vocab=10000 would
             only check the first 10000 word vectors in the vocabulary order. (This may be
             meaningful if you've sorted the vocabulary by descending frequency.)
+        blocksize : int, optional
+            If set, scan the vectors in blocks of `blocksize` rows and keep only a running top-N,
+            instead of computing the similarities to the whole vocabulary at once. The result is exact,
+            but the extra memory stays proportional to `blocksize + topn`. Ignored if `topn` is None.
+        workers : int, optional
+            Number of threads that scan the blocks in parallel, used only if `blocksize` is set.
 
         Returns
         -------
@@ -593,9 +815,10 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
             one-dimensional numpy array with the size of the vocabulary.
 
         """
-        return self.most_similar(positive=[word], topn=topn, restrict_vocab=restrict_vocab)
+        return self.most_similar(
+            positive=[word], topn=topn, restrict_vocab=restrict_vocab, blocksize=blocksize, workers=workers)
 
-    def similar_by_vector(self, vector, topn=10, restrict_vocab=None):
+    def similar_by_vector(self, vector, topn=10, restrict_vocab=None, blocksize=None, workers=1):
         """Find the top-N most similar words by vector.
 
         Parameters
@@ -610,6 +833,12 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
             are searched for most-similar values. For example, restrict_vocab=10000 would
             only check the first 10000 word vectors in the vocabulary order. (This may be
             meaningful if you've sorted the vocabulary by descending frequency.)
+        blocksize : int, optional
+            If set, scan the vectors in blocks of `blocksize` rows and keep only a running top-N,
+            instead of computing the similarities to the whole vocabulary at once. The result is exact,
+            but the extra memory stays proportional to `blocksize + topn`. Ignored if `topn` is None.
+        workers : int, optional
+            Number of threads that scan the blocks in parallel, used only if `blocksize` is set.
 
         Returns
         -------
@@ -619,7 +848,8 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
             one-dimensional numpy array with the size of the vocabulary.
 
         """
-        return self.most_similar(positive=[vector], topn=topn, restrict_vocab=restrict_vocab)
+        return self.most_similar(
+            positive=[vector], topn=topn, restrict_vocab=restrict_vocab, blocksize=blocksize, workers=workers)
 
     @deprecated(
         "Method will be removed in 4.0.0, use "
@@ -841,8 +1071,8 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
 
         # equation (4) of Levy & Goldberg "Linguistic Regularities...",
         # with distances shifted to [0,1] per footnote (7)
-        pos_dists = [((1 + dot(self.vectors_norm, term)) / 2) for term in positive]
-        neg_dists = [((1 + dot(self.vectors_norm, term)) / 2) for term in negative]
+        pos_dists = (1 + self._similarities_to(vstack([_upcast(term) for term in positive]))) / 2
+        neg_dists = (1 + self._similarities_to(vstack([_upcast(term) for term in negative]))) / 2 if negative else []
         dists = prod(pos_dists, axis=0) / (prod(neg_dists, axis=0) + 0.000001)
 
         if not topn:
@@ -971,7 +1201,7 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
             Cosine similarity between `w1` and `w2`.
 
         """
-        return dot(matutils.unitvec(self[w1]), matutils.unitvec(self[w2]))
+        return dot(matutils.unitvec(_upcast(self[w1])), matutils.unitvec(_upcast(self[w2])))
 
     def n_similarity(self, ws1, ws2):
         """Compute cosine similarity between two sets of words.
@@ -1017,7 +1247,8 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
             logger.info("%s: %.1f%% (%i/%i)", section['section'], 100.0 * score, correct, correct + incorrect)
             return score
 
-    def evaluate_word_analogies(self, analogies, restrict_vocab=300000, case_insensitive=True, dummy4unknown=False):
+    def evaluate_word_analogies(self, analogies, restrict_vocab=300000, case_insensitive=True, dummy4unknown=False,
+                                method='3CosAdd', chunksize=256, workers=1):
         """Compute performance of the model on an analogy test set.
 
         This is modern variant of :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.accuracy`, see
@@ -1026,6 +1257,8 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
         The accuracy is reported (printed to log and returned as a score) for each section separately,
         plus there's one aggregate summary at the end.
 
+        All questions of a section are solved together, with one matrix multiplication per chunk of questions.
+
         This method corresponds to the `compute-accuracy` script of the original C word2vec.
         See also `Analogy (State of the art) <https://aclweb.org/aclwiki/Analogy_(State_of_the_art)>`_.
 
@@ -1046,6 +1279,15 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
         dummy4unknown : bool, optional
             If True - produce zero accuracies for 4-tuples with out-of-vocabulary words.
             Otherwise, these tuples are skipped entirely and not used in the evaluation.
+        method : {'3CosAdd', '3CosMul'}, optional
+            Find the answer with the vector offset method, as in
+            :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.most_similar`, or with the multiplicative
+            objective of :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.most_similar_cosmul`.
+        chunksize : int, optional
+            Number of questions solved by a single matrix multiplication. The temporary similarity matrix
+            holds `chunksize x restrict_vocab` floats (three of them for '3CosMul').
+        workers : int, optional
+            Number of threads solving chunks of questions in parallel.
 
         Returns
         -------
@@ -1057,6 +1299,8 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
             keys 'correct' and 'incorrect'.
 
         """
+        if method not in ('3CosAdd', '3CosMul'):
+            raise ValueError("unknown analogy method %r, expected '3CosAdd' or '3CosMul'" % method)
         ok_vocab = [(w, self.vocab[w]) for w in self.index2word[:restrict_vocab]]
         ok_vocab = {w.upper(): v for w, v in reversed(ok_vocab)} if case_insensitive else dict(ok_vocab)
         oov = 0
@@ -1070,8 +1314,7 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
                     # a new section starts => store the old section
                     if section:
                         sections.append(section)
-                        self._log_evaluate_word_analogies(section)
-                    section = {'section': line.lstrip(': ').strip(), 'correct': [], 'incorrect': []}
+                    section = {'section': line.lstrip(': ').strip(), 'questions': []}
                 else:
                     if not section:
                         raise ValueError("Missing section header before line #%i in %s" % (line_no, analogies))
@@ -1088,31 +1331,42 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
                         oov += 1
                         if dummy4unknown:
                             logger.debug('Zero accuracy for line #%d with OOV words: %s', line_no, line.strip())
-                            section['incorrect'].append((a, b, c, expected))
+                            section['questions'].append(((a, b, c, expected), None))
                         else:
                             logger.debug("Skipping line #%i with OOV words: %s", line_no, line.strip())
                         continue
-                    original_vocab = self.vocab
-                    self.vocab = ok_vocab
-                    ignore = {a, b, c}  # input words to be ignored
-                    predicted = None
-                    # find the most likely prediction using 3CosAdd (vector offset) method
-                    # TODO: implement 3CosMul and set-based methods for solving analogies
-                    sims = self.most_similar(positive=[b, c], negative=[a], topn=5, restrict_vocab=restrict_vocab)
-                    self.vocab = original_vocab
-                    for element in sims:
-                        predicted = element[0].upper() if case_insensitive else element[0]
-                        if predicted in ok_vocab and predicted not in ignore:
-                            if predicted != expected:
-                                logger.debug("%s: expected %s, predicted %s", line.strip(), expected, predicted)
-                            break
-                    if predicted == expected:
-                        section['correct'].append((a, b, c, expected))
-                    else:
-                        section['incorrect'].append((a, b, c, expected))
+                    section['questions'].append(((a, b, c, expected), line))
         if section:
             # store the last section, too
             sections.append(section)
+
+        for section in sections:
+            questions = section.pop('questions')
+            section['correct'], section['incorrect'] = [], []
+            indexes = np.array([
+                [ok_vocab[word].index for word in quadruplet[:3]]
+                for quadruplet, line in questions if line is not None
+            ], dtype=np.int64).reshape(-1, 3)
+            # find the most likely predictions using 3CosAdd (vector offset) or 3CosMul
+            candidates = iter(self._solve_analogies(
+                indexes, topn=5, restrict_vocab=restrict_vocab, method=method, chunksize=chunksize, workers=workers))
+            for (a, b, c, expected), line in questions:
+                if line is None:
+                    # zero accuracy for 4-tuples with OOV words
+                    section['incorrect'].append((a, b, c, expected))
+                    continue
+                ignore = {a, b, c}  # input words to be ignored
+                predicted = None
+                for index in next(candidates):
+                    predicted = self.index2word[index].upper() if case_insensitive else self.index2word[index]
+                    if predicted in ok_vocab and predicted not in ignore:
+                        if predicted != expected:
+                            logger.debug("%s: expected %s, predicted %s", line.strip(), expected, predicted)
+                        break
+                if predicted == expected:
+                    section['correct'].append((a, b, c, expected))
+                else:
+                    section['incorrect'].append((a, b, c, expected))
             self._log_evaluate_word_analogies(section)
 
         total = {
@@ -1133,6 +1387,60 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
         # Return the overall score and the full lists of correct and incorrect analogies
         return analogies_score, sections
 
+    def _solve_analogies(self, questions, topn=5, restrict_vocab=None, method='3CosAdd', chunksize=256, workers=1):
+        """Find the best answers to many analogy questions "`a` is to `b` as `c` is to ?" at once, helper for
+        :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.evaluate_word_analogies`.
+
+        Parameters
+        ----------
+        questions : numpy.ndarray
+            Indexes of the words `a`, `b` and `c` of each question, of shape (num_questions, 3).
+        topn : int, optional
+            Number of answers to return for each question.
+        restrict_vocab : int, optional
+            Only look for answers among the first `restrict_vocab` words.
+        method : {'3CosAdd', '3CosMul'}, optional
+            Score the answers like :meth:`most_similar` or like :meth:`most_similar_cosmul`.
+        chunksize : int, optional
+            Number of questions scored by a single matrix multiplication.
+        workers : int, optional
+            Number of threads scoring chunks in parallel.
+
+        Returns
+        -------
+        numpy.ndarray
+            Indexes of the best answers of each question, of shape (num_questions, topn), best first.
+            The words of the question itself are never returned.
+
+        """
+        self.init_sims()
+        num_words = len(self.index2word) if restrict_vocab is None else min(restrict_vocab, len(self.index2word))
+        topn = min(topn, num_words)
+
+        def solve_chunk(start):
+            chunk = questions[start:start + chunksize]
+            a, b, c = (self._unit_rows(chunk[:, i]) for i in range(3))
+            if method == '3CosMul':
+                # equation (4) of Levy & Goldberg, as in most_similar_cosmul
+                sim_a, sim_b, sim_c = ((1 + self._similarities_to(m, restrict_vocab)) / 2 for m in (a, b, c))
+                dists = sim_b * sim_c / (sim_a + 0.000001)
+            else:
+                means = b + c - a
+                means /= sqrt((means ** 2).sum(-1))[:, newaxis]
+                dists = self._similarities_to(means, restrict_vocab)
+            # ignore (don't return) words from the input
+            dists[np.arange(len(chunk))[:, newaxis], chunk] = -np.inf
+            return _argsort_rows(dists, topn)[0]
+
+        starts = range(0, len(questions), chunksize)
+        pool = ThreadPool(workers) if workers > 1 else None
+        try:
+            results = list(pool.imap(solve_chunk, starts) if pool else map(solve_chunk, starts))
+        finally:
+            if pool:
+                pool.terminate()
+        return np.concatenate(results) if results else zeros((0, topn), dtype=np.int64)
+
     @staticmethod
     def log_accuracy(section):
         correct, incorrect = len(section['correct']), len(section['incorrect'])
@@ -1282,12 +1590,9 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
         ok_vocab = {w.upper(): v for w, v in reversed(ok_vocab)} if case_insensitive else dict(ok_vocab)
 
         similarity_gold = []
-        similarity_model = []
+        similarity_pairs = []  # indexes of the two words, or None for pairs with OOV words
         oov = 0
 
-        original_vocab = self.vocab
-        self.vocab = ok_vocab
-
         with utils.open(pairs, 'rb') as fin:
             for line_no, line in enumerate(fin):
                 line = utils.to_unicode(line)
@@ -1308,15 +1613,27 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
                         oov += 1
                         if dummy4unknown:
                             logger.debug('Zero similarity for line #%d with OOV words: %s', line_no, line.strip())
-                            similarity_model.append(0.0)
+                            similarity_pairs.append(None)
                             similarity_gold.append(sim)
                             continue
                         else:
                             logger.debug('Skipping line #%d with OOV words: %s', line_no, line.strip())
                             continue
                     similarity_gold.append(sim)  # Similarity from the dataset
-                    similarity_model.append(self.similarity(a, b))  # Similarity from the model
-        self.vocab = original_vocab
+                    similarity_pairs.append((ok_vocab[a].index, ok_vocab[b].index))
+
+        # similarities from the model, computed for all pairs at once
+        similarity_model = zeros(len(similarity_pairs), dtype=REAL)
+        known = [i for i, pair in enumerate(similarity_pairs) if pair is not None]
+        if known:
+            indexes = np.array([similarity_pairs[i] for i in known], dtype=np.int64)
+            # gather the vectors through word_vec, so that subclasses that store vectors differently work too
+            words = np.unique(indexes)
+            vectors = vstack([self.word_vec(self.index2word[index]) for index in words]).astype(REAL)
+            rows = np.searchsorted(words, indexes)
+            vectors_a, vectors_b = vectors[rows[:, 0]], vectors[rows[:, 1]]
+            similarity_model[known] = (vectors_a * vectors_b).sum(-1) / sqrt(
+                (vectors_a ** 2).sum(-1) * (vectors_b ** 2).sum(-1))
         spearman = stats.spearmanr(similarity_gold, similarity_model)
         pearson = stats.pearsonr(similarity_gold, similarity_model)
         if dummy4unknown:
@@ -1333,13 +1650,17 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
         self.log_evaluate_word_pairs(pearson, spearman, oov_ratio, pairs)
         return pearson, spearman, oov_ratio
 
-    def init_sims(self, replace=False):
+    def init_sims(self, replace=False, norms_only=False):
         """Precompute L2-normalized vectors.
 
         Parameters
         ----------
         replace : bool, optional
             If True - forget the original vectors and only keep the normalized ones = saves lots of memory!
+        norms_only : bool, optional
+            If True - only keep the L2 norms of the vectors, one float per vector, and normalize inside the
+            similarity computations. Saves as much memory as `replace`, but keeps the original vectors.
+            The norms are stored by :meth:`save`, and later calls to `init_sims()` keep using them.
 
         Warnings
         --------
@@ -1349,9 +1670,17 @@ class WordEmbeddingsKeyedVectors(BaseKeyedVectors):
         :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.similarity`, etc., but not train.
 
         """
-        if getattr(self, 'vectors_norm', None) is None or replace:
+        if replace and norms_only:
+            raise ValueError("cannot combine replace=True with norms_only=True")
+        if norms_only or (getattr(self, 'norms', None) is not None and not replace):
+            if getattr(self, 'norms', None) is None:
+                logger.info("precomputing L2-norms of word weight vectors")
+                self.norms = _row_norms(self.vectors)
+            self.vectors_norm = None
+        elif getattr(self, 'vectors_norm', None) is None or replace:
             logger.info("precomputing L2-norms of word weight vectors")
             self.vectors_norm = _l2_norm(self.vectors, replace=replace)
+            self.norms = None
 
     def relative_cosine_similarity(self, wa, wb, topn=10):
         """Compute the relative cosine similarity between two words given top-n similar words,
@@ -1425,6 +1754,35 @@ class WordEmbeddingSimilarityIndex(TermSimilarityIndex):
                 if similarity > self.threshold:
                     yield (t2, similarity**self.exponent)
 
+    def most_similar_batch(self, terms, topn=10):
+        """Get most similar terms for many terms at once.
+
+        The neighbours of all the terms are retrieved with
+        :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.most_similar_batch`, which
+        computes the similarities of a whole chunk of terms with a single matrix multiplication.
+
+        """
+        if set(self.kwargs) - {'restrict_vocab'}:
+            return super(WordEmbeddingSimilarityIndex, self).most_similar_batch(terms, topn=topn)
+
+        known_terms = []
+        for t1 in terms:
+            if t1 in self.keyedvectors.vocab:
+                known_terms.append(t1)
+            else:
+                logger.debug('an out-of-dictionary term "%s"', t1)
+        ids, sims = self.keyedvectors.most_similar_batch(known_terms, topn=topn, **self.kwargs)
+
+        index2word = self.keyedvectors.index2word
+        known_results = iter([
+            [
+                (index2word[t2_index], float(similarity)**self.exponent)
+                for t2_index, similarity in zip(row_ids, row_sims) if t2_index >= 0 and similarity > self.threshold
+            ]
+            for row_ids, row_sims in zip(ids, sims)
+        ])
+        return [next(known_results) if t1 in self.keyedvectors.vocab else [] for t1 in terms]
+
 
 class Word2VecKeyedVectors(WordEmbeddingsKeyedVectors):
     """Mapping between words and vectors for the :class:`~gensim.models.Word2Vec` model.
@@ -1454,7 +1812,7 @@ class Word2VecKeyedVectors(WordEmbeddingsKeyedVectors):
 
     @classmethod
     def load_word2vec_format(cls, fname, fvocab=None, binary=False, encoding='utf8', unicode_errors='strict',
-                             limit=None, datatype=REAL):
+                             limit=None, datatype=REAL, mmap=None, workers=1):
         """Load the input-hidden weight matrix from the original C word2vec-tool format.
 
         Warnings
@@ -1484,7 +1842,18 @@ class Word2VecKeyedVectors(WordEmbeddingsKeyedVectors):
             None, means read all.
         datatype : type, optional
             (Experimental) Can coerce dimensions to a non-default float type (such as `np.float16`) to save memory.
-            Such types may result in much slower bulk operations or incompatibility with optimized routines.)
+            Half-precision vectors stay half-precision after :meth:`init_sims`, and the similarity look-ups
+            accumulate them in float32. Such types may be incompatible with optimized training routines.)
+        mmap : str, optional
+            Memory-map the vectors of a binary file with this mode, e.g. 'r' (see :func:`numpy.load`).
+            The first load copies the vectors into a `fname.vectors.npy` sidecar file next to `fname`,
+            later loads memory-map the sidecar, so that processes loading the same file share its pages.
+            If the sidecar can't be created (e.g. in a read-only directory), the vectors are read into memory.
+            `fname` must be a local, uncompressed file.
+        workers : int, optional
+            Parse a text-format file in this many worker processes, each handling a range of lines,
+            directly into a shared matrix. Only used for local, uncompressed files in the text format,
+            when `limit` doesn't stop reading before the end of the file.
 
         Returns
         -------
@@ -1495,7 +1864,7 @@ class Word2VecKeyedVectors(WordEmbeddingsKeyedVectors):
         # from gensim.models.word2vec import load_word2vec_format
         return _load_word2vec_format(
             cls, fname, fvocab=fvocab, binary=binary, encoding=encoding, unicode_errors=unicode_errors,
-            limit=limit, datatype=datatype)
+            limit=limit, datatype=datatype, mmap=mmap, workers=workers)
 
     def get_keras_embedding(self, train_embeddings=False):
         """Get a Keras 'Embedding' layer with weights set as the Word2Vec model's learned word embeddings.
@@ -1560,6 +1929,7 @@ class Doc2VecKeyedVectors(BaseKeyedVectors):
         self.mapfile_path = mapfile_path
         self.vector_size = vector_size
         self.vectors_docs_norm = None
+        self.norms = None
 
     @property
     def index2entity(self):
@@ -1626,13 +1996,17 @@ class Doc2VecKeyedVectors(BaseKeyedVectors):
         kwargs['ignore'] = kwargs.get('ignore', ['vectors_docs_norm'])
         super(Doc2VecKeyedVectors, self).save(*args, **kwargs)
 
-    def init_sims(self, replace=False):
+    def init_sims(self, replace=False, norms_only=False):
         """Precompute L2-normalized vectors.
 
         Parameters
         ----------
         replace : bool, optional
             If True - forget the original vectors and only keep the normalized ones = saves lots of memory!
+        norms_only : bool, optional
+            If True - only keep the L2 norms of the vectors, one float per vector, and normalize inside the
+            similarity computations. The norms are stored by :meth:`save`, and later calls to `init_sims()`
+            keep using them.
 
         Warnings
         --------
@@ -1642,14 +2016,64 @@ class Doc2VecKeyedVectors(BaseKeyedVectors):
         :meth:`~gensim.models.keyedvectors.Doc2VecKeyedVectors.similarity`, etc., but not train and infer_vector.
 
         """
-        if getattr(self, 'vectors_docs_norm', None) is None or replace:
+        if replace and norms_only:
+            raise ValueError("cannot combine replace=True with norms_only=True")
+        if norms_only or (getattr(self, 'norms', None) is not None and not replace):
+            if getattr(self, 'norms', None) is None:
+                logger.info("precomputing L2-norms of doc weight vectors")
+                self.norms = _row_norms(self.vectors_docs)
+            self.vectors_docs_norm = None
+        elif getattr(self, 'vectors_docs_norm', None) is None or replace:
             logger.info("precomputing L2-norms of doc weight vectors")
             if not replace and self.mapfile_path:
-                self.vectors_docs_norm = np_memmap(
-                    self.mapfile_path + '.vectors_docs_norm', dtype=REAL,
-                    mode='w+', shape=self.vectors_docs.shape)
+                dtype = np.float16 if self.vectors_docs.dtype == np.float16 else REAL
+                self.vectors_docs_norm = _l2_norm_blocked(self.vectors_docs, np_memmap(
+                    self.mapfile_path + '.vectors_docs_norm', dtype=dtype,
+                    mode='w+', shape=self.vectors_docs.shape))
             else:
                 self.vectors_docs_norm = _l2_norm(self.vectors_docs, replace=replace)
+            self.norms = None
+
+    def _normalized_rows(self, clip_start=0, clip_end=None):
+        """Get the doc vectors to compute cosine similarities against, and the norms to divide their dot products by.
+
+        Parameters
+        ----------
+        clip_start : int, optional
+            Index of the first row to return.
+        clip_end : int, optional
+            Index after the last row to return.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            `vectors_docs_norm` and None, or `vectors_docs` and their L2 norms if :meth:`init_sims`
+            was called with `norms_only=True`.
+
+        """
+        if self.vectors_docs_norm is None and getattr(self, 'norms', None) is not None:
+            return self.vectors_docs[clip_start:clip_end], self.norms[clip_start:clip_end]
+        return self.vectors_docs_norm[clip_start:clip_end], None
+
+    def get_normed_vectors(self):
+        """Get all L2-normalized doc vectors as a matrix, e.g. to build a similarity index from them.
+
+        Returns
+        -------
+        numpy.ndarray
+            `vectors_docs_norm`, or a new normalized copy of `vectors_docs` if only their norms are stored.
+
+        """
+        self.init_sims()
+        vectors, norms = self._normalized_rows()
+        if norms is None:
+            return vectors
+        return _upcast(vectors) / norms[:, newaxis]
+
+    def _normed_vector(self, index):
+        """Get the L2-normalized vector of the doc at (integer) `index`."""
+        vectors, norms = self._normalized_rows(index, index + 1)
+        return vectors[0] if norms is None else _upcast(vectors[0]) / norms[0]
 
     def most_similar(self, positive=None, negative=None, topn=10, clip_start=0, clip_end=None, indexer=None):
         """Find the top-N most similar docvecs from the training set.
@@ -1691,7 +2115,7 @@ class Doc2VecKeyedVectors(BaseKeyedVectors):
             negative = []
 
         self.init_sims()
-        clip_end = clip_end or len(self.vectors_docs_norm)
+        clip_end = clip_end or len(self.vectors_docs)
 
         if isinstance(positive, string_types + integer_types + (integer,)) and not negative:
             # allow calls like most_similar('dog'), as a shorthand for most_similar(['dog'])
@@ -1711,9 +2135,10 @@ class Doc2VecKeyedVectors(BaseKeyedVectors):
         all_docs, mean = set(), []
         for doc, weight in positive + negative:
             if isinstance(doc, ndarray):
-                mean.append(weight * doc)
+                mean.append(weight * _upcast(doc))
             elif doc in self.doctags or doc < self.count:
-                mean.append(weight * self.vectors_docs_norm[self._int_index(doc, self.doctags, self.max_rawint)])
+                doc_norm = self._normed_vector(self._int_index(doc, self.doctags, self.max_rawint))
+                mean.append(weight * _upcast(doc_norm))
                 all_docs.add(self._int_index(doc, self.doctags, self.max_rawint))
             else:
                 raise KeyError("doc '%s' not in trained set" % doc)
@@ -1724,7 +2149,8 @@ class Doc2VecKeyedVectors(BaseKeyedVectors):
         if indexer is not None and isinstance(topn, int):
             return indexer.most_similar(mean, topn)
 
-        dists = dot(self.vectors_docs_norm[clip_start:clip_end], mean)
+        vectors, norms = self._normalized_rows(clip_start, clip_end)
+        dists = _dot_normed(vectors, norms, mean)
         if not topn:
             return dists
         best = matutils.argsort(dists, topn=topn + len(all_docs), reverse=True)
@@ -1759,7 +2185,7 @@ class Doc2VecKeyedVectors(BaseKeyedVectors):
         if not docs:
             raise ValueError("cannot select a doc from an empty list")
         vectors = vstack(
-            self.vectors_docs_norm[self._int_index(doc, self.doctags, self.max_rawint)] for doc in docs).astype(REAL)
+            self._normed_vector(self._int_index(doc, self.doctags, self.max_rawint)) for doc in docs).astype(REAL)
         mean = matutils.unitvec(vectors.mean(axis=0)).astype(REAL)
         dists = dot(vectors, mean)
         return sorted(zip(dists, docs))[0][1]
@@ -1782,7 +2208,7 @@ class Doc2VecKeyedVectors(BaseKeyedVectors):
             The cosine similarity between the vectors of the two documents.
 
         """
-        return dot(matutils.unitvec(self[d1]), matutils.unitvec(self[d2]))
+        return dot(matutils.unitvec(_upcast(self[d1])), matutils.unitvec(_upcast(self[d2])))
 
     def n_similarity(self, ds1, ds2):
         """Compute cosine similarity between two sets of docvecs from the trained set.
@@ -1901,6 +2327,7 @@ class Doc2VecKeyedVectors(BaseKeyedVectors):
                 doctag = u"%s%s" % (prefix, self._index_to_doctag(i, self.offset2doctag, self.max_rawint))
                 row = self.vectors_docs[i]
                 if binary:
+                    row = row.astype(REAL)
                     fout.write(utils.to_utf8(doctag) + b" " + row.tostring())
                 else:
                     fout.write(utils.to_utf8("%s %s\n" % (doctag, ' '.join("%f" % val for val in row))))
@@ -1971,6 +2398,9 @@ class FastTextKeyedVectors(WordEmbeddingsKeyedVectors):
     compatible_hash : boolean
         If True, uses the Facebook-compatible hash function instead of the
         Gensim backwards-compatible hash function.
+    cache_size : int, optional
+        Maximum number of out-of-vocabulary words whose ngram buckets are kept
+        in memory by :meth:`word_vecs`.
 
     Attributes
     ----------
@@ -1988,21 +2418,34 @@ class FastTextKeyedVectors(WordEmbeddingsKeyedVectors):
         Under some conditions, may actually be the same matrix as
         vectors_ngrams, e.g. if :func:`init_sims` was called with
         replace=True.
+    ngram_norms : np.array
+        L2 norms of the rows of vectors_ngrams, used instead of vectors_ngrams_norm
+        if :func:`init_sims` was called with norms_only=True.
     buckets_word : dict
         Maps vocabulary items (by their index) to the buckets they occur in.
+    bucket_rows : np.array
+        None, unless :meth:`prune_ngrams` was called. In that case, maps each bucket
+        to its row in vectors_ngrams, or to -1 if the bucket was pruned.
+    ngram_cache : OrderedDict
+        Maps recently seen out-of-vocabulary words to the buckets they occur in,
+        least recently used first.
 
     """
-    def __init__(self, vector_size, min_n, max_n, bucket, compatible_hash):
+    def __init__(self, vector_size, min_n, max_n, bucket, compatible_hash, cache_size=10000):
         super(FastTextKeyedVectors, self).__init__(vector_size=vector_size)
         self.vectors_vocab = None
         self.vectors_vocab_norm = None
         self.vectors_ngrams = None
         self.vectors_ngrams_norm = None
+        self.ngram_norms = None
         self.buckets_word = None
+        self.bucket_rows = None
         self.min_n = min_n
         self.max_n = max_n
         self.bucket = bucket
         self.compatible_hash = compatible_hash
+        self.cache_size = cache_size
+        self.ngram_cache = OrderedDict()  # word => buckets, least recently used first
 
     @classmethod
     def load(cls, fname_or_handle, **kwargs):
@@ -2083,6 +2526,7 @@ class FastTextKeyedVectors(WordEmbeddingsKeyedVectors):
             'vectors_ngrams_norm',
             'buckets_word',
             'hash2index',
+            'ngram_cache',
         ]
         kwargs['ignore'] = kwargs.get('ignore', ignore_attrs)
         super(FastTextKeyedVectors, self).save(*args, **kwargs)
@@ -2115,10 +2559,10 @@ class FastTextKeyedVectors(WordEmbeddingsKeyedVectors):
         else:
             word_vec = np.zeros(self.vectors_ngrams.shape[1], dtype=np.float32)
             if use_norm:
-                ngram_weights = self.vectors_ngrams_norm
+                ngram_weights, ngram_norms = self._normalized_ngram_rows()
             else:
-                ngram_weights = self.vectors_ngrams
-            ngram_hashes = ft_ngram_hashes(word, self.min_n, self.max_n, self.bucket, self.compatible_hash)
+                ngram_weights, ngram_norms = self.vectors_ngrams, None
+            ngram_hashes = self._ngram_rows(word)
             if len(ngram_hashes) == 0:
                 #
                 # If it is impossible to extract _any_ ngrams from the input
@@ -2131,16 +2575,112 @@ class FastTextKeyedVectors(WordEmbeddingsKeyedVectors):
                 logger.warning('could not extract any ngrams from %r, returning origin vector', word)
                 return word_vec
             for nh in ngram_hashes:
-                word_vec += ngram_weights[nh]
+                word_vec += ngram_weights[nh] if ngram_norms is None else ngram_weights[nh] / ngram_norms[nh]
             return word_vec / len(ngram_hashes)
 
-    def init_sims(self, replace=False):
+    def _normalized_ngram_rows(self):
+        """Get `vectors_ngrams_norm` and None, or `vectors_ngrams` and their L2 norms in the `norms_only` mode."""
+        if self.vectors_ngrams_norm is None and getattr(self, 'ngram_norms', None) is not None:
+            return self.vectors_ngrams, self.ngram_norms
+        return self.vectors_ngrams_norm, None
+
+    def word_vecs(self, words, use_norm=False):
+        """Get representations of many `words` in vector space at once, as a 2D numpy array.
+
+        Out-of-vocabulary vectors are computed together: the ngrams of all OOV words are hashed in one pass
+        into a sparse (word, bucket) matrix, which is then multiplied by the ngram vectors.
+        The buckets of the `cache_size` most recently seen OOV words are cached.
+
+        Parameters
+        ----------
+        words : iterable of str
+            Input words.
+        use_norm : bool, optional
+            If True - use the L2-normalized vectors, as in :meth:`word_vec`.
+
+        Returns
+        -------
+        numpy.ndarray
+            One row per word, equal to `word_vec(word, use_norm)`.
+
+        Raises
+        ------
+        KeyError
+            If a word is not in the vocabulary and there are no ngram buckets.
+
+        """
+        words = list(words)
+        result = zeros((len(words), self.vector_size), dtype=REAL)
+        vocab_rows, vocab_indices, oov_rows, oov_words = [], [], [], []
+        for row, word in enumerate(words):
+            if word in self.vocab:
+                vocab_rows.append(row)
+                vocab_indices.append(self.vocab[word].index)
+            else:
+                oov_rows.append(row)
+                oov_words.append(word)
+
+        if vocab_rows:
+            vectors, norms = self._normalized_rows() if use_norm else (self.vectors, None)
+            result[vocab_rows] = vectors[vocab_indices]
+            if norms is not None:
+                result[vocab_rows] /= norms[vocab_indices, newaxis]
+        if not oov_words:
+            return result
+        if self.bucket == 0:
+            raise KeyError('cannot calculate vector for OOV word without ngrams')
+
+        indptr, indices = self._ngram_buckets(oov_words)
+        if self.bucket_rows is not None:
+            indptr, indices = _compact_csr(indptr, self.bucket_rows[indices])
+        counts = np.diff(indptr)
+        if not counts.all():
+            # as in word_vec, words without any ngrams get the origin vector
+            logger.warning('could not extract any ngrams from %i words, returning origin vectors', np.sum(counts == 0))
+        weights = np.repeat(1.0 / np.maximum(counts, 1), counts).astype(REAL)
+        ngram_weights, ngram_norms = self._normalized_ngram_rows() if use_norm else (self.vectors_ngrams, None)
+        if ngram_norms is not None:
+            weights /= ngram_norms[indices]
+        ngram_matrix = sparse.csr_matrix(
+            (weights, indices, indptr), shape=(len(oov_words), len(self.vectors_ngrams)))
+        result[oov_rows] = ngram_matrix.dot(ngram_weights)
+        return result
+
+    def _ngram_buckets(self, words):
+        """Get the ngram buckets of `words` in CSR form (`indptr`, `indices`), going through `ngram_cache`."""
+        buckets = OrderedDict()
+        for word in words:
+            if word not in buckets:
+                buckets[word] = self.ngram_cache.pop(word, None)
+
+        missing = [word for word, word_buckets in buckets.items() if word_buckets is None]
+        if missing:
+            indptr, indices = ft_ngram_hashes_batch(missing, self.min_n, self.max_n, self.bucket, self.compatible_hash)
+            for i, word in enumerate(missing):
+                buckets[word] = indices[indptr[i]:indptr[i + 1]].copy()
+
+        if self.cache_size > 0:
+            self.ngram_cache.update(buckets)  # (re)insert as most recently used
+            while len(self.ngram_cache) > self.cache_size:
+                self.ngram_cache.popitem(last=False)  # evict the least recently used word
+
+        word_buckets = [buckets[word] for word in words]
+        indptr = np.zeros(len(words) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in word_buckets], out=indptr[1:])
+        indices = np.concatenate(word_buckets) if word_buckets else np.array([], dtype=np.uint32)
+        return indptr, indices
+
+    def init_sims(self, replace=False, norms_only=False):
         """Precompute L2-normalized vectors.
 
         Parameters
         ----------
         replace : bool, optional
             If True - forget the original vectors and only keep the normalized ones = saves lots of memory!
+        norms_only : bool, optional
+            If True - only keep the L2 norms of the word and ngram vectors, and normalize inside the
+            similarity computations. The norms are stored by :meth:`save`, and later calls to `init_sims()`
+            keep using them.
 
         Warnings
         --------
@@ -2150,10 +2690,16 @@ class FastTextKeyedVectors(WordEmbeddingsKeyedVectors):
         :meth:`~gensim.models.keyedvectors.FastTextKeyedVectors.similarity`, etc., but not train.
 
         """
-        super(FastTextKeyedVectors, self).init_sims(replace)
-        if getattr(self, 'vectors_ngrams_norm', None) is None or replace:
+        super(FastTextKeyedVectors, self).init_sims(replace=replace, norms_only=norms_only)
+        if getattr(self, 'norms', None) is not None:
+            if getattr(self, 'ngram_norms', None) is None:
+                logger.info("precomputing L2-norms of ngram weight vectors")
+                self.ngram_norms = _row_norms(self.vectors_ngrams)
+            self.vectors_ngrams_norm = None
+        elif getattr(self, 'vectors_ngrams_norm', None) is None or replace:
             logger.info("precomputing L2-norms of ngram weight vectors")
             self.vectors_ngrams_norm = _l2_norm(self.vectors_ngrams, replace=replace)
+            self.ngram_norms = None
 
     def save_word2vec_format(self, fname, fvocab=None, binary=False, total_vec=None):
         """Store the input-hidden weight matrix in the same format used by the original
@@ -2291,18 +2837,628 @@ class FastTextKeyedVectors(WordEmbeddingsKeyedVectors):
 
         for w, v in self.vocab.items():
             word_vec = np.copy(self.vectors_vocab[v.index])
-            ngram_hashes = ft_ngram_hashes(w, self.min_n, self.max_n, self.bucket, self.compatible_hash)
+            ngram_hashes = self._ngram_rows(w)
             for nh in ngram_hashes:
                 word_vec += self.vectors_ngrams[nh]
             word_vec /= len(ngram_hashes) + 1
             self.vectors[v.index] = word_vec
 
+    def _ngram_rows(self, word):
+        """Get the rows of vectors_ngrams that hold the ngrams of `word`, skipping pruned buckets."""
+        ngram_hashes = ft_ngram_hashes(word, self.min_n, self.max_n, self.bucket, self.compatible_hash)
+        if self.bucket_rows is None:
+            return ngram_hashes
+        rows = self.bucket_rows[ngram_hashes]
+        return rows[rows >= 0]
+
+    def prune_ngrams(self, min_norm=0.0, keep_unused=False, dtype=None, blocksize=65536):
+        """Shrink vectors_ngrams to the buckets that are actually used, similar to `fasttext quantize -cutoff`.
+
+        Buckets that none of the ngrams of the vocabulary words hash into keep their random initial vectors
+        during training, and buckets with a small norm contribute little to out-of-vocabulary vectors.
+        Both are dropped from vectors_ngrams, and the remaining buckets are remapped to consecutive rows
+        through `bucket_rows`. Out-of-vocabulary vectors are then averaged over the ngrams whose buckets were
+        kept, as in fastText's pruned models. Vectors of vocabulary words are not affected.
+
+        The compact form is kept by :meth:`save` and :meth:`load`.
+
+        Parameters
+        ----------
+        min_norm : float, optional
+            Drop buckets whose vector has a smaller L2 norm.
+        keep_unused : bool, optional
+            If True, keep buckets that are not used by any vocabulary word (subject to `min_norm`).
+        dtype : numpy.dtype, optional
+            If set, also convert the kept vectors to this type, e.g. `numpy.float16` to halve their size again.
+        blocksize : int, optional
+            Number of rows whose norms are computed at once.
+
+        Returns
+        -------
+        int
+            Number of buckets kept.
+
+        Warnings
+        --------
+        You **cannot continue training** or save to the Facebook format after pruning.
+
+        """
+        if self.bucket == 0:
+            return 0
+
+        # row of each bucket in the current vectors_ngrams, -1 if already pruned
+        rows = self.bucket_rows if self.bucket_rows is not None else np.arange(self.bucket, dtype=np.int64)
+        keep = rows >= 0
+        if not keep_unused:
+            used = np.zeros(self.bucket, dtype=bool)
+            _, indices = ft_ngram_hashes_batch(
+                list(self.vocab), self.min_n, self.max_n, self.bucket, self.compatible_hash)
+            used[indices] = True
+            keep &= used
+        if min_norm > 0:
+            norms = _row_norms(self.vectors_ngrams, blocksize=blocksize)
+            keep[keep] = norms[rows[keep]] >= min_norm
+
+        kept_rows = rows[keep]
+        self.vectors_ngrams = self.vectors_ngrams[kept_rows]
+        if dtype is not None:
+            self.vectors_ngrams = self.vectors_ngrams.astype(dtype)
+        self.bucket_rows = np.full(self.bucket, -1, dtype=np.int32)
+        self.bucket_rows[keep] = np.arange(len(kept_rows), dtype=np.int32)
+
+        # derived state refers to the old rows
+        self.vectors_ngrams_norm = None
+        self.ngram_norms = None
+        self.buckets_word = None
+
+        logger.info("pruned ngram buckets: kept %i out of %i", len(kept_rows), self.bucket)
+        return len(kept_rows)
+
     @property
     @deprecated("Attribute will be removed in 4.0.0, use self.bucket instead")
     def num_ngram_vectors(self):
         return self.bucket
 
 
+class QuantizedKeyedVectors(WordEmbeddingsKeyedVectors):
+    """Word vectors stored in a compressed, quantized form.
+
+    Two storage methods are supported:
+
+    * `'int8'`: each vector is scaled by its maximum absolute value and stored as 8-bit integers,
+      so every row takes `vector_size` bytes plus one float for the scale (4x smaller than float32).
+    * `'pq'`: product quantization. The L2-normalized vectors are split into `num_subvectors` parts and each part is
+      replaced by the id of its nearest centroid from a per-part codebook. Each row then takes only
+      `num_subvectors` bytes. Queries are scored with asymmetric distance computation: the query is kept in float,
+      and its dot products with all centroids are looked up from a small per-query table.
+
+    Similarities computed from quantized vectors are approximate. If the original vectors are kept
+    (`keep_vectors=True`, e.g. memory-mapped from disk), the best candidates can be re-ranked exactly
+    with the `rerank` parameter of :meth:`~gensim.models.keyedvectors.QuantizedKeyedVectors.most_similar`.
+
+    Methods that scan the whole vocabulary, such as
+    :meth:`~gensim.models.keyedvectors.QuantizedKeyedVectors.distances` or
+    :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.most_similar_cosmul`,
+    score the quantized vectors too, so their results are approximate as well.
+
+    Use :meth:`~gensim.models.keyedvectors.QuantizedKeyedVectors.from_keyedvectors` to create an instance.
+    Like other KeyedVectors, it can be stored with :meth:`save` and loaded back with `load(fname, mmap='r')`.
+
+    Examples
+    --------
+    .. sourcecode:: pycon
+
+        >>> from gensim.test.utils import common_texts
+        >>> from gensim.models import Word2Vec
+        >>> from gensim.models.keyedvectors import QuantizedKeyedVectors
+        >>>
+        >>> model = Word2Vec(common_texts, size=20, min_count=1)
+        >>> qkv = QuantizedKeyedVectors.from_keyedvectors(model.wv, method='int8')
+        >>> sims = qkv.most_similar('computer', topn=3)
+
+    """
+    def __init__(self, vector_size, method='int8', blocksize=65536):
+        if method not in ('int8', 'pq'):
+            raise ValueError("unknown quantization method %r, expected 'int8' or 'pq'" % method)
+        super(QuantizedKeyedVectors, self).__init__(vector_size=vector_size)
+        self.vectors = None
+        self.method = method
+        self.blocksize = blocksize
+        self.codes = None  # int8 codes, or uint8 centroid ids for 'pq'
+        self.scales = None  # 'int8': per-row multiplier that restores the original vector
+        self.norm_scales = None  # 'int8': per-row multiplier that restores the L2-normalized vector
+        self.codebooks = None  # 'pq': centroids, shape (num_subvectors, num_centroids, subvector size)
+        self.pq_norms = None  # 'pq': L2 norms of the original vectors
+
+    @classmethod
+    def from_keyedvectors(cls, keyedvectors, method='int8', num_subvectors=None, num_centroids=256,
+                          keep_vectors=False, sample=65536, iterations=20, seed=1):
+        """Quantize existing word vectors.
+
+        Parameters
+        ----------
+        keyedvectors : :class:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors`
+            The vectors to quantize.
+        method : {'int8', 'pq'}, optional
+            Storage method, see :class:`~gensim.models.keyedvectors.QuantizedKeyedVectors`.
+        num_subvectors : int, optional
+            Number of parts each vector is split into for `method='pq'`. Must divide `vector_size`.
+            Defaults to `vector_size // 4`, i.e. 4 dimensions per part.
+        num_centroids : int, optional
+            Size of each codebook for `method='pq'`, at most 256.
+        keep_vectors : bool, optional
+            Keep a reference to the original `keyedvectors.vectors`, for exact re-ranking.
+        sample : int, optional
+            Maximum number of vectors used to train the product quantization codebooks.
+        iterations : int, optional
+            Number of k-means iterations used to train the product quantization codebooks.
+        seed : int, optional
+            Seed for the k-means initialization.
+
+        Returns
+        -------
+        :class:`~gensim.models.keyedvectors.QuantizedKeyedVectors`
+            The quantized vectors, sharing the vocabulary with `keyedvectors`.
+
+        """
+        vectors = keyedvectors.vectors
+        result = cls(keyedvectors.vector_size, method=method)
+        result.vocab = keyedvectors.vocab
+        result.index2word = keyedvectors.index2word
+        if keep_vectors:
+            result.vectors = vectors
+
+        logger.info("quantizing %i vectors using %s", len(vectors), method)
+        if method == 'int8':
+            result.codes = np.empty(vectors.shape, dtype=np.int8)
+            result.scales = np.empty(len(vectors), dtype=REAL)
+            result.norm_scales = np.empty(len(vectors), dtype=REAL)
+            for start in range(0, len(vectors), result.blocksize):
+                block = np.asarray(vectors[start:start + result.blocksize], dtype=REAL)
+                scales = np.abs(block).max(axis=1) / 127
+                scales[scales == 0] = 1.0
+                codes = np.rint(block / scales[:, newaxis]).astype(np.int8)
+                norms = sqrt((codes.astype(REAL) ** 2).sum(axis=1)) * scales
+                norms[norms == 0] = np.inf
+                result.codes[start:start + len(block)] = codes
+                result.scales[start:start + len(block)] = scales
+                result.norm_scales[start:start + len(block)] = scales / norms
+        else:
+            if num_subvectors is None:
+                num_subvectors = max(1, keyedvectors.vector_size // 4)
+            if keyedvectors.vector_size % num_subvectors:
+                raise ValueError(
+                    "vector_size %i is not divisible by num_subvectors %i" % (keyedvectors.vector_size, num_subvectors))
+            if not 0 < num_centroids <= 256:
+                raise ValueError("num_centroids must be between 1 and 256, got %i" % num_centroids)
+            num_centroids = min(num_centroids, len(vectors))
+            rand = np.random.RandomState(seed)
+            norms = sqrt((np.asarray(vectors, dtype=REAL) ** 2).sum(axis=1))
+            result.pq_norms = norms.astype(REAL)
+            norms[norms == 0] = 1.0
+            training = np.sort(rand.choice(len(vectors), min(sample, len(vectors)), replace=False))
+            training = np.asarray(vectors[training], dtype=REAL) / norms[training, newaxis]
+            subsize = keyedvectors.vector_size // num_subvectors
+            result.codebooks = np.empty((num_subvectors, num_centroids, subsize), dtype=REAL)
+            for part in range(num_subvectors):
+                result.codebooks[part] = matutils.kmeans(
+                    training[:, part * subsize:(part + 1) * subsize], num_centroids, iterations, rand)
+            result.codes = np.empty((len(vectors), num_subvectors), dtype=np.uint8)
+            for start in range(0, len(vectors), result.blocksize):
+                block = vectors[start:start + result.blocksize]
+                block = (block / norms[start:start + len(block), newaxis]).astype(REAL)
+                for part in range(num_subvectors):
+                    result.codes[start:start + len(block), part] = matutils.nearest_centroids(
+                        block[:, part * subsize:(part + 1) * subsize], result.codebooks[part])
+        return result
+
+    def _decode(self, index, use_norm=False):
+        """Reconstruct the vector at position `index`, or one vector per row for an array of positions,
+        L2-normalized if `use_norm`."""
+        index = np.asarray(index)
+        if self.method == 'int8':
+            scale = self.norm_scales[index] if use_norm else self.scales[index]
+            return self.codes[index].astype(REAL) * scale[..., newaxis]
+        vectors = self.codebooks[np.arange(len(self.codebooks)), self.codes[index]].reshape(index.shape + (-1,))
+        return vectors if use_norm else vectors * self.pq_norms[index][..., newaxis]
+
+    def _unit_rows(self, indexes):
+        """Decode the L2-normalized vectors at positions `indexes`."""
+        return self._decode(indexes, use_norm=True)
+
+    def _similarities_to(self, queries, restrict_vocab=None):
+        """Score each of the unit-length `queries` with
+        :meth:`~gensim.models.keyedvectors.QuantizedKeyedVectors.cosine_similarities_to`."""
+        return vstack([self.cosine_similarities_to(query, restrict_vocab=restrict_vocab) for query in queries])
+
+    def word_vec(self, word, use_norm=False):
+        """Get the `word` representation in vector space, as a 1D numpy array.
+
+        The vector is reconstructed from its quantized form, unless the original vectors were kept
+        with `keep_vectors=True`.
+
+        Parameters
+        ----------
+        word : str
+            Input word
+        use_norm : bool, optional
+            If True - resulting vector will be L2-normalized (unit euclidean length).
+
+        Returns
+        -------
+        numpy.ndarray
+            Approximate vector representation of `word`.
+
+        Raises
+        ------
+        KeyError
+            If word not in vocabulary.
+
+        """
+        if word not in self.vocab:
+            raise KeyError("word '%s' not in vocabulary" % word)
+        if self.vectors is not None:
+            vector = np.array(self.vectors[self.vocab[word].index], dtype=REAL)
+            if use_norm:
+                vector = matutils.unitvec(vector)
+        else:
+            vector = self._decode(self.vocab[word].index, use_norm=use_norm)
+        vector.setflags(write=False)
+        return vector
+
+    def init_sims(self, replace=False, norms_only=False):
+        """Do nothing: the similarity kernels of quantized vectors normalize on the fly,
+        no `vectors_norm` matrix is ever materialized."""
+        pass
+
+    def get_normed_vectors(self):
+        """Decode all L2-normalized vectors into a new float32 matrix, e.g. to build a similarity index from them.
+
+        Returns
+        -------
+        numpy.ndarray
+            Approximate normalized vectors, of shape (number of words, vector_size).
+
+        """
+        result = np.empty((len(self.codes), self.vector_size), dtype=REAL)
+        for start in range(0, len(self.codes), self.blocksize):
+            end = min(len(self.codes), start + self.blocksize)
+            result[start:end] = self._decode(np.arange(start, end), use_norm=True)
+        return result
+
+    def distances(self, word_or_vector, other_words=()):
+        """Compute approximate cosine distances from given word or vector to all words in `other_words`.
+        If `other_words` is empty, return distance between `word_or_vectors` and all words in vocab.
+
+        Parameters
+        ----------
+        word_or_vector : {str, numpy.ndarray}
+            Word or vector from which distances are to be computed.
+        other_words : iterable of str
+            For each word in `other_words` distance from `word_or_vector` is computed.
+            If None or empty, distance of `word_or_vector` from all words in vocab is computed (including itself).
+
+        Returns
+        -------
+        numpy.array
+            Array containing distances to all words in `other_words` from input `word_or_vector`.
+
+        Raises
+        -----
+        KeyError
+            If either `word_or_vector` or any word in `other_words` is absent from vocab.
+
+        """
+        if isinstance(word_or_vector, string_types):
+            vector = self.word_vec(word_or_vector, use_norm=True)
+        else:
+            vector = matutils.unitvec(np.asarray(word_or_vector, dtype=REAL))
+        if not other_words:
+            return 1 - self.cosine_similarities_to(vector)
+        return 1 - dot(self._unit_rows([self.vocab[word].index for word in other_words]), vector)
+
+    def cosine_similarities_to(self, vector, restrict_vocab=None, blocksize=None):
+        """Compute the approximate cosine similarities between `vector` and the stored vectors.
+
+        The codes are decoded one block of `blocksize` rows at a time, so that the float working memory
+        stays bounded.
+
+        Parameters
+        ----------
+        vector : numpy.ndarray
+            Query vector of shape (vector_size,), must be L2-normalized.
+        restrict_vocab : int, optional
+            Only compute similarities to the first `restrict_vocab` vectors.
+        blocksize : int, optional
+            Number of rows decoded at once, defaults to `self.blocksize`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Approximate cosine similarities, one per word.
+
+        """
+        limit = len(self.codes) if restrict_vocab is None else min(restrict_vocab, len(self.codes))
+        blocksize = blocksize or self.blocksize
+        vector = np.asarray(vector, dtype=REAL)
+        dists = np.empty(limit, dtype=REAL)
+        if self.method == 'pq':
+            # asymmetric distance computation: dot products of the query parts with all centroids
+            num_subvectors, _, subsize = self.codebooks.shape
+            table = np.einsum('pcs,ps->pc', self.codebooks, vector.reshape(num_subvectors, subsize))
+            parts = np.arange(num_subvectors)
+        for start in range(0, limit, blocksize):
+            end = min(limit, start + blocksize)
+            if self.method == 'int8':
+                dists[start:end] = dot(self.codes[start:end].astype(REAL), vector) * self.norm_scales[start:end]
+            else:
+                dists[start:end] = table[parts, self.codes[start:end]].sum(axis=1)
+        return dists
+
+    def most_similar(self, positive=None, negative=None, topn=10, restrict_vocab=None, indexer=None, rerank=None,
+                     blocksize=None, workers=None):
+        """Find the top-N most similar words, using the quantized vectors.
+
+        Parameters
+        ----------
+        positive : list of str, optional
+            List of words that contribute positively.
+        negative : list of str, optional
+            List of words that contribute negatively.
+        topn : int or None, optional
+            Number of top-N similar words to return, when `topn` is int. When `topn` is None,
+            then approximate similarities for all words are returned.
+        restrict_vocab : int, optional
+            Optional integer which limits the range of vectors which
+            are searched for most-similar values. For example, restrict_vocab=10000 would
+            only check the first 10000 word vectors in the vocabulary order. (This may be
+            meaningful if you've sorted the vocabulary by descending frequency.)
+        indexer : object, optional
+            An approximate nearest neighbor index, such as :class:`~gensim.similarities.index.AnnoyIndexer`.
+        rerank : int, optional
+            If set, re-score the best `rerank` candidates exactly, using the original float vectors.
+            Requires the vectors to be created with `keep_vectors=True`.
+        blocksize : int, optional
+            Number of rows decoded at once, defaults to `self.blocksize`. The scan is always blocked.
+        workers : int, optional
+            Ignored, accepted for compatibility with
+            :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.similar_by_word`.
+
+        Returns
+        -------
+        list of (str, float) or numpy.array
+            When `topn` is int, a sequence of (word, similarity) is returned.
+            When `topn` is None, then similarities for all words are returned as a
+            one-dimensional numpy array with the size of the vocabulary.
+
+        """
+        if isinstance(topn, Integral) and topn < 1:
+            return []
+        if rerank and self.vectors is None:
+            raise ValueError("exact re-ranking requires the original vectors, use keep_vectors=True")
+
+        if positive is None:
+            positive = []
+        if negative is None:
+            negative = []
+        if isinstance(positive, string_types) and not negative:
+            # allow calls like most_similar('dog'), as a shorthand for most_similar(['dog'])
+            positive = [positive]
+
+        mean, all_words = self._weighted_mean(positive, negative)
+
+        if indexer is not None and isinstance(topn, int):
+            return indexer.most_similar(mean, topn)
+
+        dists = self.cosine_similarities_to(mean, restrict_vocab=restrict_vocab, blocksize=blocksize)
+        if not topn:
+            return dists
+        best = matutils.argsort(dists, topn=max(topn, rerank or 0) + len(all_words), reverse=True)
+        if rerank:
+            candidates = np.sort(best)  # read the original vectors in disk order
+            dists = dict(zip(candidates, self.cosine_similarities(mean, self.vectors[candidates])))
+            best = sorted(best, key=lambda index: -dists[index])
+        # ignore (don't return) words from the input
+        result = [(self.index2word[sim], float(dists[sim])) for sim in best if sim not in all_words]
+        return result[:topn]
+
+
+class LazyKeyedVectors(Word2VecKeyedVectors):
+    """Word vectors read on demand from a file in the word2vec format.
+
+    Loading only indexes the file: the words are read, and the byte offset of each vector is remembered.
+    Single-word look-ups (`kv[word]`, :meth:`word_vec`, :meth:`similarity` etc.) then read just the rows
+    they need, through an LRU cache of the `cache_size` most recently used vectors.
+    The full `vectors` matrix is loaded from the file only when first accessed, e.g. by whole-vocabulary
+    operations like :meth:`most_similar`.
+
+    The index (vocabulary and offsets, but not the cached vectors) can be stored with :meth:`save`,
+    so that the file doesn't need to be scanned again.
+
+    Examples
+    --------
+    .. sourcecode:: pycon
+
+        >>> from gensim.test.utils import datapath
+        >>> from gensim.models.keyedvectors import LazyKeyedVectors
+        >>>
+        >>> wv = LazyKeyedVectors.load_word2vec_format(datapath('euclidean_vectors.bin'), binary=True)
+        >>> vector = wv['war']  # reads a single row from the file
+
+    """
+    def __init__(self, vector_size, cache_size=10000):
+        super(LazyKeyedVectors, self).__init__(vector_size=vector_size)
+        self._vectors = None
+        self.fname = None
+        self.binary = False
+        self.encoding = 'utf8'
+        self.unicode_errors = 'strict'
+        self.datatype = REAL
+        self.offsets = None  # byte offset of each vector (binary format) or of its line (text format) in `fname`
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # word => vector, least recently used first
+
+    @property
+    def vectors(self):
+        if self._vectors is None and self.offsets is not None:
+            logger.info("loading all %i vectors from %s", len(self.offsets), self.fname)
+            self._vectors = self._read_vectors(range(len(self.offsets)))
+        return self._vectors
+
+    @vectors.setter
+    def vectors(self, value):
+        self._vectors = value
+
+    @classmethod
+    def load_word2vec_format(cls, fname, fvocab=None, binary=False, encoding='utf8', unicode_errors='strict',
+                             limit=None, datatype=REAL, cache_size=10000):
+        """Index a file in the word2vec format, without loading its vectors.
+
+        Parameters
+        ----------
+        fname : str
+            The file path to the saved word2vec-format file. The file must be local and uncompressed,
+            so that single vectors can be read from it without decompressing everything before them.
+        fvocab : str, optional
+            File path to the vocabulary. Word counts are read from `fvocab` filename, if set
+            (this is the file generated by `-save-vocab` flag of the original C tool).
+        binary : bool, optional
+            If True, indicates whether the data is in binary word2vec format.
+        encoding : str, optional
+            If you trained the C model using non-utf8 encoding for words, specify that encoding in `encoding`.
+        unicode_errors : str, optional
+            default 'strict', is a string suitable to be passed as the `errors`
+            argument to the unicode() (Python 2.x) or str() (Python 3.x) function.
+        limit : int, optional
+            Sets a maximum number of word-vectors to read from the file. The default,
+            None, means read all.
+        datatype : type, optional
+            Type of the vectors read from the file.
+        cache_size : int, optional
+            Maximum number of vectors kept in memory by single-word look-ups.
+
+        Returns
+        -------
+        :class:`~gensim.models.keyedvectors.LazyKeyedVectors`
+            Indexed vectors.
+
+        Raises
+        ------
+        ValueError
+            If `fname` is compressed or not a local file.
+
+        """
+        if not _is_seekable_local(fname):
+            raise ValueError("lazy loading requires a local, uncompressed file, got %s" % fname)
+        counts = None
+        if fvocab is not None:
+            counts = _load_word_counts(fvocab, unicode_errors)
+
+        logger.info("indexing word vectors in %s", fname)
+        with utils.open(fname, 'rb') as fin:
+            header = utils.to_unicode(fin.readline(), encoding=encoding)
+            vocab_size, vector_size = (int(x) for x in header.split())  # throws for invalid file format
+            if limit:
+                vocab_size = min(vocab_size, limit)
+            result = cls(vector_size, cache_size=cache_size)
+            result.fname = os.path.abspath(fname)
+            result.binary = binary
+            result.encoding = encoding
+            result.unicode_errors = unicode_errors
+            result.datatype = datatype
+
+            if binary:
+                start = fin.tell()
+                with open(fname, 'rb') as raw:
+                    buf = memory_map(raw.fileno(), 0, access=ACCESS_READ)
+                try:
+                    result.offsets = _word2vec_scan_binary(
+                        buf, start, result, counts, vocab_size, vector_size, unicode_errors)
+                finally:
+                    buf.close()
+            else:
+                result.offsets = _word2vec_scan_text(fin, result, counts, vocab_size, encoding, unicode_errors)
+
+        logger.info("indexed %i words in %s", len(result.offsets), fname)
+        return result
+
+    @classmethod
+    def load(cls, fname_or_handle, **kwargs):
+        model = super(LazyKeyedVectors, cls).load(fname_or_handle, **kwargs)
+        model.cache = OrderedDict()
+        return model
+
+    def save(self, *args, **kwargs):
+        """Save the index and the vectors loaded so far (but not the cache of single-word look-ups).
+
+        Parameters
+        ----------
+        *args
+            Arguments, see :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.save`.
+        **kwargs
+            Keyword arguments, see :meth:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.save`.
+
+        """
+        kwargs['ignore'] = kwargs.get('ignore', ['vectors_norm', 'cache'])
+        super(LazyKeyedVectors, self).save(*args, **kwargs)
+
+    def _read_vectors(self, indices):
+        """Read the vectors at `indices` from the file, as a matrix."""
+        indices = list(indices)
+        result = zeros((len(indices), self.vector_size), dtype=self.datatype)
+        with utils.open(self.fname, 'rb') as fin:
+            # visit the file in storage order
+            for row in sorted(range(len(indices)), key=lambda row: self.offsets[indices[row]]):
+                result[row] = _word2vec_read_vector(
+                    fin, self.offsets[indices[row]], self.binary, self.vector_size,
+                    self.datatype, self.encoding, self.unicode_errors
+                )
+        return result
+
+    def word_vec(self, word, use_norm=False):
+        """Get `word` representations in vector space, as a 1D numpy array.
+
+        Unless the full matrix is already loaded, the vector is read from the file,
+        or from the cache of recently used vectors.
+
+        Parameters
+        ----------
+        word : str
+            Input word
+        use_norm : bool, optional
+            If True - resulting vector will be L2-normalized (unit euclidean length).
+
+        Returns
+        -------
+        numpy.ndarray
+            Vector representation of `word`.
+
+        Raises
+        ------
+        KeyError
+            If word not in vocabulary.
+
+        """
+        if self._vectors is not None or (use_norm and self.vectors_norm is not None):
+            return super(LazyKeyedVectors, self).word_vec(word, use_norm=use_norm)
+        if word not in self.vocab:
+            raise KeyError("word '%s' not in vocabulary" % word)
+
+        result = self.cache.pop(word, None)
+        if result is None:
+            result = self._read_vectors([self.vocab[word].index])[0]
+            result.setflags(write=False)
+            while self.cache and len(self.cache) >= self.cache_size:
+                self.cache.popitem(last=False)  # evict the least recently used vector
+        if self.cache_size > 0:
+            self.cache[word] = result
+
+        if use_norm:
+            result = matutils.unitvec(result)
+            result.setflags(write=False)
+        return result
+
+
 def _process_fasttext_vocab(iterable, min_n, max_n, num_buckets, compatible_hash):
     """
     Performs a common operation for FastText weight initialization and
@@ -2354,6 +3510,81 @@ def _pad_random(m, new_rows, rand):
     return vstack([m, suffix])
 
 
+def _argsort_rows(dists, topn):
+    """Select the `topn` greatest elements of each row of a 2D matrix.
+
+    Parameters
+    ----------
+    dists : numpy.ndarray
+        Matrix of shape (num_rows, num_columns).
+    topn : int
+        Number of elements to keep from each row, must be `<= num_columns`.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Column indexes and values of the `topn` greatest elements of each row,
+        both of shape (num_rows, topn), ordered by decreasing value.
+
+    """
+    if topn < dists.shape[1]:
+        best = np.argpartition(-dists, topn - 1, axis=1)[:, :topn]
+    else:
+        best = np.tile(np.arange(dists.shape[1]), (dists.shape[0], 1))
+    rows = np.arange(dists.shape[0])[:, newaxis]
+    best_dists = dists[rows, best]
+    order = np.argsort(-best_dists, axis=1, kind='mergesort')
+    return best[rows, order], best_dists[rows, order]
+
+
+def _blocked_topn(vectors, query, topn, blocksize, workers=1, norms=None):
+    """Find the `topn` rows of `vectors` with the greatest dot product with `query`, one block of rows at a time.
+
+    Parameters
+    ----------
+    vectors : numpy.ndarray
+        Matrix of shape (num_vectors, vector_size), possibly memory-mapped.
+    query : numpy.ndarray
+        Vector of shape (vector_size,).
+    topn : int
+        Number of best rows to return.
+    blocksize : int
+        Number of rows scored at once. Each worker holds `blocksize` similarities at a time.
+    workers : int, optional
+        Number of threads scoring blocks in parallel. `numpy.dot` releases the GIL, so threads scale.
+    norms : numpy.ndarray, optional
+        If set, divide the dot product of each row by its norm.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Row indexes and dot products of the `topn` best rows, ordered by decreasing dot product.
+
+    """
+    def score_block(start):
+        dists = dot(vectors[start:start + blocksize], query)
+        if norms is not None:
+            dists /= norms[start:start + blocksize]
+        best = matutils.argsort(dists, topn=topn, reverse=True)
+        return best + start, dists[best]
+
+    starts = range(0, len(vectors), blocksize)
+    pool = ThreadPool(workers) if workers > 1 else None
+    try:
+        blocks = pool.imap(score_block, starts) if pool else map(score_block, starts)
+        best_ids, best_dists = np.empty(0, dtype=np.int64), np.empty(0, dtype=REAL)
+        for block_ids, block_dists in blocks:
+            # merge the block into the running top-N
+            best_ids = np.concatenate((best_ids, block_ids))
+            best_dists = np.concatenate((best_dists, block_dists))
+            best = matutils.argsort(best_dists, topn=topn, reverse=True)
+            best_ids, best_dists = best_ids[best], best_dists[best]
+    finally:
+        if pool:
+            pool.terminate()
+    return best_ids, best_dists
+
+
 def _l2_norm(m, replace=False):
     """Return an L2-normalized version of a matrix.
 
@@ -2368,7 +3599,14 @@ def _l2_norm(m, replace=False):
     -------
     The normalized matrix.  If replace=True, this will be the same as m.
 
+    Notes
+    -----
+    Half-precision (`numpy.float16`) matrices keep their dtype. Their norms are accumulated in float32,
+    one block of rows at a time.
+
     """
+    if m.dtype == np.float16:
+        return _l2_norm_blocked(m, m if replace else np.empty(m.shape, dtype=m.dtype))
     dist = sqrt((m ** 2).sum(-1))[..., newaxis]
     if replace:
         m /= dist
@@ -2377,6 +3615,89 @@ def _l2_norm(m, replace=False):
         return (m / dist).astype(REAL)
 
 
+def _l2_norm_blocked(m, out, blocksize=65536):
+    """Write the L2-normalized rows of `m` into `out`, computing in float32 one block of rows at a time.
+
+    Parameters
+    ----------
+    m : np.array
+        The matrix to normalize.
+    out : np.array
+        Output matrix of the same shape as `m`, may be `m` itself or a memory-mapped array.
+    blocksize : int, optional
+        Number of rows normalized at once.
+
+    Returns
+    -------
+    np.array
+        The `out` matrix.
+
+    """
+    for start in range(0, len(m), blocksize):
+        block = m[start:start + blocksize].astype(REAL)
+        out[start:start + len(block)] = block / sqrt((block ** 2).sum(-1))[..., newaxis]
+    return out
+
+
+def _dot(m, vector, blocksize=65536):
+    """Compute `numpy.dot(m, vector)`, accumulating in at least float32.
+
+    Half-precision (`numpy.float16`) matrices are converted to float32 one block of rows at a time,
+    instead of numpy upcasting the entire matrix (or worse, accumulating in float16).
+
+    Parameters
+    ----------
+    m : np.array
+        Matrix of shape (num_vectors, vector_size).
+    vector : np.array
+        Vector of shape (vector_size,), or a matrix of shape (vector_size, num_queries).
+    blocksize : int, optional
+        Number of rows of `m` converted at once.
+
+    Returns
+    -------
+    np.array
+        The product, of shape (num_vectors,) or (num_vectors, num_queries).
+
+    """
+    if m.dtype != np.float16:
+        return dot(m, vector)
+    result = np.empty((len(m),) + vector.shape[1:], dtype=REAL)
+    for start in range(0, len(m), blocksize):
+        result[start:start + blocksize] = dot(m[start:start + blocksize].astype(REAL), vector)
+    return result
+
+
+def _dot_normed(m, norms, vector):
+    """Compute `_dot(m, vector)`, then divide the result for each row of `m` by `norms` of that row, if set."""
+    result = _dot(m, vector)
+    if norms is not None:
+        result /= norms.reshape((-1,) + (1,) * (result.ndim - 1))
+    return result
+
+
+def _row_norms(m, blocksize=65536):
+    """Compute the L2 norm of each row of `m` in float32, one block of rows at a time."""
+    norms = np.empty(len(m), dtype=REAL)
+    for start in range(0, len(m), blocksize):
+        block = m[start:start + blocksize].astype(REAL)
+        norms[start:start + len(block)] = sqrt((block ** 2).sum(-1))
+    return norms
+
+
+def _upcast(vector):
+    """Convert a half-precision (`numpy.float16`) vector to float32, leave other vectors as they are."""
+    return vector.astype(REAL) if vector.dtype == np.float16 else vector
+
+
+def _compact_csr(indptr, indices):
+    """Drop the negative entries of a CSR structure given by `indptr` and `indices`."""
+    keep = indices >= 0
+    kept = np.zeros(len(keep) + 1, dtype=np.int64)
+    np.cumsum(keep, out=kept[1:])
+    return kept[indptr], indices[keep]
+
+
 def _rollback_optimization(kv):
     """Undo the optimization that pruned buckets.
 
@@ -2512,3 +3833,13 @@ def _try_upgrade(wv):
             "from scratch."
         )
         wv.compatible_hash = False
+
+    if not hasattr(wv, 'cache_size'):
+        wv.cache_size = 10000
+    if not hasattr(wv, 'bucket_rows'):
+        wv.bucket_rows = None
+    if not hasattr(wv, 'norms'):
+        wv.norms = None
+        wv.ngram_norms = None
+    if getattr(wv, 'ngram_cache', None) is None:
+        wv.ngram_cache = OrderedDict()
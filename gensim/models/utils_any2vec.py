@@ -26,9 +26,15 @@ current Facebook implementation, use :py:func:`compute_ngrams_bytes` and
 """
 
 import logging
+import os
+import tempfile
+from itertools import chain
+from mmap import mmap as memory_map, ACCESS_READ
+from multiprocessing import Pool, RawArray
 from gensim import utils
 import gensim.models.keyedvectors
 
+import numpy as np
 from numpy import zeros, dtype, float32 as REAL, ascontiguousarray, frombuffer
 
 from six.moves import range
@@ -54,6 +60,8 @@ def _byte_to_int_py2(b):
 
 
 _byte_to_int = _byte_to_int_py2 if PY2 else _byte_to_int_py3
+# os.replace is Python 3 only; on POSIX, os.rename also replaces the target atomically
+_replace = os.rename if PY2 else os.replace
 
 
 def _is_utf8_continue(b):
@@ -66,6 +74,7 @@ try:
         compute_ngrams_bytes,
         ft_hash_broken,
         ft_hash_bytes,
+        ft_ngram_hashes_bytes_batch,
     )
 except ImportError:
     raise utils.NO_CYTHON
@@ -102,6 +111,40 @@ def ft_ngram_hashes(word, minn, maxn, num_buckets, fb_compatible=True):
     return hashes
 
 
+def ft_ngram_hashes_batch(words, minn, maxn, num_buckets, fb_compatible=True):
+    """Calculate the ngram hashes of many words at once.
+
+    Parameters
+    ----------
+    words : list of str
+        The words to calculate ngram hashes for.
+    minn : int
+        Minimum ngram length
+    maxn : int
+        Maximum ngram length
+    num_buckets : int
+        The number of buckets
+    fb_compatible : boolean, optional
+        True for compatibility with the Facebook implementation.
+        False for compatibility with the old Gensim implementation.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        The hashes in CSR form: `indptr` (int64) and `indices` (uint32), so that
+        `indices[indptr[i]:indptr[i + 1]]` equals `ft_ngram_hashes(words[i], ...)`.
+
+    """
+    if fb_compatible:
+        return ft_ngram_hashes_bytes_batch(words, minn, maxn, num_buckets)
+
+    hashes = [ft_ngram_hashes(word, minn, maxn, num_buckets, fb_compatible=False) for word in words]
+    indptr = np.zeros(len(hashes) + 1, dtype=np.int64)
+    np.cumsum([len(word_hashes) for word_hashes in hashes], out=indptr[1:])
+    indices = np.fromiter(chain.from_iterable(hashes), dtype=np.uint32, count=indptr[-1])
+    return indptr, indices
+
+
 def _save_word2vec_format(fname, vocab, vectors, fvocab=None, binary=False, total_vec=None):
     """Store the input-hidden weight matrix in the same format used by the original
     C word2vec-tool, for compatibility.
@@ -167,7 +210,8 @@ def _add_word_to_result(result, counts, word, weights, vocab_size):
         word_count = None
 
     result.vocab[word] = gensim.models.keyedvectors.Vocab(index=word_id, count=word_count)
-    result.vectors[word_id] = weights
+    if weights is not None:
+        result.vectors[word_id] = weights
     result.index2word.append(word)
 
 
@@ -222,8 +266,372 @@ def _word2vec_read_text(fin, result, counts, vocab_size, vector_size, datatype,
         _add_word_to_result(result, counts, word, weights, vocab_size)
 
 
+def _is_seekable_local(fname):
+    """Can `fname` be read in independent byte ranges (a local file that :func:`gensim.utils.open` won't decompress)?"""
+    return os.path.isfile(fname) and not fname.endswith(('.gz', '.bz2', '.xz'))
+
+
+def _text_byte_ranges(fname, start, num_ranges):
+    """Split `fname` from byte `start` to its end into up to `num_ranges` byte ranges aligned to line starts.
+
+    Returns
+    -------
+    list of (int, int)
+        Non-empty (start, end) byte ranges covering the file from `start`, in file order.
+
+    """
+    size = os.path.getsize(fname)
+    bounds = [start]
+    with open(fname, 'rb') as fin:
+        for i in range(1, num_ranges):
+            pos = start + (size - start) * i // num_ranges
+            if pos <= bounds[-1]:
+                continue
+            fin.seek(pos - 1)
+            fin.readline()  # move to the start of the next line
+            pos = fin.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(range_start, range_end) for range_start, range_end in zip(bounds, bounds[1:]) if range_end > range_start]
+
+
+def _count_text_lines(args):
+    """Count the lines in a byte range of a file, including a last line without a trailing newline."""
+    fname, start, end = args
+    num_lines, last = 0, b'\n'
+    with open(fname, 'rb') as fin:
+        fin.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = fin.read(min(remaining, 1024 * 1024))
+            if not block:
+                break
+            num_lines += block.count(b'\n')
+            last = block[-1:]
+            remaining -= len(block)
+    return num_lines + (last != b'\n')
+
+
+def _count_lines(fname, start=0, workers=1):
+    """Count the lines of `fname` after byte `start`, in `workers` processes if `fname` is a plain local file.
+
+    Returns
+    -------
+    (int, list of (int, int, int))
+        Total number of lines, and the (start byte, end byte, number of lines) of each byte range the file was
+        split into. With a single range, the end byte is None if `fname` isn't a plain local file.
+
+    """
+    if workers <= 1 or not _is_seekable_local(fname):
+        with utils.open(fname, 'rb') as fin:
+            fin.seek(start)
+            num_lines = sum(1 for _ in fin)
+        return num_lines, [(start, None, num_lines)]
+
+    ranges = _text_byte_ranges(fname, start, 4 * workers)
+    pool = Pool(workers)
+    try:
+        counts = pool.map(_count_text_lines, [(fname, range_start, range_end) for range_start, range_end in ranges])
+    finally:
+        pool.terminate()
+    return sum(counts), [(range_start, range_end, count) for (range_start, range_end), count in zip(ranges, counts)]
+
+
+_shared_vectors = None  # matrix shared with the worker processes of _word2vec_read_text_parallel
+
+
+def _init_text_worker(buf, shape, datatype):
+    global _shared_vectors
+    _shared_vectors = frombuffer(buf, dtype=datatype).reshape(shape)
+
+
+def _parse_text_range(args):
+    """Parse the lines of a byte range of a text word2vec file into rows of the shared vectors matrix.
+
+    Returns
+    -------
+    list of str
+        Words of the parsed lines, in file order.
+
+    """
+    fname, start, first_row, num_rows, vector_size, encoding, unicode_errors = args
+    words = []
+    with open(fname, 'rb') as fin:
+        fin.seek(start)
+        for line_no in range(first_row, first_row + num_rows):
+            line = fin.readline()
+            parts = utils.to_unicode(line.rstrip(), encoding=encoding, errors=unicode_errors).split(" ")
+            if len(parts) != vector_size + 1:
+                raise ValueError("invalid vector on line %s (is this really the text format?)" % line_no)
+            _shared_vectors[line_no] = [float(x) for x in parts[1:]]
+            words.append(parts[0])
+    return words
+
+
+def _word2vec_read_text_parallel(fname, start, result, counts, vocab_size, vector_size, datatype,
+                                 unicode_errors, encoding, workers):
+    """Parse a text word2vec file in `workers` processes, directly into a matrix shared with them.
+
+    Parameters
+    ----------
+    fname : str
+        Path to a plain local file.
+    start : int
+        Byte offset of the first line after the header.
+    workers : int
+        Number of worker processes.
+
+    """
+    _, ranges = _count_lines(fname, start, workers)
+    tasks, first_row = [], 0
+    for range_start, _, num_lines in ranges:
+        if first_row >= vocab_size:
+            break
+        num_rows = min(num_lines, vocab_size - first_row)
+        tasks.append((fname, range_start, first_row, num_rows, vector_size, encoding, unicode_errors))
+        first_row += num_rows
+    if first_row < vocab_size:
+        raise EOFError("unexpected end of input; is count incorrect or file otherwise damaged?")
+
+    shape = (vocab_size, vector_size)
+    buf = RawArray('b', vocab_size * vector_size * dtype(datatype).itemsize)
+    pool = Pool(workers, initializer=_init_text_worker, initargs=(buf, shape, datatype))
+    try:
+        keep = []
+        for words in pool.imap(_parse_text_range, tasks):
+            for word in words:
+                keep.append(word not in result.vocab)
+                _add_word_to_result(result, counts, word, None, vocab_size)
+    finally:
+        pool.terminate()
+
+    result.vectors = frombuffer(buf, dtype=datatype).reshape(shape)
+    if not all(keep):
+        # drop the rows of duplicate words, like the sequential reader which never stores them
+        result.vectors = result.vectors[np.array(keep)]
+
+
+def _word2vec_scan_binary(buf, start, result, counts, vocab_size, vector_size, unicode_errors):
+    """Add the words of a binary word2vec file to `result`, skipping over their vectors.
+
+    Parameters
+    ----------
+    buf : {bytes, :class:`mmap.mmap`}
+        Content of the binary word2vec file.
+        Pass a memory map to avoid reading the file into memory.
+    start : int
+        Byte offset of the first word, right after the header line.
+    result : :class:`~gensim.models.keyedvectors.Word2VecKeyedVectors`
+        Model to which the words are added.
+    counts : dict of (str, int)
+        Word counts, or None.
+    vocab_size : int
+        Number of words to read.
+    vector_size : int
+        Dimensionality of the vectors.
+    unicode_errors : str
+        Error handling scheme for decoding the words.
+
+    Returns
+    -------
+    numpy.ndarray
+        Byte offsets of the vectors of the words added to `result`, in vocabulary order
+        (duplicate words are skipped).
+
+    """
+    bytes_per_vector = vector_size * dtype(REAL).itemsize
+    offsets = []
+    for _ in range(vocab_size):
+        i_space = buf.find(b' ', start)
+        i_vector = i_space + 1
+        if i_space == -1 or (len(buf) - i_vector) < bytes_per_vector:
+            raise EOFError("unexpected end of input; is count incorrect or file otherwise damaged?")
+
+        word = buf[start:i_space].decode("utf-8", errors=unicode_errors)
+        # Some binary files are reported to have obsolete new line in the beginning of word, remove it
+        word = word.lstrip('\n')
+        if word not in result.vocab:
+            offsets.append(i_vector)
+        _add_word_to_result(result, counts, word, None, vocab_size)
+        start = i_vector + bytes_per_vector
+    return np.array(offsets, dtype=np.int64)
+
+
+def _word2vec_mmap_vectors(fname, buf, offsets, vector_size, datatype, mmap, blocksize=1024):
+    """Get the vectors of a binary word2vec file as a memory-mapped array.
+
+    The vectors are interleaved with variable-length words in the word2vec format, so they are copied once
+    into a sidecar `fname.vectors.npy` file. Later loads memory-map the sidecar directly, as long as it is
+    newer than `fname` and has the expected shape and type.
+
+    Parameters
+    ----------
+    fname : str
+        Path to the binary word2vec file.
+    buf : :class:`mmap.mmap`
+        Memory map of `fname`.
+    offsets : numpy.ndarray
+        Byte offsets of the vectors to load, see :func:`~gensim.models.utils_any2vec._word2vec_scan_binary`.
+    vector_size : int
+        Dimensionality of the vectors.
+    datatype : type
+        Type of the returned vectors.
+    mmap : str
+        Memory-map mode, see :func:`numpy.load`.
+    blocksize : int, optional
+        Number of vectors copied at once while writing the sidecar.
+
+    Returns
+    -------
+    numpy.memmap
+        Vectors of shape (`len(offsets)`, `vector_size`). If the sidecar can't be created
+        (e.g. the directory of `fname` is read-only), the vectors are copied into memory instead.
+
+    """
+    sidecar = fname + '.vectors.npy'
+    shape = (len(offsets), vector_size)
+    if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(fname):
+        vectors = np.load(sidecar, mmap_mode=mmap)
+        if vectors.shape == shape and vectors.dtype == dtype(datatype):
+            logger.info("memory-mapping vectors from %s", sidecar)
+            return vectors
+        del vectors
+
+    # write a temporary file and move it into place, so that processes loading the same file concurrently,
+    # or still using an older sidecar, never see a partially written or truncated file
+    try:
+        handle, tmp = tempfile.mkstemp(
+            suffix='.npy', prefix=os.path.basename(sidecar) + '.', dir=os.path.dirname(sidecar))
+    except (IOError, OSError) as err:
+        logger.warning("cannot create %s (%s), loading the vectors from %s into memory instead", sidecar, err, fname)
+        out = zeros(shape, dtype=datatype)
+        _word2vec_copy_vectors(out, buf, offsets, vector_size, blocksize)
+        return out
+    os.close(handle)
+    logger.info("copying %s vectors from %s into %s", shape, fname, sidecar)
+    try:
+        out = np.lib.format.open_memmap(tmp, mode='w+', dtype=datatype, shape=shape)
+        _word2vec_copy_vectors(out, buf, offsets, vector_size, blocksize)
+        out.flush()
+        del out  # release the buffer, so that `tmp` can be moved
+        _replace(tmp, sidecar)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return np.load(sidecar, mmap_mode=mmap)
+
+
+def _word2vec_copy_vectors(out, buf, offsets, vector_size, blocksize):
+    """Copy the binary vectors at byte `offsets` of `buf` into the rows of `out`, `blocksize` vectors at a time."""
+    raw = frombuffer(buf, dtype=np.uint8)
+    columns = np.arange(vector_size * dtype(REAL).itemsize)
+    for start in range(0, len(offsets), blocksize):
+        rows = offsets[start:start + blocksize]
+        out[start:start + len(rows)] = raw[rows[:, np.newaxis] + columns].view(REAL)
+
+
+def _word2vec_load_binary_mmap(fname, result, counts, vocab_size, vector_size, datatype, unicode_errors, mmap):
+    with open(fname, 'rb') as fin:
+        fin.readline()  # skip the header
+        start = fin.tell()
+        buf = memory_map(fin.fileno(), 0, access=ACCESS_READ)
+    try:
+        offsets = _word2vec_scan_binary(buf, start, result, counts, vocab_size, vector_size, unicode_errors)
+        result.vectors = _word2vec_mmap_vectors(fname, buf, offsets, vector_size, datatype, mmap)
+    finally:
+        buf.close()
+
+
+def _word2vec_scan_text(fin, result, counts, vocab_size, encoding, unicode_errors):
+    """Add the words of a text word2vec file to `result`, without parsing their vectors.
+
+    Parameters
+    ----------
+    fin : file
+        Seekable file object, positioned at the first line after the header.
+    result : :class:`~gensim.models.keyedvectors.Word2VecKeyedVectors`
+        Model to which the words are added.
+    counts : dict of (str, int)
+        Word counts, or None.
+    vocab_size : int
+        Number of words to read.
+    encoding : str
+        Encoding of the words.
+    unicode_errors : str
+        Error handling scheme for decoding the words.
+
+    Returns
+    -------
+    numpy.ndarray
+        Byte offsets of the lines of the words added to `result`, in vocabulary order
+        (duplicate words are skipped).
+
+    """
+    offsets = []
+    for _ in range(vocab_size):
+        offset = fin.tell()
+        line = fin.readline()
+        if line == b'':
+            raise EOFError("unexpected end of input; is count incorrect or file otherwise damaged?")
+        word = utils.to_unicode(line.split(b' ', 1)[0].rstrip(), encoding=encoding, errors=unicode_errors)
+        if word not in result.vocab:
+            offsets.append(offset)
+        _add_word_to_result(result, counts, word, None, vocab_size)
+    return np.array(offsets, dtype=np.int64)
+
+
+def _word2vec_read_vector(fin, offset, binary, vector_size, datatype, encoding, unicode_errors):
+    """Read a single vector of a word2vec file.
+
+    Parameters
+    ----------
+    fin : file
+        Seekable file object.
+    offset : int
+        Byte offset of the vector (binary format) or of its line (text format),
+        see :func:`~gensim.models.utils_any2vec._word2vec_scan_binary` and
+        :func:`~gensim.models.utils_any2vec._word2vec_scan_text`.
+    binary : bool
+        Whether the file is in the binary word2vec format.
+    vector_size : int
+        Dimensionality of the vectors.
+    datatype : type
+        Type of the returned vector.
+    encoding : str
+        Encoding of a text file.
+    unicode_errors : str
+        Error handling scheme for decoding a text file.
+
+    Returns
+    -------
+    numpy.ndarray
+        The vector.
+
+    """
+    fin.seek(offset)
+    if binary:
+        return frombuffer(fin.read(vector_size * dtype(REAL).itemsize), dtype=REAL).astype(datatype)
+    parts = utils.to_unicode(fin.readline().rstrip(), encoding=encoding, errors=unicode_errors).split(" ")
+    if len(parts) != vector_size + 1:
+        raise ValueError("invalid vector at byte %i (is this really the text format?)" % offset)
+    return np.array([datatype(x) for x in parts[1:]], dtype=datatype)
+
+
+def _load_word_counts(fvocab, unicode_errors='strict'):
+    """Load the word counts of a vocabulary file, as written by the `-save-vocab` flag of the C tool."""
+    logger.info("loading word counts from %s", fvocab)
+    counts = {}
+    with utils.open(fvocab, 'rb') as fin:
+        for line in fin:
+            word, count = utils.to_unicode(line, errors=unicode_errors).strip().split()
+            counts[word] = int(count)
+    return counts
+
+
 def _load_word2vec_format(cls, fname, fvocab=None, binary=False, encoding='utf8', unicode_errors='strict',
-                          limit=None, datatype=REAL, binary_chunk_size=100 * 1024):
+                          limit=None, datatype=REAL, binary_chunk_size=100 * 1024, mmap=None, workers=1):
     """Load the input-hidden weight matrix from the original C word2vec-tool format.
 
     Note that the information stored in the file is incomplete (the binary tree is missing),
@@ -254,6 +662,16 @@ def _load_word2vec_format(cls, fname, fvocab=None, binary=False, encoding='utf8'
         Such types may result in much slower bulk operations or incompatibility with optimized routines.)
     binary_chunk_size : int, optional
         Read input file in chunks of this many bytes for performance reasons.
+    mmap : str, optional
+        Memory-map the vectors of a binary file (`fname` must be a local, uncompressed file), with this mode
+        (see :func:`numpy.load`). The first load copies the vectors into a `fname.vectors.npy` sidecar file,
+        later loads only scan the words and memory-map the sidecar, so that processes loading the same file
+        share its pages. If the sidecar can't be created (e.g. in a read-only directory), or if None,
+        vectors are read into memory.
+    workers : int, optional
+        Parse a text file in this many processes, each handling a range of lines. Only used for local,
+        uncompressed files in the text format, when `limit` doesn't stop reading before the end of the file
+        (the parallel reader has to count the lines of the whole file first).
 
     Returns
     -------
@@ -261,30 +679,38 @@ def _load_word2vec_format(cls, fname, fvocab=None, binary=False, encoding='utf8'
         Returns the loaded model as an instance of :class:`cls`.
 
     """
+    if mmap is not None and not binary:
+        raise ValueError("mmap is only supported for the binary word2vec format")
+    if mmap is not None and not _is_seekable_local(fname):
+        raise ValueError("mmap requires a local, uncompressed file, got %s" % fname)
 
     counts = None
     if fvocab is not None:
-        logger.info("loading word counts from %s", fvocab)
-        counts = {}
-        with utils.open(fvocab, 'rb') as fin:
-            for line in fin:
-                word, count = utils.to_unicode(line, errors=unicode_errors).strip().split()
-                counts[word] = int(count)
+        counts = _load_word_counts(fvocab, unicode_errors)
 
     logger.info("loading projection weights from %s", fname)
     with utils.open(fname, 'rb') as fin:
         header = utils.to_unicode(fin.readline(), encoding=encoding)
         vocab_size, vector_size = (int(x) for x in header.split())  # throws for invalid file format
+        truncated = bool(limit) and limit < vocab_size
         if limit:
             vocab_size = min(vocab_size, limit)
         result = cls(vector_size)
         result.vector_size = vector_size
-        result.vectors = zeros((vocab_size, vector_size), dtype=datatype)
 
-        if binary:
+        if mmap is not None:
+            _word2vec_load_binary_mmap(
+                fname, result, counts, vocab_size, vector_size, datatype, unicode_errors, mmap)
+        elif binary:
+            result.vectors = zeros((vocab_size, vector_size), dtype=datatype)
             _word2vec_read_binary(fin, result, counts,
                 vocab_size, vector_size, datatype, unicode_errors, binary_chunk_size)
+        elif workers > 1 and not truncated and _is_seekable_local(fname):
+            _word2vec_read_text_parallel(
+                fname, fin.tell(), result, counts, vocab_size, vector_size, datatype,
+                unicode_errors, encoding, workers)
         else:
+            result.vectors = zeros((vocab_size, vector_size), dtype=datatype)
             _word2vec_read_text(fin, result, counts, vocab_size, vector_size, datatype, unicode_errors, encoding)
     if result.vectors.shape[0] != len(result.vocab):
         logger.info(
@@ -641,6 +641,7 @@ class Word2Vec(BaseWordEmbeddingsModel):
     def _clear_post_train(self):
         """Remove all L2-normalized word vectors from the model."""
         self.wv.vectors_norm = None
+        self.wv.norms = None
 
     def _set_train_params(self, **kwargs):
         if 'compute_loss' in kwargs:
@@ -862,6 +863,7 @@ class Word2Vec(BaseWordEmbeddingsModel):
 
         """
         self.wv.vectors_norm = None
+        self.wv.norms = None
 
     def intersect_word2vec_format(self, fname, lockf=0.0, binary=False, encoding='utf8', unicode_errors='strict'):
         """Merge in an input-hidden weight matrix loaded from the original C word2vec-tool format,
@@ -1707,6 +1709,7 @@ class Word2VecTrainables(utils.SaveLoad):
         if negative:
             self.syn1neg = zeros((len(wv.vocab), self.layer1_size), dtype=REAL)
         wv.vectors_norm = None
+        wv.norms = None
 
         self.vectors_lockf = ones(len(wv.vocab), dtype=REAL)  # zeros suppress learning
 
@@ -1736,6 +1739,7 @@ class Word2VecTrainables(utils.SaveLoad):
             pad = zeros((gained_vocab, self.layer1_size), dtype=REAL)
             self.syn1neg = vstack([self.syn1neg, pad])
         wv.vectors_norm = None
+        wv.norms = None
 
         # do not suppress learning for already learned words
         self.vectors_lockf = ones(len(wv.vocab), dtype=REAL)  # zeros suppress learning
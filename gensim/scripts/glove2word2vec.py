@@ -58,19 +58,24 @@ Command line arguments
 import sys
 import logging
 import argparse
+import shutil
 
 from gensim import utils
+from gensim.models.utils_any2vec import _count_lines
 
 logger = logging.getLogger(__name__)
 
 
-def get_glove_info(glove_file_name):
+def get_glove_info(glove_file_name, workers=1):
     """Get number of vectors in provided `glove_file_name` and dimension of vectors.
 
     Parameters
     ----------
     glove_file_name : str
         Path to file in GloVe format.
+    workers : int, optional
+        Count the lines in this many worker processes, each handling a range of the file.
+        Only used if `glove_file_name` is a local, uncompressed file.
 
     Returns
     -------
@@ -78,14 +83,13 @@ def get_glove_info(glove_file_name):
         Number of vectors (lines) of input file and its dimension.
 
     """
-    with utils.open(glove_file_name, 'rb') as f:
-        num_lines = sum(1 for _ in f)
+    num_lines, _ = _count_lines(glove_file_name, workers=workers)
     with utils.open(glove_file_name, 'rb') as f:
         num_dims = len(f.readline().split()) - 1
     return num_lines, num_dims
 
 
-def glove2word2vec(glove_input_file, word2vec_output_file):
+def glove2word2vec(glove_input_file, word2vec_output_file, workers=1):
     """Convert `glove_input_file` in GloVe format to word2vec format and write it to `word2vec_output_file`.
 
     Parameters
@@ -94,6 +98,9 @@ def glove2word2vec(glove_input_file, word2vec_output_file):
         Path to file in GloVe format.
     word2vec_output_file: str
         Path to output file.
+    workers : int, optional
+        Number of worker processes used to count the input lines, see
+        :func:`~gensim.scripts.glove2word2vec.get_glove_info`.
 
     Returns
     -------
@@ -101,13 +108,12 @@ def glove2word2vec(glove_input_file, word2vec_output_file):
         Number of vectors (lines) of input file and its dimension.
 
     """
-    num_lines, num_dims = get_glove_info(glove_input_file)
+    num_lines, num_dims = get_glove_info(glove_input_file, workers=workers)
     logger.info("converting %i vectors from %s to %s", num_lines, glove_input_file, word2vec_output_file)
     with utils.open(word2vec_output_file, 'wb') as fout:
         fout.write("{0} {1}\n".format(num_lines, num_dims).encode('utf-8'))
         with utils.open(glove_input_file, 'rb') as fin:
-            for line in fin:
-                fout.write(line)
+            shutil.copyfileobj(fin, fout, 1024 * 1024)
     return num_lines, num_dims
 
 
@@ -116,8 +122,11 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description=__doc__[:-135], formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument("-i", "--input", required=True, help="Path to input file in GloVe format")
     parser.add_argument("-o", "--output", required=True, help="Path to output file")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1, help="Number of processes used to count the input lines"
+    )
     args = parser.parse_args()
 
     logger.info("running %s", ' '.join(sys.argv))
-    num_lines, num_dims = glove2word2vec(args.input, args.output)
+    num_lines, num_dims = glove2word2vec(args.input, args.output, workers=args.workers)
     logger.info('Converted model with %i vectors and %i dimensions', num_lines, num_dims)
@@ -10,6 +10,8 @@ from .docsim import (  # noqa:F401
     SparseMatrixSimilarity,
     SoftCosineSimilarity,
     WmdSimilarity)
+from .ivf import IvfSimilarity  # noqa:F401
+from .hnsw import HnswIndexer  # noqa:F401
 from .termsim import (  # noqa:F401
     TermSimilarityIndex,
     UniformTermSimilarityIndex,
@@ -0,0 +1,268 @@
+#!/usr/bin/env cython
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: cdivision=True
+# cython: embedsignature=True
+# coding: utf-8
+#
+# Licensed under the GNU LGPL v2.1 - http://www.gnu.org/licenses/lgpl.html
+
+"""Levenshtein distance kernels used by :mod:`gensim.similarities.levenshtein`.
+
+Queries of up to 64 characters use the bit-parallel algorithm of Myers in the formulation of Hyyrö,
+longer queries use the dynamic programming algorithm with a cutoff on the minimum of each row.
+Both stop early when the distance is known to exceed the requested maximum distance.
+
+"""
+
+import numpy as np
+cimport numpy as np
+from libc.stdlib cimport malloc, free
+
+ctypedef np.uint32_t char_t
+ctypedef np.uint64_t word_t
+ctypedef np.int64_t index_t
+
+cdef enum:
+    WORD_BITS = 64  # the longest query handled by the bit-parallel algorithm
+    DIRECT_CHARS = 256  # characters whose match masks are looked up directly
+
+
+cdef struct Pattern:
+    index_t length
+    const char_t *chars
+    word_t direct_masks[DIRECT_CHARS]  # match masks of the characters below DIRECT_CHARS
+    char_t other_chars[WORD_BITS]  # the remaining distinct characters of the query ...
+    word_t other_masks[WORD_BITS]  # ... and their match masks
+    int num_other
+    index_t *row  # a dynamic programming row for queries longer than WORD_BITS
+
+
+cdef int _init_pattern(Pattern *pattern, const char_t *chars, index_t length) except -1:
+    cdef index_t i
+    cdef int k
+    cdef char_t c
+
+    pattern.length = length
+    pattern.chars = chars
+    pattern.num_other = 0
+    pattern.row = NULL
+    if length > WORD_BITS:
+        pattern.row = <index_t *>malloc((length + 1) * sizeof(index_t))
+        if pattern.row == NULL:
+            raise MemoryError()
+        return 0
+
+    for i in range(DIRECT_CHARS):
+        pattern.direct_masks[i] = 0
+    for i in range(length):
+        c = chars[i]
+        if c < DIRECT_CHARS:
+            pattern.direct_masks[c] |= (<word_t>1) << i
+            continue
+        for k in range(pattern.num_other):
+            if pattern.other_chars[k] == c:
+                break
+        else:
+            k = pattern.num_other
+            pattern.other_chars[k] = c
+            pattern.other_masks[k] = 0
+            pattern.num_other += 1
+        pattern.other_masks[k] |= (<word_t>1) << i
+    return 0
+
+
+cdef inline word_t _match_mask(const Pattern *pattern, char_t c) nogil:
+    cdef int k
+    if c < DIRECT_CHARS:
+        return pattern.direct_masks[c]
+    for k in range(pattern.num_other):
+        if pattern.other_chars[k] == c:
+            return pattern.other_masks[k]
+    return 0
+
+
+cdef index_t _bit_parallel_distance(const Pattern *pattern, const char_t *text, index_t n, index_t max_distance) nogil:
+    """Get the distance between the pattern and the text, or -1 once it is known to exceed `max_distance`."""
+    cdef word_t pv = ~(<word_t>0), mv = 0, eq, xv, xh, ph, mh
+    cdef word_t last = (<word_t>1) << (pattern.length - 1)
+    cdef index_t score = pattern.length, j
+
+    for j in range(n):
+        eq = _match_mask(pattern, text[j])
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh = mh << 1
+        pv = mh | ~(xv | ph)
+        mv = ph & xv
+        if score - (n - j - 1) > max_distance:  # each remaining character lowers the distance at most by one
+            return -1
+    return score
+
+
+cdef index_t _dynamic_programming_distance(
+        const Pattern *pattern, const char_t *text, index_t n, index_t max_distance) nogil:
+    """Get the distance between the pattern and the text, or -1 once it is known to exceed `max_distance`."""
+    cdef index_t *row = pattern.row
+    cdef index_t m = pattern.length, i, j, diagonal, above, value, row_min
+
+    for i in range(m + 1):
+        row[i] = i
+    for j in range(1, n + 1):
+        diagonal = row[0]
+        row[0] = j
+        row_min = j
+        for i in range(1, m + 1):
+            above = row[i]
+            value = diagonal + (pattern.chars[i - 1] != text[j - 1])
+            if above + 1 < value:
+                value = above + 1
+            if row[i - 1] + 1 < value:
+                value = row[i - 1] + 1
+            row[i] = value
+            diagonal = above
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:  # the minima of the rows never decrease
+            return -1
+    return row[m]
+
+
+cdef index_t _distance(const Pattern *pattern, const char_t *text, index_t n, index_t max_distance) nogil:
+    """Get the distance between the pattern and the text, or `max(m, n)` if it exceeds `max_distance`."""
+    cdef index_t m = pattern.length, distance
+    cdef index_t longest = m if m > n else n
+
+    if (m - n if m > n else n - m) > max_distance:
+        return longest
+    if m == 0:
+        distance = n
+    elif n == 0:
+        distance = m
+    elif m <= WORD_BITS:
+        distance = _bit_parallel_distance(pattern, text, n, max_distance)
+    else:
+        distance = _dynamic_programming_distance(pattern, text, n, max_distance)
+    if distance < 0 or distance > max_distance:
+        return longest
+    return distance
+
+
+def levdist_batch(const char_t[::1] query, const char_t[::1] chars, const index_t[::1] indptr,
+                  const index_t[::1] candidates, const index_t[::1] max_distances):
+    """Get the Levenshtein distances between a query and many terms.
+
+    The GIL is released while the distances are computed.
+
+    Parameters
+    ----------
+    query : numpy.ndarray
+        Code points of the query (uint32).
+    chars : numpy.ndarray
+        Concatenated code points of all the terms (uint32).
+    indptr : numpy.ndarray
+        The code points of the i-th term are `chars[indptr[i]:indptr[i + 1]]` (int64).
+    candidates : numpy.ndarray
+        Positions of the terms compared with the query (int64).
+    max_distances : numpy.ndarray
+        For every candidate, the largest distance that needs to be computed exactly (int64).
+
+    Returns
+    -------
+    numpy.ndarray
+        For every candidate, the Levenshtein distance to the query, or the length of the longer
+        of the two terms if the distance exceeds the maximum distance of the candidate (int64).
+
+    """
+    cdef Py_ssize_t num_candidates = candidates.shape[0], i
+    cdef index_t term, start
+    cdef Pattern pattern
+    cdef const char_t *query_chars = NULL
+    cdef const char_t *term_chars = NULL
+
+    if query.shape[0] > 0:
+        query_chars = &query[0]
+    if chars.shape[0] > 0:
+        term_chars = &chars[0]
+
+    distances = np.empty(num_candidates, dtype=np.int64)
+    cdef index_t[::1] distances_view = distances
+
+    _init_pattern(&pattern, query_chars, query.shape[0])
+    try:
+        with nogil:
+            for i in range(num_candidates):
+                term = candidates[i]
+                start = indptr[term]
+                distances_view[i] = _distance(
+                    &pattern, term_chars + start, indptr[term + 1] - start, max_distances[i])
+    finally:
+        free(pattern.row)
+    return distances
+
+
+cdef char_t *_code_points(term, index_t *length) except NULL:
+    cdef const unsigned char *bytez
+    cdef char_t *chars
+    cdef Py_UCS4 c
+    cdef index_t i = 0
+
+    length[0] = len(term)
+    chars = <char_t *>malloc((length[0] + 1) * sizeof(char_t))
+    if chars == NULL:
+        raise MemoryError()
+    if isinstance(term, bytes):
+        bytez = term
+        for i in range(length[0]):
+            chars[i] = bytez[i]
+    else:
+        for c in <unicode>term:
+            chars[i] = c
+            i += 1
+    return chars
+
+
+def levdist_pair(t1, t2, index_t max_distance):
+    """Get the Levenshtein distance between two terms.
+
+    Parameters
+    ----------
+    t1 : {bytes, str}
+        The first compared term.
+    t2 : {bytes, str}
+        The second compared term.
+    max_distance : int
+        The largest distance that needs to be computed exactly.
+
+    Returns
+    -------
+    int
+        The Levenshtein distance between `t1` and `t2`, or `max(len(t1), len(t2))` if the distance
+        exceeds `max_distance`.
+
+    """
+    cdef index_t m, n, distance
+    cdef Pattern pattern
+    cdef char_t *query_chars = NULL
+    cdef char_t *term_chars = NULL
+
+    try:
+        query_chars = _code_points(t1, &m)
+        term_chars = _code_points(t2, &n)
+        _init_pattern(&pattern, query_chars, m)
+        try:
+            with nogil:
+                distance = _distance(&pattern, term_chars, n, max_distance)
+        finally:
+            free(pattern.row)
+    finally:
+        free(query_chars)
+        free(term_chars)
+    return distance
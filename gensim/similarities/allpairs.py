@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Licensed under the GNU LGPL v2.1 - http://www.gnu.org/licenses/lgpl.html
+
+"""
+Intro
+-----
+
+This module contains a thresholded all-pairs similarity self-join: it finds all pairs of documents of an index
+whose cosine similarity is at least a threshold, without computing the full matrix of pairwise similarities.
+
+* Sparse vectors (e.g. bag-of-words or TF-IDF) are joined with prefix filtering, in the style of AllPairs [bayardo07]_
+  with the :math:`\\ell_2` bounds of L2AP [anastasiu14]_. Features are ordered by decreasing document frequency and
+  only the suffix of every vector that holds more than :math:`1 - t^2` of its squared norm is indexed; a pair of
+  vectors with similarity :math:`\\geq t` always shares an indexed feature. The candidate pairs are further pruned
+  by the norm of the unindexed prefixes and by length bounds before their similarity is computed exactly.
+* Dense vectors (e.g. LSI or Doc2Vec) are joined by blocked matrix products over the upper triangle
+  of the similarity matrix.
+
+Blocks of documents are joined in parallel by `workers` processes.
+
+Example usage
+-------------
+
+.. sourcecode:: pycon
+
+    >>> from gensim.test.utils import common_corpus, common_dictionary
+    >>> from gensim.similarities import SparseMatrixSimilarity
+    >>> from gensim.similarities.allpairs import all_pairs
+    >>>
+    >>> index = SparseMatrixSimilarity(common_corpus, num_features=len(common_dictionary))
+    >>> pairs = all_pairs(index, threshold=0.5)  # upper triangular scipy.sparse.csr_matrix
+    >>> for docno, other_docno in zip(*pairs.nonzero()):
+    ...     print(docno, other_docno, pairs[docno, other_docno])
+
+References
+----------
+.. [bayardo07] Roberto J. Bayardo, Yiming Ma, Ramakrishnan Srikant, "Scaling up all pairs similarity search", 2007.
+.. [anastasiu14] David C. Anastasiu, George Karypis, "L2AP: Fast cosine similarity search with prefix L-2 norm
+   bounds", 2014.
+
+"""
+
+import logging
+import multiprocessing
+
+import numpy
+import scipy.sparse
+from six.moves import range
+
+from gensim.similarities.docsim import Similarity
+
+logger = logging.getLogger(__name__)
+
+BOUND_SLACK = 1e-6  # tolerance of the pruning bounds, so that rounding errors never prune a true pair
+
+
+def _index_matrix(index):
+    """Get the vectors of an index as a matrix with one row per document.
+
+    Parameters
+    ----------
+    index : {:class:`~gensim.similarities.docsim.Similarity`, :class:`~gensim.similarities.docsim.MatrixSimilarity`,
+             :class:`~gensim.similarities.docsim.SparseMatrixSimilarity`, numpy.ndarray, scipy.sparse matrix}
+        The index, or its vectors.
+
+    Returns
+    -------
+    {numpy.ndarray, :class:`scipy.sparse.csr_matrix`}
+        The vectors, sparse if any of them is sparse.
+
+    """
+    if isinstance(index, Similarity):
+        chunks = list(index.iter_chunks())
+        if not chunks:
+            return numpy.zeros((0, index.num_features), dtype=numpy.float32)
+        if any(scipy.sparse.issparse(chunk) for chunk in chunks):
+            return scipy.sparse.vstack([scipy.sparse.csr_matrix(chunk) for chunk in chunks], format='csr')
+        return numpy.vstack(chunks)
+    matrix = getattr(index, 'index', index)
+    if scipy.sparse.issparse(matrix):
+        return matrix.tocsr()
+    return numpy.asarray(matrix)
+
+
+def _normalize(matrix):
+    """Scale the rows of `matrix` to unit length, leaving zero rows as they are."""
+    if scipy.sparse.issparse(matrix):
+        matrix = matrix.astype(numpy.float32)
+        row_lengths = numpy.diff(matrix.indptr)
+        norms = numpy.sqrt(numpy.bincount(
+            numpy.repeat(numpy.arange(matrix.shape[0]), row_lengths),
+            weights=numpy.square(matrix.data, dtype=numpy.float64), minlength=matrix.shape[0],
+        ))
+        norms[norms == 0.0] = 1.0
+        matrix.data /= numpy.repeat(norms, row_lengths).astype(matrix.dtype)
+        return matrix
+    matrix = numpy.array(matrix, dtype=numpy.float32)
+    norms = numpy.sqrt(numpy.einsum('ij,ij->i', matrix, matrix))
+    norms[norms == 0.0] = 1.0
+    matrix /= norms[:, None]
+    return matrix
+
+
+def _sparse_state(matrix, threshold):
+    """Split the unit row vectors of a sparse `matrix` into unindexed prefixes and indexed suffixes.
+
+    Parameters
+    ----------
+    matrix : :class:`scipy.sparse.csr_matrix`
+        Unit row vectors.
+    threshold : float
+        Similarity threshold of the join.
+
+    Returns
+    -------
+    dict
+        The rows (`matrix`), their prefixes (`prefix`) and suffixes (`suffix`), all with features ordered by
+        decreasing document frequency, and the norms of the prefixes (`prefix_norms`), the largest magnitudes
+        (`max_weights`) and the :math:`\\ell_1` norms (`l1_norms`) of the rows.
+
+    """
+    num_docs, num_features = matrix.shape
+    # frequent features go first, into the unindexed prefixes, so that the inverted index stays small
+    order = numpy.argsort(-numpy.bincount(matrix.indices, minlength=num_features), kind='mergesort')
+    matrix = matrix[:, order].tocsr()
+    matrix.sort_indices()
+
+    row_lengths = numpy.diff(matrix.indptr)
+    rows = numpy.repeat(numpy.arange(num_docs), row_lengths)
+    squares = numpy.square(matrix.data, dtype=numpy.float64)
+    cumulative = numpy.cumsum(squares)
+    # squared norm of every row up to and including each of its elements
+    cumulative -= numpy.concatenate([[0.0], cumulative])[matrix.indptr[:-1]][rows]
+    in_prefix = cumulative < threshold ** 2 * (1.0 - BOUND_SLACK)
+
+    prefix, suffix = matrix.copy(), matrix.copy()
+    prefix.data[~in_prefix] = 0
+    suffix.data[in_prefix] = 0
+    prefix.eliminate_zeros()
+    suffix.eliminate_zeros()
+    logger.info(
+        "indexing %i of %i non-zero elements (%.02f%%) for threshold %s",
+        suffix.nnz, matrix.nnz, 100.0 * suffix.nnz / max(matrix.nnz, 1), threshold
+    )
+
+    magnitudes = numpy.abs(matrix.data, dtype=numpy.float64)
+    max_weights = numpy.zeros(num_docs)
+    nonempty = row_lengths > 0
+    if nonempty.any():
+        max_weights[nonempty] = numpy.maximum.reduceat(magnitudes, matrix.indptr[:-1][nonempty])
+    return {
+        'matrix': matrix,
+        'prefix': prefix,
+        'suffix': suffix,
+        'prefix_norms': numpy.sqrt(numpy.bincount(rows, weights=squares * in_prefix, minlength=num_docs)),
+        'max_weights': max_weights,
+        'l1_norms': numpy.bincount(rows, weights=magnitudes, minlength=num_docs),
+    }
+
+
+def _join_sparse_block(state, start, end, threshold, blocksize):
+    """Find the pairs of documents `i < j` with similarity at least `threshold`, for `start <= i < end`.
+
+    Parameters
+    ----------
+    state : dict
+        The split rows, see :func:`~gensim.similarities.allpairs._sparse_state`.
+    start : int
+        The first row of the block.
+    end : int
+        The row after the last row of the block.
+    threshold : float
+        Similarity threshold of the join.
+    blocksize : int
+        Number of rows `j` probed at once.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        Rows `i`, rows `j` and similarities of the found pairs.
+
+    """
+    matrix, prefix, suffix = state['matrix'], state['prefix'], state['suffix']
+    prefix_norms, max_weights, l1_norms = state['prefix_norms'], state['max_weights'], state['l1_norms']
+    bound = threshold * (1.0 - BOUND_SLACK)
+    block = matrix[start:end]
+    found_i, found_j, found_sims = [], [], []
+    for block_start in range(start, matrix.shape[0], blocksize):
+        block_end = min(block_start + blocksize, matrix.shape[0])
+        # partial similarities of the rows sharing an indexed feature, all others are below the threshold
+        candidates = (block * suffix[block_start:block_end].T).tocoo()
+        i, j, partial = candidates.row + start, candidates.col + block_start, candidates.data
+        keep = j > i
+        # the unindexed prefix of row j adds at most its norm to the similarity
+        keep &= partial + prefix_norms[j] >= bound
+        # length bounds: |x . y| <= max |x_k| * sum |y_k|
+        keep &= max_weights[i] * l1_norms[j] >= bound
+        keep &= max_weights[j] * l1_norms[i] >= bound
+        i, j, partial = i[keep], j[keep], partial[keep]
+        if not len(i):
+            continue
+        sims = partial + numpy.asarray(matrix[i].multiply(prefix[j]).sum(axis=1)).ravel()
+        keep = sims >= threshold
+        found_i.append(i[keep])
+        found_j.append(j[keep])
+        found_sims.append(sims[keep])
+    return _concatenate(found_i, found_j, found_sims)
+
+
+def _join_dense_block(state, start, end, threshold, blocksize):
+    """Find the pairs of documents `i < j` with similarity at least `threshold`, for `start <= i < end`.
+
+    Parameters
+    ----------
+    state : dict
+        The unit rows (`matrix`).
+    start : int
+        The first row of the block.
+    end : int
+        The row after the last row of the block.
+    threshold : float
+        Similarity threshold of the join.
+    blocksize : int
+        Number of rows `j` compared at once.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        Rows `i`, rows `j` and similarities of the found pairs.
+
+    """
+    matrix = state['matrix']
+    block = matrix[start:end]
+    found_i, found_j, found_sims = [], [], []
+    for block_start in range(start, matrix.shape[0], blocksize):
+        block_end = min(block_start + blocksize, matrix.shape[0])
+        sims = numpy.dot(block, matrix[block_start:block_end].T)
+        i, j = numpy.nonzero(sims >= threshold)
+        sims = sims[i, j]
+        i, j = i + start, j + block_start
+        keep = j > i  # the upper triangle, without the diagonal
+        found_i.append(i[keep])
+        found_j.append(j[keep])
+        found_sims.append(sims[keep])
+    return _concatenate(found_i, found_j, found_sims)
+
+
+def _concatenate(found_i, found_j, found_sims):
+    if not found_i:
+        return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, numpy.float32)
+    return numpy.concatenate(found_i), numpy.concatenate(found_j), numpy.concatenate(found_sims)
+
+
+def _init_join_worker(join, state, threshold, blocksize):
+    global _worker_join
+    _worker_join = join, state, threshold, blocksize
+
+
+def _join_block_worker(block):
+    """Join a block of rows using the rows of the worker process."""
+    join, state, threshold, blocksize = _worker_join
+    start, end = block
+    return join(state, start, end, threshold, blocksize)
+
+
+def all_pairs(index, threshold, blocksize=1024, workers=1, symmetric=False):
+    """Find all pairs of indexed documents whose cosine similarity is at least `threshold`.
+
+    Parameters
+    ----------
+    index : {:class:`~gensim.similarities.docsim.Similarity`, :class:`~gensim.similarities.docsim.MatrixSimilarity`,
+             :class:`~gensim.similarities.docsim.SparseMatrixSimilarity`, numpy.ndarray, scipy.sparse matrix}
+        The joined documents: an index, or a matrix with one document vector per row.
+        Sparse vectors are joined with prefix filtering, dense vectors with blocked matrix products.
+    threshold : float
+        The smallest similarity of a returned pair, `0 < threshold <= 1`.
+    blocksize : int, optional
+        Number of documents joined at once with each other block of documents. The memory used by every worker
+        is proportional to `blocksize ** 2` for dense vectors.
+    workers : int, optional
+        Number of worker processes.
+    symmetric : bool, optional
+        If True, return every pair both as `(i, j)` and `(j, i)`, otherwise only as `(i, j)` for `i < j`.
+
+    Returns
+    -------
+    :class:`scipy.sparse.csr_matrix`
+        Square matrix of the similarities of the found pairs. Documents are not paired with themselves.
+
+    """
+    if not 0.0 < threshold <= 1.0:
+        raise ValueError("threshold must be in (0, 1], got %s" % threshold)
+    matrix = _normalize(_index_matrix(index))
+    num_docs = matrix.shape[0]
+    if scipy.sparse.issparse(matrix):
+        join, state = _join_sparse_block, _sparse_state(matrix, threshold)
+    else:
+        join, state = _join_dense_block, {'matrix': matrix}
+    blocks = [(start, min(start + blocksize, num_docs)) for start in range(0, num_docs, blocksize)]
+    logger.info(
+        "joining %i %s documents in %i blocks with threshold %s",
+        num_docs, 'sparse' if scipy.sparse.issparse(matrix) else 'dense', len(blocks), threshold
+    )
+
+    pool = None
+    if workers > 1 and len(blocks) > 1:
+        pool = multiprocessing.Pool(
+            workers, initializer=_init_join_worker, initargs=(join, state, threshold, blocksize)
+        )
+        results = pool.imap(_join_block_worker, blocks)
+    else:
+        results = (join(state, start, end, threshold, blocksize) for start, end in blocks)
+
+    found_i, found_j, found_sims = [], [], []
+    try:
+        for blockno, (i, j, sims) in enumerate(results):
+            found_i.append(i)
+            found_j.append(j)
+            found_sims.append(sims)
+            logger.debug("PROGRESS: joined block #%i/%i, found %i pairs", blockno + 1, len(blocks), len(i))
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    i, j, sims = _concatenate(found_i, found_j, found_sims)
+    logger.info("found %i pairs of documents with similarity >= %s", len(i), threshold)
+    if symmetric:
+        i, j, sims = numpy.concatenate([i, j]), numpy.concatenate([j, i]), numpy.concatenate([sims, sims])
+    return scipy.sparse.coo_matrix((sims.astype(numpy.float32), (i, j)), shape=(num_docs, num_docs)).tocsr()
@@ -71,7 +71,11 @@ uses the faster, batch queries internally and **is ideal for all-vs-all pairwise
 import logging
 import itertools
 import os
+import re
 import heapq
+import threading
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
 import numpy
 import scipy.sparse
@@ -83,11 +87,14 @@ from six.moves import map, range, zip
 
 logger = logging.getLogger(__name__)
 
+MAXSCORE_SLACK = 1e-5  # relative tolerance of the bounds used by SparseMatrixSimilarity MaxScore pruning
+QUANTIZED_BLOCK_BYTES = 1 << 22  # size of the float32 blocks a quantized MatrixSimilarity is decoded into
+
 PARALLEL_SHARDS = False
 try:
     import multiprocessing
     # by default, don't parallelize queries. uncomment the following line if you want that.
-#    PARALLEL_SHARDS = multiprocessing.cpu_count() # use #parallel processes = #CPus
+#    PARALLEL_SHARDS = multiprocessing.cpu_count() # use #parallel threads = #CPus
 except ImportError:
     pass
 
@@ -145,6 +152,9 @@ class Shard(utils.SaveLoad):
         # (S)MS objects must be loaded via load() because of mmap (simple pickle.load won't do)
         if 'index' in result:
             del result['index']
+        # the cache is owned by the Similarity index, which attaches it again after loading
+        if 'cache' in result:
+            del result['cache']
         return result
 
     def __str__(self):
@@ -153,12 +163,18 @@ class Shard(utils.SaveLoad):
     def get_index(self):
         """Load & get index.
 
+        If the shard is attached to a :class:`~gensim.similarities.docsim.ShardCache`, the index is
+        kept open by the cache rather than by the shard itself.
+
         Returns
         -------
         :class:`~gensim.interfaces.SimilarityABC`
             Index instance.
 
         """
+        cache = getattr(self, 'cache', None)
+        if cache is not None:
+            return cache.get_index(self)
         if not hasattr(self, 'index'):
             logger.debug("mmaping index from %s", self.fullname())
             self.index = self.cls.load(self.fullname(), mmap='r')
@@ -211,6 +227,277 @@ class Shard(utils.SaveLoad):
             raise ValueError("num_best and normalize have to be set before querying a proxy Shard object")
         return index[query]
 
+    def topk(self, query, topn):
+        """Get the `topn` documents of this shard most similar to the document (or corpus) `query`.
+
+        Unlike :meth:`~gensim.similarities.docsim.Shard.__getitem__`, the result is a pair of arrays
+        rather than lists of tuples, so that shard results can be merged without forming tuples
+        for documents that do not make it into the final result.
+
+        Parameters
+        ----------
+        query : {iterable of list of (int, number) , list of (int, number))}
+            Document or corpus.
+        topn : int
+            Number of most similar documents to return for each query document.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            Positions of the most similar documents within the shard and their similarities, both of shape
+            `(number of query documents, min(topn, len(shard)))` and ordered by decreasing magnitude of similarity.
+            Positions of similarities that are (close to) zero are -1.
+
+        Notes
+        -----
+        Documents at the positions in the `masked` attribute of the shard, if set, get similarity 0.
+
+        """
+        index = self.get_index()
+        try:
+            index.num_best = None
+            index.normalize = self.normalize
+        except Exception:
+            raise ValueError("normalize has to be set before querying a proxy Shard object")
+        sims = index[query]
+        if scipy.sparse.issparse(sims):
+            sims = sims.toarray()
+        masked = getattr(self, 'masked', None)
+        if masked is not None and len(masked):
+            sims[..., masked] = 0.0  # deleted or updated documents, scored by the Similarity index instead
+        return _topk(sims, topn)
+
+
+def _index_nbytes(index):
+    """Get the size of the vectors stored in a shard index, in bytes.
+
+    Parameters
+    ----------
+    index : :class:`~gensim.interfaces.SimilarityABC`
+        Index of a shard.
+
+    Returns
+    -------
+    int
+        Size of the dense or sparse matrix of the indexed vectors.
+
+    """
+    matrix = getattr(index, 'index', None)
+    if scipy.sparse.issparse(matrix):
+        return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    return getattr(matrix, 'nbytes', 0)
+
+
+class ShardCache(object):
+    """A least recently used cache of the open shard indexes of a :class:`~gensim.similarities.docsim.Similarity`.
+
+    Every open shard keeps its index mmap'ed (or fully loaded, for small shards), which costs file handles
+    and resident memory. The cache keeps at most `max_shards` shards open, whose vectors take at most
+    `max_bytes` bytes, and closes the least recently used shards when either budget is exceeded.
+    The most recently used shard is always kept open, even if it alone exceeds `max_bytes`.
+
+    With `prefetch`, using a shard starts loading the following shard of the index in a background thread,
+    so that sweeping the shards in order (querying the index, or iterating over it) does not wait for the loads.
+
+    Attributes
+    ----------
+    hits : int
+        Number of requests for a shard that was already open.
+    misses : int
+        Number of requests for a shard that had to be opened.
+    evictions : int
+        Number of shards closed to stay within the budget.
+    prefetches : int
+        Number of shards opened in the background ahead of their use.
+
+    """
+    def __init__(self, shards, max_shards=None, max_bytes=None, prefetch=False):
+        """
+
+        Parameters
+        ----------
+        shards : list of :class:`~gensim.similarities.docsim.Shard`
+            Shards of the index, in order. The list is shared with the index, so that the cache sees
+            shards added and removed by the index.
+        max_shards : int, optional
+            Maximum number of open shards. If None, the number of open shards is not limited.
+        max_bytes : int, optional
+            Maximum size of the vectors in the open shards, in bytes. If None, the size is not limited.
+        prefetch : bool, optional
+            Whether to load the following shard in the background whenever a shard is used.
+
+        """
+        self.shards = shards
+        self.max_shards = max_shards
+        self.max_bytes = max_bytes
+        self.prefetch = prefetch
+        self.indexes = OrderedDict()  # shard -> (index, size in bytes), least recently used first
+        self.nbytes = 0
+        self.hits, self.misses, self.evictions, self.prefetches = 0, 0, 0, 0
+        self.lock = threading.RLock()
+        self.pending = set()  # shards waiting to be prefetched
+        self.prefetcher = None
+
+    def __len__(self):
+        """Get the number of open shards."""
+        return len(self.indexes)
+
+    def __str__(self):
+        return "ShardCache(%i open shards of %i bytes, %i hits, %i misses, %i evictions, %i prefetches)" % (
+            len(self), self.nbytes, self.hits, self.misses, self.evictions, self.prefetches
+        )
+
+    def get_index(self, shard):
+        """Get the index of a shard, opening it if needed.
+
+        Parameters
+        ----------
+        shard : :class:`~gensim.similarities.docsim.Shard`
+            The shard.
+
+        Returns
+        -------
+        :class:`~gensim.interfaces.SimilarityABC`
+            Index of the shard.
+
+        """
+        with self.lock:
+            if shard in self.indexes:
+                self.hits += 1
+                index, nbytes = self.indexes.pop(shard)
+                self.indexes[shard] = index, nbytes  # mark as the most recently used
+            else:
+                self.misses += 1
+                index = None
+        if index is None:
+            index = self._open(shard)
+        if self.prefetch:
+            self._prefetch_next(shard)
+        return index
+
+    def add(self, shard):
+        """Attach a shard to the cache. An index the shard has already opened is adopted by the cache.
+
+        Parameters
+        ----------
+        shard : :class:`~gensim.similarities.docsim.Shard`
+            The shard.
+
+        """
+        shard.cache = self
+        if 'index' in shard.__dict__:
+            self._open(shard)
+
+    def discard(self, shard):
+        """Close a shard, if it is open.
+
+        Parameters
+        ----------
+        shard : :class:`~gensim.similarities.docsim.Shard`
+            The shard.
+
+        """
+        with self.lock:
+            self.pending.discard(shard)
+            if shard in self.indexes:
+                _, nbytes = self.indexes.pop(shard)
+                self.nbytes -= nbytes
+
+    def clear(self):
+        """Close all shards and stop prefetching."""
+        with self.lock:
+            self.pending.clear()
+            self.indexes.clear()
+            self.nbytes = 0
+            prefetcher, self.prefetcher = self.prefetcher, None
+        if prefetcher is not None:
+            prefetcher.terminate()
+
+    def _load(self, shard):
+        """Load the index of a shard. Called without holding the lock, so that loading one shard
+        does not block the requests for the other shards."""
+        index = shard.__dict__.pop('index', None)  # adopt an index the shard opened before it was cached
+        if index is None:
+            logger.debug("mmaping index from %s", shard.fullname())
+            index = shard.cls.load(shard.fullname(), mmap='r')
+        return index
+
+    def _open(self, shard):
+        """Load a shard and add it to the cache, unless another thread opened it or it was discarded meanwhile."""
+        index = self._load(shard)
+        with self.lock:
+            if shard in self.indexes:
+                return self.indexes[shard][0]
+            if getattr(shard, 'cache', None) is self:
+                self._insert(shard, index)
+        return index
+
+    def _insert(self, shard, index):
+        """Add an open shard and close the least recently used shards that no longer fit in the budget."""
+        nbytes = _index_nbytes(index)
+        self.indexes[shard] = index, nbytes
+        self.nbytes += nbytes
+        while len(self.indexes) > 1 and (
+                self.max_shards is not None and len(self.indexes) > self.max_shards
+                or self.max_bytes is not None and self.nbytes > self.max_bytes):
+            evicted, (_, evicted_nbytes) = self.indexes.popitem(last=False)
+            self.nbytes -= evicted_nbytes
+            self.evictions += 1
+            logger.debug("closing least recently used shard %s", evicted)
+
+    def _prefetch_next(self, shard):
+        """Start opening the shard that follows `shard` in the index in the background."""
+        with self.lock:
+            try:
+                position = self.shards.index(shard)
+            except ValueError:
+                return
+            if position + 1 >= len(self.shards):
+                return
+            following = self.shards[position + 1]
+            if following in self.indexes or following in self.pending:
+                return
+            self.pending.add(following)
+            if self.prefetcher is None:
+                self.prefetcher = ThreadPool(1)
+            self.prefetcher.apply_async(self._prefetch, (following,))
+
+    def _prefetch(self, shard):
+        with self.lock:
+            if shard not in self.pending or shard in self.indexes:  # discarded or opened in the meantime
+                self.pending.discard(shard)
+                return
+        index = self._load(shard)
+        with self.lock:
+            if shard not in self.pending:  # discarded while loading
+                return
+            self.pending.discard(shard)
+            if shard not in self.indexes:
+                self.prefetches += 1
+                self._insert(shard, index)
+
+
+def _shard_files(fname):
+    """Get the files of the shard saved under `fname`: the pickle and the arrays stored next to it.
+
+    Parameters
+    ----------
+    fname : str
+        Full path of the shard, see :meth:`~gensim.similarities.docsim.Shard.fullname`.
+
+    Returns
+    -------
+    list of str
+        Existing files of the shard, without the files of its later versions written by
+        :meth:`~gensim.similarities.docsim.Similarity.compact`, which are named `fname.v<version>`.
+
+    """
+    import glob
+    fnames = [fname] + [
+        other for other in glob.glob(fname + '.*') if not re.match(r'\.v\d+(\.|$)', other[len(fname):])
+    ]
+    return [other for other in fnames if os.path.exists(other)]
+
 
 def query_shard(args):
     """Helper for request query from shard, same as shard[query].
@@ -233,6 +520,95 @@ def query_shard(args):
     return result
 
 
+def query_shard_topk(args):
+    """Helper for request top-k query from shard, same as shard.topk(query, shard.num_best).
+
+    Parameters
+    ---------
+    args : (list of (int, number), :class:`~gensim.similarities.docsim.Shard`)
+        Query and Shard instances
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Positions of the `num_best` documents of this shard most similar to the query and their similarities.
+
+    """
+    query, shard = args
+    logger.debug("querying shard %s for top %s in process %s", shard, shard.num_best, os.getpid())
+    result = shard.topk(query, shard.num_best)
+    logger.debug("finished querying shard %s in process %s", shard, os.getpid())
+    return result
+
+
+def _topk(sims, topn, eps=1e-9):
+    """Helper for extracting the `topn` similarities of the greatest magnitude from every row of a dense matrix.
+
+    Parameters
+    ----------
+    sims : numpy.ndarray
+        Similarities, a vector or a matrix with one row per query.
+    topn : int
+        Number of similarities to extract from every row.
+    eps : float, optional
+        Similarities whose magnitude does not exceed `eps` are not extracted.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Positions of the extracted similarities within their rows and the similarities, both of shape
+        `(number of rows, min(topn, number of columns))` and ordered by decreasing magnitude of similarity.
+        Positions of similarities that were not extracted are -1.
+
+    """
+    sims = numpy.atleast_2d(sims)
+    num_rows, num_columns = sims.shape
+    topn = max(min(topn, num_columns), 0)
+    rows = numpy.arange(num_rows)[:, None]
+    magnitudes = numpy.abs(sims)
+    if topn < num_columns:
+        # numpy.argpartition only sorts the topn greatest magnitudes apart from the rest, without ordering them
+        positions = numpy.argpartition(-magnitudes, topn - 1, axis=1)[:, :topn] if topn else rows[:, :0]
+    else:
+        positions = numpy.tile(numpy.arange(num_columns), (num_rows, 1))
+    order = numpy.argsort(-magnitudes[rows, positions], axis=1, kind='mergesort')
+    positions = positions[rows, order]
+    sims = sims[rows, positions]
+    positions[numpy.abs(sims) <= eps] = -1
+    return positions, sims
+
+
+def _merge_topk(ids, sims, more_ids, more_sims, topn):
+    """Helper for merging two sets of extracted similarities into the `topn` similarities of the greatest magnitude.
+
+    Parameters
+    ----------
+    ids : numpy.ndarray or None
+        Document ids of the similarities extracted so far, one row per query, -1 for no document.
+        None if nothing was extracted yet.
+    sims : numpy.ndarray or None
+        Similarities extracted so far, of the same shape as `ids`.
+    more_ids : numpy.ndarray
+        Document ids of the similarities to merge in, one row per query, -1 for no document.
+    more_sims : numpy.ndarray
+        Similarities to merge in, of the same shape as `more_ids`.
+    topn : int
+        Number of similarities to keep in every row.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Document ids and similarities, of shape `(number of queries, at most topn)`, ordered by decreasing
+        magnitude of similarity. Ids of similarities that are (close to) zero are -1.
+
+    """
+    if ids is not None:
+        more_ids, more_sims = numpy.hstack([ids, more_ids]), numpy.hstack([sims, more_sims])
+    positions, sims = _topk(more_sims, topn)
+    ids = numpy.where(positions < 0, -1, more_ids[numpy.arange(len(more_ids))[:, None], positions])
+    return ids, sims
+
+
 def _nlargest(n, iterable):
     """Helper for extracting n documents with maximum similarity.
 
@@ -260,13 +636,25 @@ def _nlargest(n, iterable):
 class Similarity(interfaces.SimilarityABC):
     """Compute cosine similarity of a dynamic query against a corpus of documents ('the index').
 
-    The index supports adding new documents dynamically.
+    The index supports adding new documents dynamically, as well as deleting and updating indexed documents.
 
     Notes
     -----
     Scalability is achieved by sharding the index into smaller pieces, each of which fits into core memory
     The shards themselves are simply stored as files to disk and mmap'ed back as needed.
 
+    Open shards are kept in a :class:`~gensim.similarities.docsim.ShardCache`, which can limit the number and size
+    of the shards that are open at the same time, and open the following shard ahead of its use.
+
+    Deleted and updated documents keep their positions. They are only recorded by the index and applied at query time:
+    deleted documents get similarity 0 and updated documents are scored from their new vectors. The shards that
+    hold them are rewritten by :meth:`~gensim.similarities.docsim.Similarity.compact`.
+
+    With `workers` > 1, the shards are queried by a pool of threads that is started on the first query and
+    reused by all later queries. The threads share the shards mmap'ed by the index, so neither the shards
+    nor the results are copied between processes; scoring a shard is a BLAS or `scipy.sparse` matrix
+    product, which runs without holding the GIL.
+
     Examples
     --------
     .. sourcecode:: pycon
@@ -302,7 +690,8 @@ class Similarity(interfaces.SimilarityABC):
 
     """
 
-    def __init__(self, output_prefix, corpus, num_features, num_best=None, chunksize=256, shardsize=32768, norm='l2'):
+    def __init__(self, output_prefix, corpus, num_features, num_best=None, chunksize=256, shardsize=32768, norm='l2',
+                 workers=None, max_open_shards=None, max_open_bytes=None, prefetch_shards=False):
         """
 
         Parameters
@@ -323,6 +712,16 @@ class Similarity(interfaces.SimilarityABC):
             comfortably into your RAM.
         norm : {'l1', 'l2'}, optional
             Normalization to use.
+        workers : int, optional
+            Number of threads that query the shards in parallel. If None, `PARALLEL_SHARDS` threads are used if set,
+            otherwise the shards are queried one after another.
+        max_open_shards : int, optional
+            Maximum number of shards kept open at the same time. If None, shards are never closed.
+        max_open_bytes : int, optional
+            Maximum size of the vectors in the shards kept open at the same time, in bytes.
+            If None, shards are never closed.
+        prefetch_shards : bool, optional
+            Whether to open the following shard in the background whenever a shard is used.
 
         Notes
         -----
@@ -349,8 +748,19 @@ class Similarity(interfaces.SimilarityABC):
         self.norm = norm
         self.chunksize = int(chunksize)
         self.shardsize = shardsize
+        self.workers = workers
+        self.pool = None
+        self.max_open_shards = max_open_shards
+        self.max_open_bytes = max_open_bytes
+        self.prefetch_shards = prefetch_shards
         self.shards = []
+        self.attach_shard_cache()
         self.fresh_docs, self.fresh_nnz = [], 0
+        self.deleted = set()  # positions of deleted documents
+        self.updates = {}  # position of updated document -> its new vector
+        self.update_index = None  # positions of updated documents and an index of their new vectors, built lazily
+        self.stale_shards = []  # file names of shards replaced by compact(), deleted on the next save()
+        self.lock = threading.RLock()  # guards the shards and the pending changes against a background compact()
 
         if corpus is not None:
             self.add_documents(corpus)
@@ -364,6 +774,52 @@ class Similarity(interfaces.SimilarityABC):
             len(self), len(self.shards), self.output_prefix
         )
 
+    def __getstate__(self):
+        """Special handler for pickle.
+
+        Returns
+        -------
+        dict
+            Object that contains state of current instance without the pool of query threads.
+
+        """
+        result = self.__dict__.copy()
+        result['pool'] = None  # threads cannot be pickled, the pool is started again on the next query
+        result['shard_cache'] = None  # open shards are opened again by the new cache after loading
+        result['update_index'] = None  # built again from `updates` on the next query
+        result['lock'] = None  # locks cannot be pickled, a new one is created after loading
+        return result
+
+    def __setstate__(self, state):
+        """Special handler for unpickle.
+
+        Parameters
+        ----------
+        state : dict
+            State of the pickled instance, see :meth:`~gensim.similarities.docsim.Similarity.__getstate__`.
+
+        """
+        self.__dict__.update(state)
+        # indexes saved before documents could be deleted or updated
+        self.__dict__.setdefault('deleted', set())
+        self.__dict__.setdefault('updates', {})
+        self.__dict__.setdefault('update_index', None)
+        self.__dict__.setdefault('stale_shards', [])
+        self.lock = threading.RLock()
+        self.attach_shard_cache()
+
+    def attach_shard_cache(self):
+        """Create a new :class:`~gensim.similarities.docsim.ShardCache` for this index and attach all shards to it."""
+        shard_cache = getattr(self, 'shard_cache', None)
+        if shard_cache is not None:
+            shard_cache.clear()  # stop the prefetch thread of the old cache
+        self.shard_cache = ShardCache(
+            self.shards, max_shards=getattr(self, 'max_open_shards', None),
+            max_bytes=getattr(self, 'max_open_bytes', None), prefetch=getattr(self, 'prefetch_shards', False),
+        )
+        for shard in self.shards:
+            self.shard_cache.add(shard)
+
     def add_documents(self, corpus):
         """Extend the index with new documents.
 
@@ -393,27 +849,269 @@ class Similarity(interfaces.SimilarityABC):
             >>> index.add_documents(one_more_corpus)  # add more documents in corpus
 
         """
-        min_ratio = 1.0  # 0.5 to only reopen shards that are <50% complete
-        if self.shards and len(self.shards[-1]) < min_ratio * self.shardsize:
-            # The last shard was incomplete (<; load it back and add the documents there, don't start a new shard
-            self.reopen_shard()
-        for doc in corpus:
-            if isinstance(doc, numpy.ndarray):
-                doclen = len(doc)
-            elif scipy.sparse.issparse(doc):
-                doclen = doc.nnz
+        with self.lock:
+            min_ratio = 1.0  # 0.5 to only reopen shards that are <50% complete
+            if self.shards and len(self.shards[-1]) < min_ratio * self.shardsize:
+                # The last shard was incomplete (<; load it back and add the documents there, don't start a new shard
+                self.reopen_shard()
+            for doc in corpus:
+                doc, doclen = self._prepare_document(doc)
+                self.fresh_docs.append(doc)
+                self.fresh_nnz += doclen
+                if len(self.fresh_docs) >= self.shardsize:
+                    self.close_shard()
+                if len(self.fresh_docs) % 10000 == 0:
+                    logger.info("PROGRESS: fresh_shard size=%i", len(self.fresh_docs))
+
+    def _prepare_document(self, doc):
+        """Convert a document to the vector stored in a shard.
+
+        Parameters
+        ----------
+        doc : {list of (int, number), :class:`numpy.ndarray`, :class:`scipy.sparse.csr_matrix`}
+            Document in BoW format, or an already normalized vector.
+
+        Returns
+        -------
+        ({:class:`numpy.ndarray`, :class:`scipy.sparse.csr_matrix`}, int)
+            The normalized vector, sparse for documents with few features, and the length of the document.
+
+        """
+        if isinstance(doc, numpy.ndarray):
+            doclen = len(doc)
+        elif scipy.sparse.issparse(doc):
+            doclen = doc.nnz
+        else:
+            doclen = len(doc)
+            if doclen < 0.3 * self.num_features:
+                doc = matutils.unitvec(matutils.corpus2csc([doc], self.num_features).T, self.norm)
             else:
-                doclen = len(doc)
-                if doclen < 0.3 * self.num_features:
-                    doc = matutils.unitvec(matutils.corpus2csc([doc], self.num_features).T, self.norm)
+                doc = matutils.unitvec(matutils.sparse2full(doc, self.num_features), self.norm)
+        return doc, doclen
+
+    def _check_position(self, docpos):
+        """Check that `docpos` is a valid document position and return it as an int."""
+        if not 0 <= docpos < len(self):
+            raise ValueError("invalid document position: %s (must be 0 <= x < %s)" % (docpos, len(self)))
+        return int(docpos)
+
+    def delete_documents(self, positions):
+        """Delete documents from the index.
+
+        The deleted documents keep their positions, so that the positions of the other documents do not change.
+        They get similarity 0 in all later queries, which leaves them out of `num_best` results.
+
+        Parameters
+        ----------
+        positions : iterable of int
+            Positions of the deleted documents.
+
+        Notes
+        -----
+        The vectors of the deleted documents stay in the shards until
+        :meth:`~gensim.similarities.docsim.Similarity.compact` rewrites them.
+
+        """
+        with self.lock:
+            self.close_shard()
+            for docpos in positions:
+                docpos = self._check_position(docpos)
+                self.updates.pop(docpos, None)
+                self.deleted.add(docpos)
+            self.update_index = None
+
+    def update_documents(self, positions, corpus):
+        """Replace documents of the index with new documents, at the same positions.
+
+        Parameters
+        ----------
+        positions : iterable of int
+            Positions of the replaced documents.
+        corpus : iterable of list of (int, number)
+            The new documents, in BoW format.
+
+        Notes
+        -----
+        The new vectors are kept in memory and scored separately from the shards until
+        :meth:`~gensim.similarities.docsim.Similarity.compact` writes them into the shards.
+
+        """
+        with self.lock:
+            self.close_shard()
+            positions, corpus = list(positions), list(corpus)
+            if len(positions) != len(corpus):
+                raise ValueError("got %i positions for %i documents" % (len(positions), len(corpus)))
+            for docpos, doc in zip(positions, corpus):
+                docpos = self._check_position(docpos)
+                self.deleted.discard(docpos)
+                self.updates[docpos] = self._prepare_document(doc)[0]
+            self.update_index = None
+
+    def _changed_positions(self):
+        """Get the sorted positions of the deleted and updated documents, as an array."""
+        changed = getattr(self, 'deleted', set()) | set(getattr(self, 'updates', {}))
+        return numpy.array(sorted(changed), dtype=numpy.int64)
+
+    def _query_updates(self, query):
+        """Get the positions of the updated documents and the similarities of `query` to their new vectors.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray) or None
+            Positions of the updated documents, and similarities of shape `(number of query documents, positions)`,
+            or None if no document was updated.
+
+        """
+        if not getattr(self, 'updates', None):
+            return None
+        update_index = self.update_index
+        if update_index is None:
+            positions = sorted(self.updates)
+            index = SparseMatrixSimilarity(
+                [self.updates[docpos] for docpos in positions], num_terms=self.num_features, num_docs=len(positions)
+            )
+            update_index = self.update_index = numpy.array(positions, dtype=numpy.int64), index
+        positions, index = update_index
+        index.num_best, index.normalize = None, self.norm
+        return positions, numpy.atleast_2d(index[query])
+
+    def _apply_changes(self, chunk, start, changed, updates):
+        """Replace the vectors of deleted and updated documents in a `chunk` of the index starting at position `start`.
+
+        Parameters
+        ----------
+        chunk : {:class:`numpy.ndarray`, :class:`scipy.sparse.csr_matrix`}
+            Consecutive vectors of a shard, one per row.
+        start : int
+            Position of the first document of `chunk` in the index.
+        changed : numpy.ndarray
+            Sorted positions of the deleted and updated documents.
+        updates : dict of (int, {:class:`numpy.ndarray`, :class:`scipy.sparse.csr_matrix`})
+            New vectors of the updated documents.
+
+        Returns
+        -------
+        {:class:`numpy.ndarray`, :class:`scipy.sparse.csr_matrix`}
+            The vectors, with zero vectors for the deleted documents and the new vectors of the updated documents.
+            `chunk` itself is returned if none of its documents changed.
+
+        """
+        end = start + chunk.shape[0]
+        changed = changed[numpy.searchsorted(changed, start):numpy.searchsorted(changed, end)]
+        if not len(changed):
+            return chunk
+        if not scipy.sparse.issparse(chunk):
+            chunk = numpy.array(chunk)
+            for docpos in changed:
+                vector = updates.get(docpos)
+                if vector is None:
+                    chunk[docpos - start] = 0.0
+                elif scipy.sparse.issparse(vector):
+                    chunk[docpos - start] = vector.toarray().ravel()
                 else:
-                    doc = matutils.unitvec(matutils.sparse2full(doc, self.num_features), self.norm)
-            self.fresh_docs.append(doc)
-            self.fresh_nnz += doclen
-            if len(self.fresh_docs) >= self.shardsize:
-                self.close_shard()
-            if len(self.fresh_docs) % 10000 == 0:
-                logger.info("PROGRESS: fresh_shard size=%i", len(self.fresh_docs))
+                    chunk[docpos - start] = vector
+            return chunk
+        # stack the unchanged runs of rows with the changed rows in between
+        pieces, previous = [], 0
+        for docpos in changed:
+            row = docpos - start
+            if row > previous:
+                pieces.append(chunk[previous:row])
+            vector = updates.get(docpos)
+            if vector is None:
+                vector = scipy.sparse.csr_matrix((1, chunk.shape[1]), dtype=chunk.dtype)
+            pieces.append(scipy.sparse.csr_matrix(vector.reshape(1, -1), dtype=chunk.dtype))
+            previous = row + 1
+        if previous < chunk.shape[0]:
+            pieces.append(chunk[previous:])
+        return scipy.sparse.vstack(pieces, format='csr')
+
+    def compact(self, background=False):
+        """Rewrite the shards that hold deleted or updated documents, applying the changes to their vectors.
+
+        Every affected shard is rebuilt and saved under a new file name, then swapped for the old shard in the index.
+        Shards without changes are not touched. Deleted documents keep their positions, as zero vectors.
+
+        Parameters
+        ----------
+        background : bool, optional
+            If True, compact in a background thread and return the thread. The index can be queried and
+            changed meanwhile; changes made after the compaction started stay pending for the next compaction,
+            and so do the changes in a shard that is reopened by
+            :meth:`~gensim.similarities.docsim.Similarity.add_documents` before it is compacted.
+
+        Returns
+        -------
+        :class:`threading.Thread` or None
+            The background thread, if `background` is True.
+
+        Notes
+        -----
+        The files of the old shards are still referenced by the last saved index, so they are only removed
+        by the next :meth:`~gensim.similarities.docsim.Similarity.save`, once the saved index refers to the
+        new shard files.
+
+        """
+        if background:
+            thread = threading.Thread(target=self.compact)
+            thread.daemon = True
+            thread.start()
+            return thread
+
+        with self.lock:
+            self.close_shard()
+            deleted, updates = set(self.deleted), dict(self.updates)  # changes made from now on are not compacted
+            shards = list(self.shards)
+        changed = numpy.array(sorted(deleted | set(updates)), dtype=numpy.int64)
+        skipped = []  # (start, end) position ranges of the shards reopened during the compaction
+        start = 0
+        for shard in shards:
+            old_index = shard.get_index()
+            docs = self._apply_changes(old_index.index, start, changed, updates)
+            end = start + len(shard)
+            if docs is old_index.index:
+                start = end
+                continue
+            # only the last shard can be removed meanwhile (by reopen_shard), the ids of the others are stable
+            shardid = shards.index(shard)
+            version = getattr(shard, 'version', 0) + 1
+            logger.info("compacting shard #%i into version %i", shardid, version)
+            if scipy.sparse.issparse(docs):
+                index = SparseMatrixSimilarity(None, num_features=self.num_features)
+            else:
+                index = MatrixSimilarity(None, num_features=self.num_features, corpus_len=len(docs))
+            index.index = docs
+            new_shard = Shard('%s.v%i' % (self.shardid2filename(shardid), version), index)
+            new_shard.version = version
+            new_shard.num_best, new_shard.normalize = shard.num_best, getattr(shard, 'normalize', self.norm)
+            new_shard.num_nnz = docs.nnz if scipy.sparse.issparse(docs) else numpy.count_nonzero(docs)
+            new_shard.masked = getattr(shard, 'masked', None)
+            with self.lock:
+                if shardid >= len(self.shards) or self.shards[shardid] is not shard:
+                    # the shard was reopened to add documents, its changes stay pending
+                    logger.info("shard #%i was reopened during compaction, skipping it", shardid)
+                    self.stale_shards.append(new_shard.fullname())
+                    skipped.append((start, end))
+                    start = end
+                    continue
+                self.shards[shardid] = new_shard  # swap in the new shard; running queries keep using the old one
+                self.shard_cache.add(new_shard)
+                self.shard_cache.discard(shard)
+                shard.cache = None
+                shard.index = old_index
+                self.stale_shards.append(shard.fullname())  # removed by the next save()
+            start = end
+
+        with self.lock:
+            # forget the compacted changes, unless they were changed again meanwhile
+            for docpos in deleted | set(updates):
+                if any(first <= docpos < last for first, last in skipped):
+                    continue
+                if docpos in deleted:
+                    self.deleted.discard(docpos)
+                elif self.updates.get(docpos) is updates[docpos]:
+                    del self.updates[docpos]
+            self.update_index = None
 
     def shardid2filename(self, shardid):
         """Get shard file by `shardid`.
@@ -445,61 +1143,165 @@ class Similarity(interfaces.SimilarityABC):
         this incomplete shard will be loaded again and completed.
 
         """
-        if not self.fresh_docs:
-            return
-        shardid = len(self.shards)
-        # consider the shard sparse if its density is < 30%
-        issparse = 0.3 > 1.0 * self.fresh_nnz / (len(self.fresh_docs) * self.num_features)
-        if issparse:
-            index = SparseMatrixSimilarity(
-                self.fresh_docs, num_terms=self.num_features, num_docs=len(self.fresh_docs), num_nnz=self.fresh_nnz
-            )
-        else:
-            index = MatrixSimilarity(self.fresh_docs, num_features=self.num_features)
-        logger.info("creating %s shard #%s", 'sparse' if issparse else 'dense', shardid)
-        shard = Shard(self.shardid2filename(shardid), index)
-        shard.num_best = self.num_best
-        shard.num_nnz = self.fresh_nnz
-        self.shards.append(shard)
-        self.fresh_docs, self.fresh_nnz = [], 0
+        with self.lock:
+            if not self.fresh_docs:
+                return
+            shardid = len(self.shards)
+            # consider the shard sparse if its density is < 30%
+            issparse = 0.3 > 1.0 * self.fresh_nnz / (len(self.fresh_docs) * self.num_features)
+            if issparse:
+                index = SparseMatrixSimilarity(
+                    self.fresh_docs, num_terms=self.num_features, num_docs=len(self.fresh_docs), num_nnz=self.fresh_nnz
+                )
+            else:
+                index = MatrixSimilarity(self.fresh_docs, num_features=self.num_features)
+            logger.info("creating %s shard #%s", 'sparse' if issparse else 'dense', shardid)
+            shard = Shard(self.shardid2filename(shardid), index)
+            shard.num_best = self.num_best
+            shard.num_nnz = self.fresh_nnz
+            self.shards.append(shard)
+            self.shard_cache.add(shard)
+            self.fresh_docs, self.fresh_nnz = [], 0
 
     def reopen_shard(self):
         """Reopen an incomplete shard."""
-        assert self.shards
-        if self.fresh_docs:
-            raise ValueError("cannot reopen a shard with fresh documents in index")
-        last_shard = self.shards[-1]
-        last_index = last_shard.get_index()
-        logger.info("reopening an incomplete shard of %i documents", len(last_shard))
-
-        self.fresh_docs = list(last_index.index)
-        self.fresh_nnz = last_shard.num_nnz
-        del self.shards[-1]  # remove the shard from index, *but its file on disk is not deleted*
-        logger.debug("reopen complete")
-
-    def query_shards(self, query):
+        with self.lock:
+            assert self.shards
+            if self.fresh_docs:
+                raise ValueError("cannot reopen a shard with fresh documents in index")
+            last_shard = self.shards[-1]
+            last_index = last_shard.get_index()
+            logger.info("reopening an incomplete shard of %i documents", len(last_shard))
+
+            self.fresh_docs = list(last_index.index)
+            self.fresh_nnz = last_shard.num_nnz
+            del self.shards[-1]  # remove the shard from index, *but its file on disk is not deleted*
+            self.shard_cache.discard(last_shard)
+            last_shard.cache = None
+            logger.debug("reopen complete")
+
+    def get_pool(self):
+        """Get the pool of threads that query the shards, starting it on first use.
+
+        Returns
+        -------
+        :class:`multiprocessing.pool.ThreadPool` or None
+            The pool, or None if the shards are queried one after another.
+
+        """
+        workers = getattr(self, 'workers', None)
+        if workers is None:
+            workers = PARALLEL_SHARDS or 1
+        if workers <= 1 or len(self.shards) <= 1:
+            return None
+        if getattr(self, 'pool', None) is None:
+            logger.debug("starting %i shard query threads", workers)
+            self.pool = ThreadPool(workers)
+        return self.pool
+
+    def close_pool(self):
+        """Stop the threads that query the shards. A new pool is started by the next query, if needed."""
+        pool, self.pool = getattr(self, 'pool', None), None
+        if pool is not None:
+            pool.terminate()
+
+    def __del__(self):
+        """Stop the query threads and the shard prefetch thread when the index is garbage collected.
+
+        Warnings
+        --------
+        Idle threads are not collected with the index, they are only stopped here. Calling
+        :meth:`~gensim.similarities.docsim.Similarity.close_pool` explicitly is preferred and safer.
+
+        """
+        self.close_pool()
+        shard_cache = getattr(self, 'shard_cache', None)
+        if shard_cache is not None:
+            shard_cache.clear()
+
+    def _prepare_shards(self, num_best):
+        """Set the query parameters of all shards, including the positions of their changed documents.
+
+        Parameters
+        ----------
+        num_best : int or None
+            Number of most similar documents to get from each shard, or None for all similarities.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            Sorted positions of the deleted and updated documents, and the position of the first document
+            of every shard, followed by the number of documents in the index.
+
+        """
+        changed = self._changed_positions()
+        offsets = numpy.cumsum([0] + [len(shard) for shard in self.shards])
+        for shard, start, end in zip(self.shards, offsets, offsets[1:]):
+            shard.num_best = num_best
+            shard.normalize = self.norm
+            # positions within the shard of deleted and updated documents, scored 0 by the shard
+            shard.masked = changed[numpy.searchsorted(changed, start):numpy.searchsorted(changed, end)] - start
+        return changed, offsets
+
+    def _merge_shard_topk(self, offsets, shard_results, updated, topn):
+        """Merge the most similar documents of every shard, as they arrive, into a running top-`topn`.
+
+        Parameters
+        ----------
+        offsets : numpy.ndarray
+            Position of the first document of every shard.
+        shard_results : iterable of (numpy.ndarray, numpy.ndarray)
+            Results of :meth:`~gensim.similarities.docsim.Shard.topk`, in the order of shards.
+        updated : (numpy.ndarray, numpy.ndarray) or None
+            Positions and similarities of the updated documents,
+            see :meth:`~gensim.similarities.docsim.Similarity._query_updates`.
+        topn : int
+            Number of most similar documents to keep for each query document.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            Positions of the most similar documents in the index and their similarities, one row per query document.
+            Positions of similarities that are (close to) zero are -1.
+
+        """
+        ids = sims = None
+        for offset, (shard_ids, shard_sims) in zip(offsets, shard_results):
+            shard_ids = numpy.where(shard_ids < 0, -1, shard_ids + offset)
+            ids, sims = _merge_topk(ids, sims, shard_ids, shard_sims, topn)
+        if updated is not None:
+            # updated documents are candidates too
+            positions, update_sims = updated
+            ids, sims = _merge_topk(ids, sims, numpy.tile(positions, (len(update_sims), 1)), update_sims, topn)
+        return ids, sims
+
+    def query_shards(self, query, num_best=None):
         """Apply shard[query] to each shard in `self.shards`. Used internally.
 
+        If `num_best` or `self.num_best` is set, apply shard.topk(query, shard.num_best) instead, so that the shards
+        only return the positions and similarities of their most similar documents.
+
         Parameters
         ----------
         query : {iterable of list of (int, number) , list of (int, number))}
             Document in BoW format or corpus of documents.
+        num_best : int, optional
+            Get the top-k results of the shards even if `self.num_best` is None.
 
         Returns
         -------
-        (None, list of individual shard query results)
-            Query results.
+        (:class:`multiprocessing.pool.ThreadPool` or None, iterable of individual shard query results)
+            The pool of query threads (it stays open for later queries) and query results, in the order of shards.
 
         """
         args = zip([query] * len(self.shards), self.shards)
-        if PARALLEL_SHARDS and PARALLEL_SHARDS > 1:
-            logger.debug("spawning %i query processes", PARALLEL_SHARDS)
-            pool = multiprocessing.Pool(PARALLEL_SHARDS)
-            result = pool.imap(query_shard, args, chunksize=1 + len(self.shards) / PARALLEL_SHARDS)
+        worker = query_shard if num_best is None and self.num_best is None else query_shard_topk
+        pool = self.get_pool()
+        if pool is not None:
+            result = pool.imap(worker, args)
         else:
             # serial processing, one shard after another
-            pool = None
-            result = map(query_shard, args)
+            result = map(worker, args)
         return pool, result
 
     def __getitem__(self, query):
@@ -537,50 +1339,114 @@ class Similarity(interfaces.SimilarityABC):
         self.close_shard()  # no-op if no documents added to index since last query
 
         # reset num_best and normalize parameters, in case they were changed dynamically
-        for shard in self.shards:
-            shard.num_best = self.num_best
-            shard.normalize = self.norm
+        changed, offsets = self._prepare_shards(self.num_best)
+        updated = self._query_updates(query)
 
         # there are 4 distinct code paths, depending on whether input `query` is
         # a corpus (or numpy/scipy matrix) or a single document, and whether the
         # similarity result should be a full array or only num_best most similar
         # documents.
-        pool, shard_results = self.query_shards(query)
+        _, shard_results = self.query_shards(query)
         if self.num_best is None:
             # user asked for all documents => just stack the sub-results into a single matrix
             # (works for both corpus / single doc query)
             result = numpy.hstack(list(shard_results))
+            if len(changed):
+                result[..., changed] = 0.0
+            if updated is not None:
+                positions, sims = updated
+                result[..., positions] = sims if result.ndim > 1 else sims[0]
         else:
-            # the following uses a lot of lazy evaluation and (optionally) parallel
-            # processing, to improve query latency and minimize memory footprint.
-            offsets = numpy.cumsum([0] + [len(shard) for shard in self.shards])
-
-            def convert(shard_no, doc):
-                return [(doc_index + offsets[shard_no], sim) for doc_index, sim in doc]
+            # every shard returns the positions and similarities of its own num_best most similar documents,
+            # so only len(self.shards) * num_best candidates per query document are left to merge.
+            ids, sims = self._merge_shard_topk(offsets, shard_results, updated, self.num_best)
+            result = [
+                [(doc_index, sim) for doc_index, sim in zip(row_ids, row_sims) if doc_index >= 0]
+                for row_ids, row_sims in zip(ids.tolist(), sims.tolist())
+            ]
 
             is_corpus, query = utils.is_corpus(query)
             is_corpus = is_corpus or hasattr(query, 'ndim') and query.ndim > 1 and query.shape[0] > 1
             if not is_corpus:
                 # user asked for num_best most similar and query is a single doc
-                results = (convert(shard_no, result) for shard_no, result in enumerate(shard_results))
-                result = _nlargest(self.num_best, results)
-            else:
-                # the trickiest combination: returning num_best results when query was a corpus
-                results = []
-                for shard_no, result in enumerate(shard_results):
-                    shard_result = [convert(shard_no, doc) for doc in result]
-                    results.append(shard_result)
-                result = []
-                for parts in zip(*results):
-                    merged = _nlargest(self.num_best, parts)
-                    result.append(merged)
-        if pool:
-            # gc doesn't seem to collect the Pools, eventually leading to
-            # "IOError 24: too many open files". so let's terminate it manually.
-            pool.terminate()
+                result = result[0]
 
         return result
 
+    def batch_topk(self, query_corpus, k, out_prefix, chunksize=None, num_queries=None):
+        """Get the `k` most similar documents for every document of a (large) query corpus, and store them to disk.
+
+        The query corpus is streamed in chunks. Every chunk is queried against all shards, in parallel if `workers`
+        is set, and the `k` best documents of every shard are merged into a running top-`k` per query document
+        as soon as the shard is done. The results are written to two `.npy` files, so that memory use depends on
+        `chunksize`, `k` and the shard size, but not on the size of the query corpus.
+
+        Parameters
+        ----------
+        query_corpus : iterable of list of (int, number)
+            Query documents in BoW format.
+        k : int
+            Number of most similar documents to get for each query document.
+        out_prefix : str
+            Path prefix of the output files, `out_prefix + '.ids.npy'` and `out_prefix + '.sims.npy'`.
+        chunksize : int, optional
+            Number of query documents queried at once, `self.chunksize` by default.
+        num_queries : int, optional
+            Number of query documents, `len(query_corpus)` by default.
+
+        Returns
+        -------
+        (:class:`numpy.memmap`, :class:`numpy.memmap`)
+            Positions of the most similar documents, as a `(num_queries, k)` int32 array, and their similarities,
+            as a float32 array of the same shape, ordered by decreasing magnitude of similarity. Query documents
+            with fewer than `k` non-zero similarities are padded with position -1 and similarity 0.
+
+        Examples
+        --------
+        .. sourcecode:: pycon
+
+            >>> from gensim.corpora.textcorpus import TextCorpus
+            >>> from gensim.test.utils import datapath, get_tmpfile
+            >>> from gensim.similarities import Similarity
+            >>> import numpy
+            >>>
+            >>> corpus = TextCorpus(datapath('testcorpus.txt'))
+            >>> index = Similarity(get_tmpfile('index'), corpus, num_features=400)
+            >>> ids, sims = index.batch_topk(corpus, 3, get_tmpfile('topk'))
+            >>>
+            >>> ids = numpy.load(get_tmpfile('topk') + '.ids.npy', mmap_mode='r')  # later, without the index
+
+        """
+        from numpy.lib.format import open_memmap
+        self.close_shard()
+        if len(self) > numpy.iinfo(numpy.int32).max:
+            raise ValueError("cannot store positions of %i documents as int32" % len(self))
+        if chunksize is None:
+            chunksize = self.chunksize
+        if num_queries is None:
+            num_queries = len(query_corpus)
+
+        ids = open_memmap(out_prefix + '.ids.npy', mode='w+', dtype=numpy.int32, shape=(num_queries, k))
+        sims = open_memmap(out_prefix + '.sims.npy', mode='w+', dtype=numpy.float32, shape=(num_queries, k))
+        _, offsets = self._prepare_shards(k)
+        start = 0
+        for chunk in utils.grouper(query_corpus, chunksize):
+            end = start + len(chunk)
+            if end > num_queries:
+                raise ValueError("query corpus has more than num_queries=%i documents" % num_queries)
+            _, shard_results = self.query_shards(chunk, num_best=k)
+            chunk_ids, chunk_sims = self._merge_shard_topk(offsets, shard_results, self._query_updates(chunk), k)
+            width = chunk_ids.shape[1]
+            ids[start:end, :width], ids[start:end, width:] = chunk_ids, -1
+            sims[start:end, :width], sims[start:end, width:] = chunk_sims, 0.0
+            logger.info("PROGRESS: got top %i similarities of %i/%i query documents", k, end, num_queries)
+            start = end
+        if start < num_queries:
+            raise ValueError("query corpus has %i documents, expected num_queries=%i" % (start, num_queries))
+        ids.flush()
+        sims.flush()
+        return ids, sims
+
     def vector_by_id(self, docpos):
         """Get the indexed vector corresponding to the document at position `docpos`.
 
@@ -617,6 +1483,9 @@ class Similarity(interfaces.SimilarityABC):
         if not self.shards or docpos < 0 or docpos >= pos:
             raise ValueError("invalid document position: %s (must be 0 <= x < %s)" % (docpos, len(self)))
         result = shard.get_document_id(docpos - pos + len(shard))
+        if docpos in self.deleted or docpos in self.updates:
+            result = self._apply_changes(result.reshape(1, -1), docpos, self._changed_positions(), self.updates)
+            result = result[0] if isinstance(result, numpy.ndarray) else result
         return result
 
     def similarity_by_id(self, docpos):
@@ -694,6 +1563,7 @@ class Similarity(interfaces.SimilarityABC):
             # if not explicitly specified, use the chunksize from the constructor
             chunksize = self.chunksize
 
+        changed, start = self._changed_positions(), 0
         for shard in self.shards:
             query = shard.get_index().index
             for chunk_start in range(0, query.shape[0], chunksize):
@@ -702,7 +1572,9 @@ class Similarity(interfaces.SimilarityABC):
                 # scipy.sparse happy
                 chunk_end = min(query.shape[0], chunk_start + chunksize)
                 chunk = query[chunk_start: chunk_end]  # create a view
-                yield chunk
+                # deleted and updated documents are replaced in a copy of the chunk
+                yield self._apply_changes(chunk, start + chunk_start, changed, self.updates)
+            start += query.shape[0]
 
     def check_moved(self):
         """Update shard locations, for case where the server prefix location changed on the filesystem."""
@@ -725,7 +1597,8 @@ class Similarity(interfaces.SimilarityABC):
         Notes
         -----
         Will call :meth:`~gensim.similarities.Similarity.close_shard` internally to spill
-        any unfinished shards to disk first.
+        any unfinished shards to disk first. The files of shards replaced by
+        :meth:`~gensim.similarities.docsim.Similarity.compact` are deleted once the index is saved.
 
         Examples
         --------
@@ -745,14 +1618,25 @@ class Similarity(interfaces.SimilarityABC):
             >>> loaded_index = index.load(output_fname)
 
         """
-        self.close_shard()
-        if fname is None:
-            fname = self.output_prefix
-        super(Similarity, self).save(fname, *args, **kwargs)
+        with self.lock:
+            self.close_shard()
+            if fname is None:
+                fname = self.output_prefix
+            # a shard closed again under a replaced shard's file name (after reopen_shard) is in use, keep its files
+            live = set(shard.fullname() for shard in self.shards)
+            stale = [shard_fname for shard_fname in self.stale_shards if shard_fname not in live]
+            self.stale_shards = []
+            super(Similarity, self).save(fname, *args, **kwargs)
+            for shard_fname in stale:
+                for stale_fname in _shard_files(shard_fname):
+                    logger.info("deleting %s", stale_fname)
+                    os.remove(stale_fname)
 
     def destroy(self):
         """Delete all files under self.output_prefix Index is not usable anymore after calling this method."""
         import glob
+        self.close_pool()
+        self.shard_cache.clear()
         for fname in glob.glob(self.output_prefix + '*'):
             logger.info("deleting %s", fname)
             os.remove(fname)
@@ -763,6 +1647,13 @@ class MatrixSimilarity(interfaces.SimilarityABC):
 
     Unless the entire matrix fits into main memory, use :class:`~gensim.similarities.docsim.Similarity` instead.
 
+    The index can also be quantized, see :meth:`~gensim.similarities.docsim.MatrixSimilarity.quantize`:
+    queries then scan a compact int8 or float16 copy of the index, decoded to float32 one block at a time.
+    The similarities are approximate, unless the best `rerank` candidates of every query are re-scored exactly.
+    Quantization saves memory, it does not make queries faster: every block is converted to float32 before
+    the BLAS product, so an int8 scan is about as fast as a float32 scan (somewhat faster for single queries
+    on a memory-bound machine), and a float16 scan is slower.
+
     Examples
     --------
     .. sourcecode:: pycon
@@ -773,9 +1664,14 @@ class MatrixSimilarity(interfaces.SimilarityABC):
         >>> query = [(1, 2), (5, 4)]
         >>> index = MatrixSimilarity(common_corpus, num_features=len(common_dictionary))
         >>> sims = index[query]
+        >>>
+        >>> index = MatrixSimilarity(common_corpus, num_features=len(common_dictionary), quantize='int8', rerank=10)
+        >>> index.num_best = 3
+        >>> sims = index[query]
 
     """
-    def __init__(self, corpus, num_best=None, dtype=numpy.float32, num_features=None, chunksize=256, corpus_len=None):
+    def __init__(self, corpus, num_best=None, dtype=numpy.float32, num_features=None, chunksize=256, corpus_len=None,
+                 quantize=None, rerank=None, fname=None):
         """
 
         Parameters
@@ -793,6 +1689,14 @@ class MatrixSimilarity(interfaces.SimilarityABC):
             Size of query chunks. Used internally when the query is an entire corpus.
         dtype : numpy.dtype, optional
             Datatype to store the internal matrix in.
+        quantize : {None, 'int8', 'float16'}, optional
+            If set, quantize the index, see :meth:`~gensim.similarities.docsim.MatrixSimilarity.quantize`.
+        rerank : int, optional
+            For a quantized index with `num_best` set, re-score the best `rerank` candidates of every query
+            with the float index, so that the returned similarities are exact.
+        fname : str, optional
+            If set, write the float index to the .npy file `fname` and memory-map it read-only, instead of
+            keeping it in memory. Combined with `quantize`, only the quantized copy is held in memory.
 
         """
         if num_features is None:
@@ -805,6 +1709,9 @@ class MatrixSimilarity(interfaces.SimilarityABC):
         self.num_best = num_best
         self.normalize = True
         self.chunksize = chunksize
+        self.rerank = rerank
+        self.codes = None
+        self.scales = None
         if corpus_len is None:
             corpus_len = len(corpus)
 
@@ -815,7 +1722,11 @@ class MatrixSimilarity(interfaces.SimilarityABC):
                     "or a non-empty corpus in the constructor)"
                 )
             logger.info("creating matrix with %i documents and %i features", corpus_len, num_features)
-            self.index = numpy.empty(shape=(corpus_len, num_features), dtype=dtype)
+            if fname is None:
+                self.index = numpy.empty(shape=(corpus_len, num_features), dtype=dtype)
+            else:
+                shape = (corpus_len, num_features)
+                self.index = numpy.lib.format.open_memmap(fname, mode='w+', dtype=dtype, shape=shape)
             # iterate over corpus, populating the numpy index matrix with (normalized)
             # document vectors
             for docno, vector in enumerate(corpus):
@@ -833,9 +1744,106 @@ class MatrixSimilarity(interfaces.SimilarityABC):
                     vector = matutils.unitvec(matutils.sparse2full(vector, num_features))
                 self.index[docno] = vector
 
+            if fname is not None:
+                self.index.flush()
+                self.index = numpy.load(fname, mmap_mode='r')
+            if quantize is not None:
+                self.quantize(quantize)
+
     def __len__(self):
         return self.index.shape[0]
 
+    def quantize(self, method='int8', fname=None):
+        """Store a compact copy of the index, which all later queries scan instead of the float index.
+
+        Parameters
+        ----------
+        method : {'int8', 'float16'}, optional
+            With `'int8'`, every document vector is scaled by its maximum absolute value and rounded to 8-bit integers,
+            which takes 4x less memory than float32. With `'float16'`, the vectors are stored in half precision,
+            which takes 2x less memory.
+        fname : str, optional
+            If set, move the float index to the .npy file `fname` and memory-map it read-only.
+
+        Notes
+        -----
+        Quantization reduces the memory scanned by every query, not the time: the codes are converted
+        to float32 one block at a time before the dot products.
+
+        The float index is kept, for exact re-ranking (see the `rerank` parameter) and for iterating over
+        the index. Unless it is moved to disk with `fname` (or the index is saved and loaded back with `mmap='r'`),
+        it stays in memory next to the quantized copy. On disk, only the rows of the re-ranked candidates are read.
+
+        """
+        if method not in ('int8', 'float16'):
+            raise ValueError("unknown quantization method %r, expected 'int8' or 'float16'" % method)
+        logger.info("quantizing %i documents using %s", len(self), method)
+        if method == 'float16':
+            self.codes, self.scales = numpy.asarray(self.index, dtype=numpy.float16), None
+            if fname is not None:
+                self._mmap_index(fname)
+            return
+        self.codes = numpy.empty(self.index.shape, dtype=numpy.int8)
+        self.scales = numpy.empty(len(self), dtype=numpy.float32)
+        blocksize = self._blocksize()
+        for start in range(0, len(self), blocksize):
+            block = numpy.asarray(self.index[start:start + blocksize], dtype=numpy.float32)
+            scales = numpy.abs(block).max(axis=1) / 127
+            scales[scales == 0] = 1.0
+            self.codes[start:start + len(block)] = numpy.rint(block / scales[:, None])
+            self.scales[start:start + len(block)] = scales
+        if fname is not None:
+            self._mmap_index(fname)
+
+    def _mmap_index(self, fname):
+        """Write the float index to the .npy file `fname` and replace it by a read-only memory map of that file."""
+        logger.info("moving the float index to %s", fname)
+        index = numpy.lib.format.open_memmap(fname, mode='w+', dtype=self.index.dtype, shape=self.index.shape)
+        blocksize = self._blocksize()
+        for start in range(0, len(self), blocksize):
+            index[start:start + blocksize] = self.index[start:start + blocksize]
+        index.flush()
+        del index
+        self.index = numpy.load(fname, mmap_mode='r')
+
+    def _blocksize(self):
+        """Get the number of rows decoded at once from a quantized index."""
+        return max(1, QUANTIZED_BLOCK_BYTES // (4 * max(1, self.index.shape[1])))
+
+    def _decode_buffer(self):
+        """Allocate the float32 block that :meth:`~gensim.similarities.docsim.MatrixSimilarity._quantized_dot`
+        decodes into, so that scanning the index does not allocate a new block for every slice of documents."""
+        return numpy.empty((max(1, min(self._blocksize(), len(self))), self.codes.shape[1]), dtype=numpy.float32)
+
+    def _quantized_dot(self, queries, start, end, buffer):
+        """Get the approximate similarities of the documents `start:end` to dense `queries`, shape (docs, queries)."""
+        codes = self.codes[start:end]
+        block = buffer[:len(codes)]
+        block[...] = codes
+        result = numpy.dot(block, queries.T)
+        if self.scales is not None:
+            result *= self.scales[start:end, None]
+        return result
+
+    def _dense_query(self, query):
+        """Convert `query` into a 2D dense array, one row per query document.
+
+        Returns
+        -------
+        (numpy.ndarray, bool)
+            The dense queries, and whether `query` was a single document.
+
+        """
+        is_corpus, query = utils.is_corpus(query)
+        if is_corpus:
+            return numpy.asarray([matutils.sparse2full(vec, self.num_features) for vec in query]), False
+        if scipy.sparse.issparse(query):
+            query = query.toarray()  # convert sparse to dense
+        elif not isinstance(query, numpy.ndarray):
+            # default case: query is a single vector in sparse gensim format
+            query = matutils.sparse2full(query, self.num_features)
+        return numpy.atleast_2d(query), query.ndim == 1
+
     def get_similarities(self, query):
         """Get similarity between `query` and this index.
 
@@ -871,11 +1879,75 @@ class MatrixSimilarity(interfaces.SimilarityABC):
                 query = matutils.sparse2full(query, self.num_features)
             query = numpy.asarray(query, dtype=self.index.dtype)
 
+        if getattr(self, 'codes', None) is not None:
+            # scan the quantized index one block at a time, accumulating in float32
+            queries = numpy.atleast_2d(query).astype(numpy.float32)
+            result = numpy.empty((len(queries), len(self)), dtype=numpy.float32)
+            blocksize, buffer = self._blocksize(), self._decode_buffer()
+            for start in range(0, len(self), blocksize):
+                result[:, start:start + blocksize] = self._quantized_dot(queries, start, start + blocksize, buffer).T
+            return result[0] if query.ndim == 1 else result
+
         # do a little transposition dance to stop numpy from making a copy of
         # self.index internally in numpy.dot (very slow).
         result = numpy.dot(self.index, query.T).T  # return #queries x #index
         return result  # XXX: removed casting the result from array to list; does anyone care?
 
+    def __getitem__(self, query):
+        """Get similarities of the given document or corpus against this index.
+
+        For a quantized index with `num_best` set, only the best candidates of every block are kept while scanning,
+        and the best `rerank` candidates are re-scored with the float index, if `rerank` is set.
+        Otherwise, see :meth:`~gensim.interfaces.SimilarityABC.__getitem__`.
+
+        Parameters
+        ----------
+        query : {list of (int, number), iterable of list of (int, number)}
+            Document in the sparse Gensim bag-of-words format, or a streamed corpus of such documents.
+
+        Returns
+        -------
+        {numpy.ndarray, list of (int, float)}
+            Similarities given document or corpus and objects corpus, depends on `query`.
+
+        """
+        if self.num_best is None or getattr(self, 'codes', None) is None:
+            return super(MatrixSimilarity, self).__getitem__(query)
+
+        is_corpus, query = utils.is_corpus(query)
+        if self.normalize and not matutils.ismatrix(query):
+            # same query normalization as in :meth:`gensim.interfaces.SimilarityABC.__getitem__`
+            if is_corpus:
+                query = [matutils.unitvec(v) for v in query]
+            else:
+                query = matutils.unitvec(query)
+        queries, is_single = self._dense_query(query)
+        queries = queries.astype(numpy.float32)
+
+        num_candidates = max(self.num_best, self.rerank or 0)
+        ids = numpy.empty((len(queries), 0), dtype=numpy.int64)
+        sims = numpy.empty((len(queries), 0), dtype=numpy.float32)
+        blocksize, buffer = self._blocksize(), self._decode_buffer()
+        for start in range(0, len(self), blocksize):
+            block_sims = self._quantized_dot(queries, start, start + blocksize, buffer).T
+            ids = numpy.hstack([ids, numpy.arange(start, start + block_sims.shape[1])[None, :].repeat(len(ids), 0)])
+            positions, sims = _topk(numpy.hstack([sims, block_sims]), num_candidates)
+            ids = numpy.where(positions < 0, -1, ids[numpy.arange(len(ids))[:, None], positions])
+
+        result = []
+        for query, row_ids, row_sims in zip(queries, ids, sims):
+            if self.rerank:
+                candidates = numpy.sort(row_ids[row_ids >= 0])  # read the float index in storage order
+                exact = numpy.dot(self.index[candidates], query.astype(self.index.dtype))
+                result.append([
+                    (int(candidates[pos]), sim) for pos, sim in matutils.full2sparse_clipped(exact, self.num_best)
+                ])
+            else:
+                result.append([
+                    (int(doc), float(sim)) for doc, sim in zip(row_ids, row_sims) if doc >= 0
+                ][:self.num_best])
+        return result[0] if is_single else result
+
     def __str__(self):
         return "%s<%i docs, %i features>" % (self.__class__.__name__, len(self), self.index.shape[1])
 
@@ -990,6 +2062,26 @@ class SoftCosineSimilarity(interfaces.SimilarityABC):
         return "%s<%i docs, %i features>" % (self.__class__.__name__, len(self), self.similarity_matrix.shape[0])
 
 
+def _wmd_emd(problem):
+    """Solve the EMD problem between two nBOW documents.
+
+    Parameters
+    ----------
+    problem : (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        Word weights of both documents over their joint vocabulary and the matrix of distances between its words.
+
+    Returns
+    -------
+    float
+        Word Mover's Distance between the documents.
+
+    """
+    from pyemd import emd
+
+    d1, d2, distance_matrix = problem
+    return emd(d1, d2, distance_matrix)
+
+
 class WmdSimilarity(interfaces.SimilarityABC):
     """Compute negative WMD similarity against a corpus of documents.
 
@@ -1022,7 +2114,7 @@ class WmdSimilarity(interfaces.SimilarityABC):
         >>> sims = index[query]
 
     """
-    def __init__(self, corpus, w2v_model, num_best=None, normalize_w2v_and_replace=True, chunksize=256):
+    def __init__(self, corpus, w2v_model, num_best=None, normalize_w2v_and_replace=True, chunksize=256, workers=1):
         """
 
         Parameters
@@ -1032,17 +2124,22 @@ class WmdSimilarity(interfaces.SimilarityABC):
         w2v_model: :class:`~gensim.models.word2vec.Word2VecTrainables`
             A trained word2vec model.
         num_best: int, optional
-            Number of results to retrieve.
+            Number of results to retrieve. When set, documents that provably cannot enter the top `num_best`
+            are pruned using the word centroid distance (WCD) and relaxed WMD (RWMD) lower bounds,
+            and exact WMD is only computed for the remaining candidates.
         normalize_w2v_and_replace: bool, optional
             Whether or not to normalize the word2vec vectors to length 1.
         chunksize : int, optional
             Size of chunk.
+        workers : int, optional
+            Number of worker processes used to solve the exact EMD problems.
 
         """
         self.corpus = corpus
         self.w2v_model = w2v_model
         self.num_best = num_best
         self.chunksize = chunksize
+        self.workers = workers
 
         # Normalization of features is not possible, as corpus is a list (of lists) of strings.
         self.normalize = False
@@ -1054,10 +2151,152 @@ class WmdSimilarity(interfaces.SimilarityABC):
             # Normalize vectors in word2vec class to length 1.
             w2v_model.init_sims(replace=True)
 
+        # nBOW representations and word centroids of the corpus, computed on first query.
+        self.documents = None
+        self.centroids = None
+
     def __len__(self):
         """Get size of corpus."""
         return len(self.corpus)
 
+    def _nbow(self, document):
+        """Get the normalized bag-of-words of the in-vocabulary words of `document`.
+
+        Parameters
+        ----------
+        document : list of str
+            Input document.
+
+        Returns
+        -------
+        (list of str, numpy.ndarray) or None
+            Unique in-vocabulary tokens and their relative frequencies, or None if no token is in the vocabulary.
+
+        """
+        wv = self.w2v_model.wv
+        document = [token for token in document if token in wv]
+        if not document:
+            return None
+        tokens, counts = numpy.unique(document, return_counts=True)
+        return list(tokens), counts / float(len(document))
+
+    def _prepare(self):
+        """Compute the nBOW representation and the word centroid of every indexed document."""
+        if self.documents is not None:
+            return
+        wv = self.w2v_model.wv
+        self.documents = [self._nbow(document) for document in self.corpus]
+        self.centroids = numpy.full((len(self.documents), wv.vector_size), numpy.nan, dtype=numpy.float64)
+        for docno, document in enumerate(self.documents):
+            if document is not None:
+                tokens, weights = document
+                self.centroids[docno] = numpy.dot(weights, wv[tokens])
+
+    def _wmdistances(self, query, docnos, pool=None, threshold=numpy.inf):
+        """Compute exact WMD between `query` and the indexed documents `docnos`.
+
+        Documents whose RWMD lower bound is at least `threshold` are skipped, their distance is reported as inf.
+
+        Parameters
+        ----------
+        query : (list of str, numpy.ndarray, numpy.ndarray)
+            Tokens, weights and word vectors of the query.
+        docnos : iterable of int
+            Positions of the documents in the index.
+        pool : :class:`multiprocessing.Pool`, optional
+            Pool that solves the EMD problems, if None they are solved in this process.
+        threshold : float, optional
+            Documents with RWMD at or above this value are skipped.
+
+        Returns
+        -------
+        list of float
+            Distances in the order of `docnos`.
+
+        """
+        wv = self.w2v_model.wv
+        query_tokens, query_weights, query_vectors = query
+        distances = []
+        problems, positions = [], []
+        for docno in docnos:
+            tokens, weights = self.documents[docno]
+            if len(query_tokens) == 1 and query_tokens == tokens:
+                # Both documents consist of the same single word, same as `wmdistance`.
+                distances.append(0.0)
+                continue
+            # Joint vocabulary of both documents, as in `wmdistance`.
+            vocab = sorted(set(query_tokens).union(tokens))
+            positions1 = numpy.searchsorted(vocab, query_tokens)
+            positions2 = numpy.searchsorted(vocab, tokens)
+            vectors = wv[vocab]
+            distance_matrix = numpy.sqrt(
+                numpy.sum((vectors[:, None, :] - vectors[None, :, :]) ** 2, axis=2, dtype=numpy.float64)
+            )
+            cross = distance_matrix[positions1][:, positions2]
+            rwmd = max(numpy.dot(query_weights, cross.min(axis=1)), numpy.dot(weights, cross.min(axis=0)))
+            if rwmd >= threshold or not numpy.any(cross):
+                distances.append(numpy.inf)
+                continue
+            d1 = numpy.zeros(len(vocab), dtype=numpy.double)
+            d1[positions1] = query_weights
+            d2 = numpy.zeros(len(vocab), dtype=numpy.double)
+            d2[positions2] = weights
+            positions.append(len(distances))
+            distances.append(None)
+            problems.append((d1, d2, distance_matrix))
+
+        solved = pool.map(_wmd_emd, problems) if pool is not None else map(_wmd_emd, problems)
+        for position, distance in zip(positions, solved):
+            distances[position] = distance
+        return distances
+
+    def _pruned_wmdistances(self, query, pool=None):
+        """Compute WMD between `query` and just enough indexed documents to find the `self.num_best` nearest.
+
+        Documents are visited in order of increasing word centroid distance (WCD); the search stops once the
+        WCD lower bound reaches the current `num_best`-th distance, and the remaining candidates are pruned
+        with the RWMD lower bound before solving the exact EMD.
+
+        Parameters
+        ----------
+        query : (list of str, numpy.ndarray, numpy.ndarray)
+            Tokens, weights and word vectors of the query.
+        pool : :class:`multiprocessing.Pool`, optional
+            Pool that solves the EMD problems, if None they are solved in this process.
+
+        Returns
+        -------
+        numpy.ndarray
+            Distances to all indexed documents, inf for the pruned ones.
+
+        """
+        distances = numpy.full(len(self.documents), numpy.inf)
+        if self.num_best <= 0:
+            return distances
+        query_centroid = numpy.dot(query[1], query[2])
+        wcd = numpy.sqrt(numpy.sum((self.centroids - query_centroid) ** 2, axis=1))
+        order = numpy.argsort(wcd, kind='mergesort')
+        order = order[numpy.isfinite(wcd[order])]  # documents without any in-vocabulary word
+
+        # Max-heap (of negated distances) of the `num_best` smallest distances seen so far.
+        first = order[:self.num_best]
+        distances[first] = self._wmdistances(query, first, pool)
+        best = [-distance for distance in distances[first]]
+        heapq.heapify(best)
+        threshold = -best[0] if len(best) == self.num_best else numpy.inf
+
+        batchsize = 1 if pool is None else 2 * self.workers
+        for start in range(self.num_best, len(order), batchsize):
+            batch = [docno for docno in order[start:start + batchsize] if wcd[docno] < threshold]
+            if not batch:
+                break  # WCD only grows from here on, no other document can enter the top `num_best`
+            for docno, distance in zip(batch, self._wmdistances(query, batch, pool, threshold)):
+                distances[docno] = distance
+                if distance < threshold:
+                    heapq.heapreplace(best, -distance)
+                    threshold = -best[0]
+        return distances
+
     def get_similarities(self, query):
         """Get similarity between `query` and this index.
 
@@ -1073,7 +2312,7 @@ class WmdSimilarity(interfaces.SimilarityABC):
         Return
         ------
         :class:`numpy.ndarray`
-            Similarity matrix.
+            Similarity matrix. If `num_best` is set, documents pruned from the search have similarity 0.
 
         """
         if isinstance(query, numpy.ndarray):
@@ -1083,16 +2322,28 @@ class WmdSimilarity(interfaces.SimilarityABC):
         if not query or not isinstance(query[0], list):
             query = [query]
 
-        n_queries = len(query)
-        result = []
-        for qidx in range(n_queries):
-            # Compute similarity for each query.
-            qresult = [self.w2v_model.wv.wmdistance(document, query[qidx]) for document in self.corpus]
-            qresult = numpy.array(qresult)
-            qresult = 1. / (1. + qresult)  # Similarity is the negative of the distance.
-
-            # Append single query result to list of all results.
-            result.append(qresult)
+        self._prepare()
+        pool = multiprocessing.Pool(self.workers) if self.workers > 1 else None
+        try:
+            result = []
+            for document in query:
+                # Compute similarity for each query.
+                qresult = numpy.full(len(self.documents), numpy.inf)
+                document = self._nbow(document)
+                if document is not None:
+                    document = document + (self.w2v_model.wv[document[0]],)
+                    if self.num_best is None:
+                        docnos = [docno for docno, doc in enumerate(self.documents) if doc is not None]
+                        qresult[docnos] = self._wmdistances(document, docnos, pool)
+                    else:
+                        qresult = self._pruned_wmdistances(document, pool)
+                qresult = 1. / (1. + qresult)  # Similarity is the negative of the distance.
+
+                # Append single query result to list of all results.
+                result.append(qresult)
+        finally:
+            if pool is not None:
+                pool.terminate()
 
         if len(result) == 1:
             # Only one query.
@@ -1120,6 +2371,19 @@ class SparseMatrixSimilarity(interfaces.SimilarityABC):
     causes `get_similarities` to return a sparse matrix instead of a
     dense representation if possible.
 
+    Takes an optional `maxscore` argument, setting this to True keeps a term-major copy of the index
+    and finds the `num_best` most similar documents with the MaxScore dynamic pruning strategy [turtle95]_:
+    query terms are processed in the order of decreasing maximum contribution to the similarity and once
+    the documents that have been seen are guaranteed to outscore all documents that have not been seen,
+    the remaining terms are only used to bound the similarities of the candidate documents.
+    The similarities of the candidates that can still enter the `num_best` are then computed exactly as by
+    `get_similarities`, so the results do not change, but most documents in the index are never scored.
+
+    References
+    ----------
+    .. [turtle95] Howard Turtle, James Flood. Query evaluation: Strategies and optimizations.
+       Information Processing & Management, 31(6):831-850, 1995.
+
     See also
     --------
     :class:`~gensim.similarities.docsim.Similarity`
@@ -1129,7 +2393,7 @@ class SparseMatrixSimilarity(interfaces.SimilarityABC):
 
     """
     def __init__(self, corpus, num_features=None, num_terms=None, num_docs=None, num_nnz=None,
-                 num_best=None, chunksize=500, dtype=numpy.float32, maintain_sparsity=False):
+                 num_best=None, chunksize=500, dtype=numpy.float32, maintain_sparsity=False, maxscore=False):
         """
 
         Parameters
@@ -1153,12 +2417,17 @@ class SparseMatrixSimilarity(interfaces.SimilarityABC):
             Data type of the internal matrix.
         maintain_sparsity : bool, optional
             Return sparse arrays from :meth:`~gensim.similarities.docsim.SparseMatrixSimilarity.get_similarities`?
+        maxscore : bool, optional
+            Find the `num_best` most similar documents with MaxScore dynamic pruning?
+            See :meth:`~gensim.similarities.docsim.SparseMatrixSimilarity.init_maxscore`.
 
         """
         self.num_best = num_best
         self.normalize = True
         self.chunksize = chunksize
         self.maintain_sparsity = maintain_sparsity
+        self.postings = None
+        self.term_max = None
 
         if corpus is not None:
             logger.info("creating sparse index")
@@ -1190,6 +2459,26 @@ class SparseMatrixSimilarity(interfaces.SimilarityABC):
             self.index = self.index.tocsr()  # currently no-op, CSC.T is already CSR
             logger.info("created %r", self.index)
 
+            if maxscore:
+                self.init_maxscore()
+
+    def init_maxscore(self):
+        """Precompute the term-major postings and maximum term weights used by MaxScore dynamic pruning.
+
+        Afterwards, queries with `num_best` set are answered by
+        :meth:`~gensim.similarities.docsim.SparseMatrixSimilarity.__getitem__` without scoring most documents,
+        unless `maintain_sparsity` is set.
+
+        Notes
+        -----
+        The postings are a :class:`scipy.sparse.csc_matrix` copy of the index, which doubles its memory footprint.
+
+        """
+        logger.info("precomputing postings for MaxScore")
+        self.postings = self.index.tocsc()
+        self.postings.sort_indices()
+        self.term_max = numpy.asarray(abs(self.postings).max(axis=0).todense(), dtype=numpy.float64).ravel()
+
     def __len__(self):
         """Get size of index."""
         return self.index.shape[0]
@@ -1213,6 +2502,35 @@ class SparseMatrixSimilarity(interfaces.SimilarityABC):
         :class:`scipy.sparse.csc`
             otherwise
 
+        """
+        is_corpus, query = self._query2csc(query)
+
+        # compute cosine similarity against every other document in the collection
+        result = self.index * query  # N x T * T x C = N x C
+        if result.shape[1] == 1 and not is_corpus:
+            # for queries of one document, return a 1d array
+            result = result.toarray().flatten()
+        elif self.maintain_sparsity:
+            # avoid converting to dense array if maintaining sparsity
+            result = result.T
+        else:
+            # otherwise, return a 2d matrix (#queries x #index)
+            result = result.toarray().T
+        return result
+
+    def _query2csc(self, query):
+        """Convert a document or a collection of documents to a term-document matrix.
+
+        Parameters
+        ----------
+        query : {list of (int, number), iterable of list of (int, number), :class:`scipy.sparse.csr_matrix`}
+            Document or collection of documents.
+
+        Returns
+        -------
+        (bool, :class:`scipy.sparse.csc_matrix`)
+            Whether the query was a corpus, and the query with documents as columns.
+
         """
         is_corpus, query = utils.is_corpus(query)
         if is_corpus:
@@ -1227,16 +2545,118 @@ class SparseMatrixSimilarity(interfaces.SimilarityABC):
             else:
                 # default case: query is a single vector, in sparse gensim format
                 query = matutils.corpus2csc([query], self.index.shape[1], dtype=self.index.dtype)
+        return is_corpus, query.tocsc()
 
-        # compute cosine similarity against every other document in the collection
-        result = self.index * query.tocsc()  # N x T * T x C = N x C
-        if result.shape[1] == 1 and not is_corpus:
-            # for queries of one document, return a 1d array
-            result = result.toarray().flatten()
-        elif self.maintain_sparsity:
-            # avoid converting to dense array if maintaining sparsity
-            result = result.T
-        else:
-            # otherwise, return a 2d matrix (#queries x #index)
-            result = result.toarray().T
+    def __getitem__(self, query):
+        """Get similarities of the given document or corpus against this index.
+
+        If `num_best` is set and :meth:`~gensim.similarities.docsim.SparseMatrixSimilarity.init_maxscore` was called,
+        the `num_best` most similar documents are found with MaxScore dynamic pruning. Otherwise, see
+        :meth:`~gensim.interfaces.SimilarityABC.__getitem__`.
+
+        Parameters
+        ----------
+        query : {list of (int, number), iterable of list of (int, number)}
+            Document in the sparse Gensim bag-of-words format, or a streamed corpus of such documents.
+
+        Returns
+        -------
+        {`scipy.sparse.csr.csr_matrix`, list of (int, float)}
+            Similarities given document or corpus and objects corpus, depends on `query`.
+
+        """
+        if self.num_best is None or self.maintain_sparsity or getattr(self, 'postings', None) is None:
+            return super(SparseMatrixSimilarity, self).__getitem__(query)
+
+        is_corpus, query = utils.is_corpus(query)
+        if self.normalize and not matutils.ismatrix(query):
+            if is_corpus:
+                query = [matutils.unitvec(v) for v in query]
+            else:
+                query = matutils.unitvec(query)
+        is_corpus, query = self._query2csc(query)
+        result = [self._maxscore(query[:, column], self.num_best) for column in range(query.shape[1])]
+        if len(result) == 1 and not is_corpus:
+            # for queries of one document, return a single list
+            result = result[0]
         return result
+
+    def _maxscore(self, query, topn):
+        """Find the `topn` documents most similar to a single query with MaxScore dynamic pruning.
+
+        Parameters
+        ----------
+        query : :class:`scipy.sparse.csc_matrix`
+            The query, a single column.
+        topn : int
+            Number of most similar documents to return.
+
+        Returns
+        -------
+        list of (int, float)
+            The `topn` documents with the greatest absolute similarity, same as
+            :func:`~gensim.matutils.full2sparse_clipped` of the similarities of the query against all documents.
+
+        """
+        if topn <= 0:
+            return []
+        terms, weights = query.indices, query.data.astype(numpy.float64)
+        impacts = numpy.abs(weights) * self.term_max[terms]
+        order = numpy.argsort(-impacts, kind='mergesort')
+        terms, weights = terms[order], weights[order]
+        # remaining[i] bounds the absolute contribution of the terms i, i + 1, ... to any similarity
+        remaining = numpy.append(numpy.cumsum(impacts[order][::-1])[::-1], 0.0)
+        slack = MAXSCORE_SLACK * remaining[0]  # float32 products of the index differ from float64 bounds
+
+        indptr, indices, data = self.postings.indptr, self.postings.indices, self.postings.data
+        partial = numpy.zeros(len(self), dtype=numpy.float64)
+        seen = numpy.zeros(len(self), dtype=bool)
+        candidates, num_candidates = [], 0
+        largest = 0.0  # bounds the absolute partial similarity of any candidate
+        position = 0
+        # first, accumulate the terms with the greatest contributions over all documents in their postings
+        while position < len(terms):
+            if num_candidates >= topn and largest - remaining[position] - slack > remaining[position]:
+                candidates = [numpy.concatenate(candidates)]
+                lower = numpy.abs(partial[candidates[0]]) - remaining[position]
+                if numpy.partition(lower, num_candidates - topn)[num_candidates - topn] - slack > remaining[position]:
+                    break  # no document outside candidates can enter the topn any more
+            start, end = indptr[terms[position]], indptr[terms[position] + 1]
+            docs = indices[start:end]
+            partial[docs] += weights[position] * data[start:end]
+            if len(docs):
+                largest = max(largest, numpy.abs(partial[docs]).max())
+            docs = docs[~seen[docs]]
+            seen[docs] = True
+            candidates.append(docs)
+            num_candidates += len(docs)
+            position += 1
+        candidates = numpy.sort(numpy.concatenate(candidates)) if candidates else indices[:0]
+
+        # then, accumulate the remaining terms over the candidates only, dropping candidates as the bounds tighten.
+        # from now on, seen marks the remaining candidates
+        while True:
+            magnitudes = numpy.abs(partial[candidates])
+            if len(candidates) > topn:
+                lower = magnitudes - remaining[position]
+                threshold = numpy.partition(lower, len(lower) - topn)[len(lower) - topn]
+                keep = magnitudes + remaining[position] >= threshold - slack
+                seen[candidates[~keep]] = False
+                candidates = candidates[keep]
+            if position == len(terms):
+                break
+            start, end = indptr[terms[position]], indptr[terms[position] + 1]
+            docs = indices[start:end]
+            if len(candidates) * 16 < len(docs):
+                # look the candidates up in long postings, rather than scanning them
+                found = numpy.minimum(numpy.searchsorted(docs, candidates), len(docs) - 1)
+                hits = docs[found] == candidates
+                partial[candidates[hits]] += weights[position] * data[start:end][found[hits]]
+            else:
+                hits = seen[docs]
+                partial[docs[hits]] += weights[position] * data[start:end][hits]
+            position += 1
+        logger.debug("scoring %i candidates of %i query terms", len(candidates), len(terms))
+
+        sims = (self.index[candidates] * query).toarray().ravel()
+        return [(candidates[pos], sim) for pos, sim in matutils.full2sparse_clipped(sims, topn)]
@@ -0,0 +1,429 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Licensed under the GNU LGPL v2.1 - http://www.gnu.org/licenses/lgpl.html
+
+"""
+Intro
+-----
+
+This module contains a pure-numpy implementation of Hierarchical Navigable Small World graphs (HNSW),
+usable as an approximate nearest neighbour indexer for :class:`~gensim.models.word2vec.Word2Vec`,
+:class:`~gensim.models.doc2vec.Doc2Vec`, :class:`~gensim.models.fasttext.FastText` and
+:class:`~gensim.models.keyedvectors.KeyedVectors`, without any third-party dependency.
+To use it, instantiate a :class:`~gensim.similarities.hnsw.HnswIndexer` class
+and pass the instance as the indexer parameter to your model's most_similar method
+(e.g. :py:func:`~gensim.models.keyedvectors.WordEmbeddingsKeyedVectors.most_similar`).
+
+Example usage
+-------------
+
+.. sourcecode:: pycon
+
+    >>> from gensim.similarities.hnsw import HnswIndexer
+    >>> from gensim.models import Word2Vec
+    >>>
+    >>> sentences = [['cute', 'cat', 'say', 'meow'], ['cute', 'dog', 'say', 'woof']]
+    >>> model = Word2Vec(sentences, min_count=1, seed=1)
+    >>>
+    >>> indexer = HnswIndexer(model, M=8, ef=20)
+    >>> neighbors = model.wv.most_similar("cat", topn=2, indexer=indexer)
+
+Load and save example
+---------------------
+
+The graph and the indexed vectors are stored as plain numpy arrays, so a saved index can be memory-mapped:
+
+.. sourcecode:: pycon
+
+    >>> from gensim.test.utils import get_tmpfile
+    >>>
+    >>> fname = get_tmpfile('hnsw.index')
+    >>> indexer.save(fname)
+    >>> new_indexer = HnswIndexer.load(fname, mmap='r')
+    >>> neighbors = model.wv.most_similar("cat", topn=2, indexer=new_indexer)
+
+What is HNSW
+------------
+
+HNSW builds a hierarchy of proximity graphs: every indexed vector is a node of the bottom layer, and each
+node is also promoted to a random number of sparser upper layers. A query greedily descends from the single
+entry point on the top layer down to the bottom layer, where a beam search of width `ef` collects the nearest
+neighbours. Query time grows roughly logarithmically with the number of indexed vectors.
+See `Malkov & Yashunin, "Efficient and robust approximate nearest neighbor search using Hierarchical
+Navigable Small World graphs" <https://arxiv.org/abs/1603.09320>`_.
+
+"""
+
+import heapq
+import logging
+from math import log
+
+import numpy as np
+from six.moves import range, zip
+
+from gensim import utils
+
+logger = logging.getLogger(__name__)
+
+
+class HnswIndexer(utils.SaveLoad):
+    """Approximate nearest neighbour index over cosine similarity, for the `indexer` parameter of `most_similar`.
+
+    Vectors can be added incrementally with :meth:`~gensim.similarities.hnsw.HnswIndexer.add_items`,
+    and queried one at a time with :meth:`~gensim.similarities.hnsw.HnswIndexer.most_similar`
+    or in batches with :meth:`~gensim.similarities.hnsw.HnswIndexer.query`.
+
+    """
+
+    def __init__(self, model=None, M=16, ef_construction=200, ef=50, seed=1):
+        """
+
+        Parameters
+        ----------
+        model : {:class:`~gensim.models.word2vec.Word2Vec`, :class:`~gensim.models.doc2vec.Doc2Vec`, \
+        :class:`~gensim.models.fasttext.FastText`, :class:`~gensim.models.keyedvectors.KeyedVectors`}, optional
+            Model whose vectors will be indexed. If None, an empty index is created,
+            to be filled with :meth:`~gensim.similarities.hnsw.HnswIndexer.add_items`.
+        M : int, optional
+            Maximum number of neighbours of a node on the upper layers; the bottom layer allows `2 * M`.
+            Larger values improve recall on high-dimensional data at the cost of memory and build time.
+        ef_construction : int, optional
+            Width of the beam search used while inserting vectors. Larger values build a better graph, slower.
+        ef : int, optional
+            Default width of the beam search at query time. Larger values improve recall, slower.
+        seed : int, optional
+            Seed for the random generator that assigns node levels.
+
+        """
+        if M < 2:
+            raise ValueError("M must be at least 2, got %r" % M)
+        self.model = model
+        self.M = M
+        self.max_neighbors0 = 2 * M
+        self.ef_construction = ef_construction
+        self.ef = ef
+        self.level_mult = 1.0 / log(M)
+        self.random = np.random.RandomState(seed)
+
+        self.labels = []
+        self.count = 0
+        self.entry_point = -1
+        self.vectors = None  # unit-normalized vectors, one row per node
+        self.levels = None  # top layer of each node
+        self.layer0 = None  # bottom layer adjacency, one row per node, padded with -1
+        self.upper_offsets = None  # row of layer 1 of each node in `upper`, -1 for nodes only on the bottom layer
+        self.upper = None  # upper layers adjacency, row `upper_offsets[node] + layer - 1`, padded with -1
+        self.upper_count = 0  # number of rows of `upper` in use
+
+        if model is None:
+            return
+
+        from gensim.models.doc2vec import Doc2Vec
+        from gensim.models.word2vec import Word2Vec
+        from gensim.models.fasttext import FastText
+        from gensim.models.keyedvectors import KeyedVectors, WordEmbeddingsKeyedVectors
+
+        if isinstance(self.model, Doc2Vec):
+            self._build_from_doc2vec()
+        elif isinstance(self.model, (Word2Vec, FastText)):
+            self._build_from_word2vec()
+        elif isinstance(self.model, (WordEmbeddingsKeyedVectors, KeyedVectors)):
+            self._build_from_keyedvectors()
+        else:
+            raise ValueError("Only a Word2Vec, Doc2Vec, FastText or KeyedVectors instance can be used")
+
+    def save(self, fname, *args, **kwargs):
+        """Save the index, so that it can be loaded (and memory-mapped) with
+        :meth:`~gensim.similarities.hnsw.HnswIndexer.load`.
+
+        Parameters
+        ----------
+        fname : str
+            Path to the output file.
+        *args
+            Arguments, see :meth:`~gensim.utils.SaveLoad.save`.
+        **kwargs
+            Keyword arguments, see :meth:`~gensim.utils.SaveLoad.save`.
+
+        Notes
+        -----
+        This method saves **only** the index (**the model isn't preserved**).
+
+        """
+        kwargs['ignore'] = kwargs.get('ignore', ['model'])
+        # drop the spare capacity reserved for future insertions
+        if self.vectors is not None:
+            self.vectors = self.vectors[:self.count]
+            self.levels = self.levels[:self.count]
+            self.layer0 = self.layer0[:self.count]
+            self.upper_offsets = self.upper_offsets[:self.count]
+        if self.upper is not None:
+            self.upper = self.upper[:self.upper_count]
+        super(HnswIndexer, self).save(fname, *args, **kwargs)
+
+    def _build_from_word2vec(self):
+        """Build an HNSW index using word vectors from a Word2Vec model."""
+        self.add_items(self.model.wv.get_normed_vectors(), self.model.wv.index2word)
+
+    def _build_from_doc2vec(self):
+        """Build an HNSW index using document vectors from a Doc2Vec model."""
+        docvecs = self.model.docvecs
+        labels = [docvecs.index_to_doctag(i) for i in range(0, docvecs.count)]
+        self.add_items(docvecs.get_normed_vectors(), labels)
+
+    def _build_from_keyedvectors(self):
+        """Build an HNSW index using word vectors from a KeyedVectors model."""
+        self.add_items(self.model.get_normed_vectors(), self.model.index2word)
+
+    def add_items(self, vectors, labels):
+        """Insert new vectors into the index.
+
+        Parameters
+        ----------
+        vectors : numpy.ndarray
+            2D array of vectors to be added, one per row. Rows are unit-normalized before insertion.
+        labels : list
+            Labels of the added vectors, returned by :meth:`~gensim.similarities.hnsw.HnswIndexer.most_similar`.
+
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("expected a 2D array of vectors, got shape %s" % (vectors.shape,))
+        if len(labels) != len(vectors):
+            raise ValueError("got %i vectors but %i labels" % (len(vectors), len(labels)))
+        if self.vectors is not None and vectors.shape[1] != self.vectors.shape[1]:
+            raise ValueError(
+                "dimensionality mismatch: index has %i features, got %i" % (self.vectors.shape[1], vectors.shape[1])
+            )
+
+        self._reserve(self.count + len(vectors), vectors.shape[1])
+        self._reserve_upper(self.upper_count)  # copy the upper layers of a memory-mapped index before linking to them
+        norms = np.sqrt((vectors ** 2).sum(axis=1))
+        norms[norms == 0.0] = 1.0
+        for i, (vector, label) in enumerate(zip(vectors, labels)):
+            self._insert(vector / norms[i], label)
+            if i and not i % 10000:
+                logger.info("PROGRESS: inserted %i vectors into HNSW index", i)
+        logger.info(
+            "HNSW index contains %i vectors in %i layers",
+            self.count, int(self.levels[self.entry_point]) + 1 if self.count else 0
+        )
+
+    def _reserve(self, size, num_features):
+        """Grow the node arrays so that they can hold `size` nodes."""
+        capacity = 0 if self.vectors is None else len(self.vectors)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        vectors = np.zeros((capacity, num_features), dtype=np.float32)
+        levels = np.zeros(capacity, dtype=np.int8)
+        layer0 = np.full((capacity, self.max_neighbors0), -1, dtype=np.int32)
+        upper_offsets = np.full(capacity, -1, dtype=np.int32)
+        if self.count:
+            vectors[:self.count] = self.vectors[:self.count]
+            levels[:self.count] = self.levels[:self.count]
+            layer0[:self.count] = self.layer0[:self.count]
+            upper_offsets[:self.count] = self.upper_offsets[:self.count]
+        self.vectors, self.levels, self.layer0, self.upper_offsets = vectors, levels, layer0, upper_offsets
+
+    def _reserve_upper(self, size):
+        """Grow the upper layers adjacency so that it can hold `size` rows, copying it if it is read-only."""
+        capacity = 0 if self.upper is None else len(self.upper)
+        if not size or size <= capacity and self.upper.flags.writeable:
+            return
+        upper = np.full((max(size, 2 * capacity), self.M), -1, dtype=np.int32)
+        if self.upper_count:
+            upper[:self.upper_count] = self.upper[:self.upper_count]
+        self.upper = upper
+
+    def _row(self, node, layer):
+        """Get the adjacency row of `node` on `layer`, padded with -1."""
+        if layer == 0:
+            return self.layer0[node]
+        return self.upper[self.upper_offsets[node] + layer - 1]
+
+    def _neighbors(self, node, layer):
+        row = self._row(node, layer)
+        return row[row >= 0]
+
+    def _set_neighbors(self, node, layer, neighbors):
+        row = self._row(node, layer)
+        row[:len(neighbors)] = neighbors
+        row[len(neighbors):] = -1
+
+    def _insert(self, vector, label):
+        """Insert a single unit vector into the graph."""
+        node = self.count
+        level = int(-log(1.0 - self.random.random_sample()) * self.level_mult)
+        self.vectors[node] = vector
+        self.levels[node] = level
+        self.labels.append(label)
+        self.count += 1
+
+        if level:
+            self._reserve_upper(self.upper_count + level)
+            self.upper_offsets[node] = self.upper_count
+            self.upper_count += level
+
+        if self.entry_point < 0:
+            self.entry_point = node
+            return
+
+        top = int(self.levels[self.entry_point])
+        entry_points = [self.entry_point]
+        for layer in range(top, level, -1):
+            entry_points = [self._search_layer(vector, entry_points, 1, layer)[0][1]]
+
+        for layer in range(min(top, level), -1, -1):
+            candidates = self._search_layer(vector, entry_points, self.ef_construction, layer)
+            max_neighbors = self.max_neighbors0 if layer == 0 else self.M
+            neighbors = self._select_neighbors(candidates, self.M)
+            self._set_neighbors(node, layer, neighbors)
+            for neighbor in neighbors:
+                links = np.append(self._neighbors(neighbor, layer), np.int32(node))
+                if len(links) > max_neighbors:
+                    sims = np.dot(self.vectors[links], self.vectors[neighbor])
+                    order = np.argsort(-sims, kind='mergesort')
+                    links = self._select_neighbors(list(zip(sims[order], links[order])), max_neighbors)
+                self._set_neighbors(neighbor, layer, links)
+            entry_points = [candidate for _, candidate in candidates]
+
+        if level > top:
+            self.entry_point = node
+
+    def _select_neighbors(self, candidates, num_neighbors):
+        """Pick up to `num_neighbors` diverse neighbours among `candidates`.
+
+        A candidate is preferred if it is closer to the base node than to any neighbour already picked,
+        which keeps links spread in all directions; the remaining slots are filled with the closest
+        of the discarded candidates.
+
+        Parameters
+        ----------
+        candidates : list of (float, int)
+            (similarity to the base node, node) pairs, sorted by decreasing similarity.
+        num_neighbors : int
+            Maximum number of neighbours to pick.
+
+        Returns
+        -------
+        numpy.ndarray
+            Picked nodes, as int32.
+
+        """
+        if not len(candidates):
+            return np.empty(0, dtype=np.int32)
+        sims, nodes = zip(*candidates)
+        nodes = np.array(nodes, dtype=np.int32)
+        vectors = self.vectors[nodes]
+        pairwise = np.dot(vectors, vectors.T)
+        closest = np.full(len(nodes), -np.inf, dtype=pairwise.dtype)  # similarity to the nearest pick so far
+        selected, discarded = [], []
+        for i, sim in enumerate(sims):
+            if len(selected) >= num_neighbors:
+                break
+            if closest[i] > sim:
+                discarded.append(i)
+            else:
+                selected.append(i)
+                np.maximum(closest, pairwise[i], out=closest)
+        selected.extend(discarded[:num_neighbors - len(selected)])
+        return nodes[selected]
+
+    def _search_layer(self, vector, entry_points, ef, layer):
+        """Beam search for the `ef` nodes most similar to `vector` within a single layer.
+
+        Returns
+        -------
+        list of (float, int)
+            (similarity, node) pairs, sorted by decreasing similarity.
+
+        """
+        visited = set(entry_points)  # proportional to the nodes reached, not to the size of the index
+        sims = np.dot(self.vectors[entry_points], vector)
+        candidates = [(-float(sim), node) for sim, node in zip(sims, entry_points)]
+        heapq.heapify(candidates)
+        results = heapq.nlargest(ef, [(-neg_sim, node) for neg_sim, node in candidates])
+        heapq.heapify(results)
+
+        while candidates:
+            neg_sim, node = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_sim < results[0][0]:
+                break
+            neighbors = [neighbor for neighbor in self._neighbors(node, layer).tolist() if neighbor not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+            sims = np.dot(self.vectors[neighbors], vector)
+            for sim, neighbor in zip(sims.tolist(), neighbors):
+                if len(results) < ef:
+                    heapq.heappush(results, (sim, neighbor))
+                elif sim > results[0][0]:
+                    heapq.heapreplace(results, (sim, neighbor))
+                else:
+                    continue
+                heapq.heappush(candidates, (-sim, neighbor))
+
+        return sorted(results, reverse=True)
+
+    def _search(self, vector, num_neighbors, ef):
+        """Find the `num_neighbors` nodes most similar to the unit vector `vector`."""
+        if not self.count:
+            return []
+        entry_points = [self.entry_point]
+        for layer in range(int(self.levels[self.entry_point]), 0, -1):
+            entry_points = [self._search_layer(vector, entry_points, 1, layer)[0][1]]
+        return self._search_layer(vector, entry_points, max(ef, num_neighbors), 0)[:num_neighbors]
+
+    def query(self, vectors, num_neighbors, ef=None):
+        """Find the approximate `num_neighbors` most similar nodes for each of a batch of query vectors.
+
+        Parameters
+        ----------
+        vectors : numpy.ndarray
+            Query vectors, one per row (a single 1D vector is also accepted).
+        num_neighbors : int
+            Number of most similar nodes to return per query.
+        ef : int, optional
+            Width of the beam search, overrides the `ef` given at construction time.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+            Node ids (int64, -1 where fewer than `num_neighbors` nodes exist) and cosine similarities
+            (float32), both of shape (number of queries, `num_neighbors`), sorted by decreasing similarity.
+            Use `labels` to map node ids to item labels.
+
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.sqrt((vectors ** 2).sum(axis=1))
+        norms[norms == 0.0] = 1.0
+        ef = self.ef if ef is None else ef
+
+        ids = np.full((len(vectors), num_neighbors), -1, dtype=np.int64)
+        sims = np.full((len(vectors), num_neighbors), -np.inf, dtype=np.float32)
+        for i, vector in enumerate(vectors):
+            for j, (sim, node) in enumerate(self._search(vector / norms[i], num_neighbors, ef)):
+                ids[i, j] = node
+                sims[i, j] = sim
+        return ids, sims
+
+    def most_similar(self, vector, num_neighbors):
+        """Find the approximate `num_neighbors` most similar items.
+
+        Parameters
+        ----------
+        vector : numpy.array
+            Vector for word/document.
+        num_neighbors : int
+            Number of most similar items
+
+        Returns
+        -------
+        list of (str, float)
+            List of most similar items in format [(`item`, `cosine_similarity`), ... ]
+
+        """
+        ids, sims = self.query(vector, num_neighbors)
+        return [(self.labels[node], float(sim)) for node, sim in zip(ids[0], sims[0]) if node >= 0]
@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Licensed under the GNU LGPL v2.1 - http://www.gnu.org/licenses/lgpl.html
+
+"""
+Intro
+-----
+
+This module contains an inverted file (IVF) approximate similarity index over dense vectors.
+
+The indexed vectors are clustered with k-means into `num_cells` cells, and every cell keeps a posting list
+of the rows assigned to it. A query is compared with the cell centroids first, and then only with the rows
+of the `nprobe` closest cells, instead of the whole index.
+
+* :class:`~gensim.similarities.ivf.IvfSimilarity` is a drop-in replacement for
+  :class:`~gensim.similarities.docsim.MatrixSimilarity`, e.g. over LSI or Doc2Vec document vectors.
+* :class:`~gensim.similarities.ivf.IvfIndexer` can be passed as the `indexer` parameter of the `most_similar`
+  method of :class:`~gensim.models.word2vec.Word2Vec`, :class:`~gensim.models.doc2vec.Doc2Vec`,
+  :class:`~gensim.models.fasttext.FastText` and :class:`~gensim.models.keyedvectors.KeyedVectors`.
+
+Example usage
+-------------
+
+.. sourcecode:: pycon
+
+    >>> from gensim.test.utils import common_corpus, common_dictionary
+    >>> from gensim.similarities.ivf import IvfSimilarity
+    >>>
+    >>> index = IvfSimilarity(common_corpus, num_features=len(common_dictionary), num_cells=3, nprobe=2)
+    >>> sims = index[common_corpus[0]]
+
+.. sourcecode:: pycon
+
+    >>> from gensim.models import Word2Vec
+    >>> from gensim.similarities.ivf import IvfIndexer
+    >>>
+    >>> sentences = [['cute', 'cat', 'say', 'meow'], ['cute', 'dog', 'say', 'woof']]
+    >>> model = Word2Vec(sentences, min_count=1, seed=1)
+    >>>
+    >>> indexer = IvfIndexer(model, num_cells=2, nprobe=1)
+    >>> neighbors = model.wv.most_similar("cat", topn=2, indexer=indexer)
+
+"""
+
+import logging
+
+import numpy
+from six.moves import range, zip
+
+from gensim import matutils, utils
+from gensim.similarities.docsim import MatrixSimilarity
+
+logger = logging.getLogger(__name__)
+
+
+class IvfSimilarity(MatrixSimilarity):
+    """Approximate cosine similarity against a corpus of documents, scanning only the cells closest to the query.
+
+    Compared to :class:`~gensim.similarities.docsim.MatrixSimilarity`, documents outside of the `nprobe` cells
+    closest to a query are not scored: they get similarity 0 in full results, and never appear in `num_best`
+    results.
+
+    Examples
+    --------
+    .. sourcecode:: pycon
+
+        >>> from gensim.test.utils import common_corpus, common_dictionary
+        >>> from gensim.similarities.ivf import IvfSimilarity
+        >>>
+        >>> query = [(1, 2), (5, 4)]
+        >>> index = IvfSimilarity(common_corpus, num_features=len(common_dictionary), num_cells=3, nprobe=2)
+        >>> sims = index[query]
+
+    """
+    def __init__(self, corpus, num_best=None, dtype=numpy.float32, num_features=None, chunksize=256,
+                 corpus_len=None, num_cells=None, nprobe=8, iterations=20, sample=65536, seed=1):
+        """
+
+        Parameters
+        ----------
+        corpus : {iterable of list of (int, number), numpy.ndarray}
+            Corpus in streamed Gensim bag-of-words format, or a 2D array of (already normalized) document vectors.
+        num_best : int, optional
+            If set, return only the `num_best` most similar documents, always leaving out documents with similarity = 0.
+            Otherwise, return a full vector with one float for every document in the index.
+        dtype : numpy.dtype, optional
+            Datatype to store the internal matrix in.
+        num_features : int
+            Size of the dictionary (number of features).
+        chunksize : int, optional
+            Size of query chunks. Used internally when the query is an entire corpus.
+        corpus_len : int, optional
+            Number of documents in `corpus`. If not specified, will scan the corpus to determine the matrix size.
+        num_cells : int, optional
+            Number of k-means cells. If not specified, the square root of the number of documents.
+        nprobe : int, optional
+            Number of cells scanned per query. Larger values improve recall, slower.
+        iterations : int, optional
+            Number of k-means iterations.
+        sample : int, optional
+            Number of documents sampled to train the k-means centroids.
+        seed : int, optional
+            Seed for the random generator used to sample documents and initialize centroids.
+
+        """
+        if isinstance(corpus, numpy.ndarray) and corpus.ndim == 2:
+            # fast path for dense vectors: skip iterating over the rows one by one
+            super(IvfSimilarity, self).__init__(
+                None, num_best=num_best, dtype=dtype, num_features=corpus.shape[1], chunksize=chunksize,
+                corpus_len=len(corpus)
+            )
+            self.index = numpy.asarray(corpus, dtype=dtype)
+        else:
+            super(IvfSimilarity, self).__init__(
+                corpus, num_best=num_best, dtype=dtype, num_features=num_features, chunksize=chunksize,
+                corpus_len=corpus_len
+            )
+        self.nprobe = nprobe
+        if corpus is not None:
+            self.train(num_cells=num_cells, iterations=iterations, sample=sample, seed=seed)
+
+    def train(self, num_cells=None, iterations=20, sample=65536, seed=1):
+        """Cluster the indexed documents into cells and rebuild the posting lists.
+
+        Parameters
+        ----------
+        num_cells : int, optional
+            Number of k-means cells. If not specified, the square root of the number of documents.
+        iterations : int, optional
+            Number of k-means iterations.
+        sample : int, optional
+            Number of documents sampled to train the k-means centroids.
+        seed : int, optional
+            Seed for the random generator used to sample documents and initialize centroids.
+
+        """
+        num_docs = len(self)
+        if not num_docs:
+            raise ValueError("cannot train an IVF index over an empty corpus")
+        if num_cells is None:
+            num_cells = int(numpy.sqrt(num_docs))
+        num_cells = max(1, min(num_cells, num_docs))
+
+        rand = numpy.random.RandomState(seed)
+        if num_docs > sample:
+            training = self.index[numpy.sort(rand.choice(num_docs, sample, replace=False))]
+        else:
+            training = self.index[:]
+        training = numpy.asarray(training, dtype=numpy.float32)
+        logger.info("training %i IVF cells on %i documents", num_cells, len(training))
+        self.centroids = matutils.kmeans(training, num_cells, iterations, rand)
+
+        assignment = numpy.empty(num_docs, dtype=numpy.int32)
+        blocksize = 65536
+        for start in range(0, num_docs, blocksize):
+            block = numpy.asarray(self.index[start:start + blocksize], dtype=numpy.float32)
+            assignment[start:start + len(block)] = matutils.nearest_centroids(block, self.centroids)
+
+        # posting lists in CSR layout: documents of cell `i` are `cell_docs[cell_offsets[i]:cell_offsets[i + 1]]`
+        self.cell_docs = numpy.argsort(assignment, kind='mergesort').astype(numpy.int64)
+        self.cell_offsets = numpy.zeros(num_cells + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(assignment, minlength=num_cells), out=self.cell_offsets[1:])
+        logger.info(
+            "IVF cells hold between %i and %i documents",
+            numpy.diff(self.cell_offsets).min(), numpy.diff(self.cell_offsets).max()
+        )
+
+    def _candidates(self, query):
+        """Get ids and similarities of the documents in the `nprobe` cells closest to a single dense `query`."""
+        query = numpy.asarray(query, dtype=numpy.float32)
+        dists = (self.centroids ** 2).sum(axis=1) - 2 * numpy.dot(self.centroids, query)
+        nprobe = min(self.nprobe, len(dists))
+        cells = numpy.argpartition(dists, nprobe - 1)[:nprobe] if nprobe < len(dists) else numpy.arange(nprobe)
+        docs = numpy.concatenate([
+            self.cell_docs[self.cell_offsets[cell]:self.cell_offsets[cell + 1]] for cell in cells
+        ])
+        docs.sort()  # read the index matrix in storage order
+        sims = numpy.dot(self.index[docs], query.astype(self.index.dtype))
+        return docs, sims
+
+    def get_similarities(self, query):
+        """Get similarity between `query` and this index.
+
+        Warnings
+        --------
+        Do not use this function directly, use the :class:`~gensim.similarities.ivf.IvfSimilarity.__getitem__`
+        instead.
+
+        Parameters
+        ----------
+        query : {list of (int, number), iterable of list of (int, number), :class:`scipy.sparse.csr_matrix`}
+            Document or collection of documents.
+
+        Return
+        ------
+        :class:`numpy.ndarray`
+            Similarity matrix, with 0 for the documents outside of the probed cells.
+
+        """
+        queries, is_single = self._dense_query(query)
+        result = numpy.zeros((len(queries), len(self)), dtype=self.index.dtype)
+        for row, vector in zip(result, queries):
+            docs, sims = self._candidates(vector)
+            row[docs] = sims
+        return result[0] if is_single else result
+
+    def __getitem__(self, query):
+        """Get similarities of the given document or corpus against this index.
+
+        With `num_best` set, only the probed documents are ranked, without forming the full similarity vector.
+
+        Parameters
+        ----------
+        query : {list of (int, number), iterable of list of (int, number)}
+            Document in the sparse Gensim bag-of-words format, or a streamed corpus of such documents.
+
+        Returns
+        -------
+        {numpy.ndarray, list of (int, float)}
+            Similarities given document or corpus and objects corpus, depends on `query`.
+
+        """
+        if self.num_best is None:
+            return super(IvfSimilarity, self).__getitem__(query)
+
+        is_corpus, query = utils.is_corpus(query)
+        if self.normalize and not matutils.ismatrix(query):
+            # same query normalization as in :meth:`gensim.interfaces.SimilarityABC.__getitem__`
+            if is_corpus:
+                query = [matutils.unitvec(v) for v in query]
+            else:
+                query = matutils.unitvec(query)
+
+        queries, is_single = self._dense_query(query)
+        result = []
+        for vector in queries:
+            docs, sims = self._candidates(vector)
+            result.append([(int(docs[pos]), sim) for pos, sim in matutils.full2sparse_clipped(sims, self.num_best)])
+        return result[0] if is_single else result
+
+    def most_similar(self, vector, num_neighbors):
+        """Find the approximate `num_neighbors` most similar documents to a dense vector.
+
+        Parameters
+        ----------
+        vector : numpy.ndarray
+            Dense query vector, of `num_features` dimensions.
+        num_neighbors : int
+            Number of most similar documents to return.
+
+        Returns
+        -------
+        list of (int, float)
+            Positions of the most similar documents in the index and their similarities, by decreasing similarity.
+
+        """
+        docs, sims = self._candidates(matutils.unitvec(numpy.asarray(vector, dtype=numpy.float32)))
+        best = matutils.argsort(sims, topn=num_neighbors, reverse=True)
+        return [(int(docs[pos]), float(sims[pos])) for pos in best]
+
+    def __str__(self):
+        return "%s<%i docs, %i features, %i cells>" % (
+            self.__class__.__name__, len(self), self.index.shape[1], len(self.centroids)
+        )
+
+
+class IvfIndexer(utils.SaveLoad):
+    """IVF index over model vectors, for the `indexer` parameter of `most_similar`."""
+
+    def __init__(self, model=None, num_cells=None, nprobe=8, iterations=20, sample=65536, seed=1):
+        """
+
+        Parameters
+        ----------
+        model : {:class:`~gensim.models.word2vec.Word2Vec`, :class:`~gensim.models.doc2vec.Doc2Vec`, \
+        :class:`~gensim.models.fasttext.FastText`, :class:`~gensim.models.keyedvectors.KeyedVectors`}, optional
+            Model whose vectors will be indexed.
+        num_cells : int, optional
+            Number of k-means cells. If not specified, the square root of the number of vectors.
+        nprobe : int, optional
+            Number of cells scanned per query. Larger values improve recall, slower.
+        iterations : int, optional
+            Number of k-means iterations.
+        sample : int, optional
+            Number of vectors sampled to train the k-means centroids.
+        seed : int, optional
+            Seed for the random generator used to sample vectors and initialize centroids.
+
+        """
+        self.model = model
+        self.num_cells = num_cells
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.sample = sample
+        self.seed = seed
+        self.index = None
+        self.labels = None
+
+        if model is None:
+            return
+
+        from gensim.models.doc2vec import Doc2Vec
+        from gensim.models.word2vec import Word2Vec
+        from gensim.models.fasttext import FastText
+        from gensim.models.keyedvectors import KeyedVectors, WordEmbeddingsKeyedVectors
+
+        if isinstance(self.model, Doc2Vec):
+            self._build_from_doc2vec()
+        elif isinstance(self.model, (Word2Vec, FastText)):
+            self._build_from_word2vec()
+        elif isinstance(self.model, (WordEmbeddingsKeyedVectors, KeyedVectors)):
+            self._build_from_keyedvectors()
+        else:
+            raise ValueError("Only a Word2Vec, Doc2Vec, FastText or KeyedVectors instance can be used")
+
+    def save(self, fname, *args, **kwargs):
+        """Save the index, so that it can be loaded (and memory-mapped) with
+        :meth:`~gensim.similarities.ivf.IvfIndexer.load`.
+
+        Parameters
+        ----------
+        fname : str
+            Path to the output file.
+        *args
+            Arguments, see :meth:`~gensim.utils.SaveLoad.save`.
+        **kwargs
+            Keyword arguments, see :meth:`~gensim.utils.SaveLoad.save`.
+
+        Notes
+        -----
+        This method saves **only** the index (**the model isn't preserved**).
+
+        """
+        kwargs['ignore'] = kwargs.get('ignore', ['model'])
+        super(IvfIndexer, self).save(fname, *args, **kwargs)
+
+    def _build_from_word2vec(self):
+        """Build an IVF index using word vectors from a Word2Vec model."""
+        self._build_from_model(self.model.wv.get_normed_vectors(), self.model.wv.index2word)
+
+    def _build_from_doc2vec(self):
+        """Build an IVF index using document vectors from a Doc2Vec model."""
+        docvecs = self.model.docvecs
+        labels = [docvecs.index_to_doctag(i) for i in range(0, docvecs.count)]
+        self._build_from_model(docvecs.get_normed_vectors(), labels)
+
+    def _build_from_keyedvectors(self):
+        """Build an IVF index using word vectors from a KeyedVectors model."""
+        self._build_from_model(self.model.get_normed_vectors(), self.model.index2word)
+
+    def _build_from_model(self, vectors, labels):
+        self.index = IvfSimilarity(
+            vectors, num_cells=self.num_cells, nprobe=self.nprobe,
+            iterations=self.iterations, sample=self.sample, seed=self.seed
+        )
+        self.labels = labels
+
+    def most_similar(self, vector, num_neighbors):
+        """Find the approximate `num_neighbors` most similar items.
+
+        Parameters
+        ----------
+        vector : numpy.array
+            Vector for word/document.
+        num_neighbors : int
+            Number of most similar items
+
+        Returns
+        -------
+        list of (str, float)
+            List of most similar items in format [(`item`, `cosine_similarity`), ... ]
+
+        """
+        return [(self.labels[doc], sim) for doc, sim in self.index.most_similar(vector, num_neighbors)]
@@ -8,14 +8,29 @@
 This module provides a namespace for functions that use the Levenshtein distance.
 """
 
-import itertools
+from collections import Counter, defaultdict
+import heapq
 import logging
 from math import floor
+from multiprocessing.pool import ThreadPool
+import sys
+
+import numpy as np
 
 from gensim.similarities.termsim import TermSimilarityIndex
 
 logger = logging.getLogger(__name__)
 
+try:
+    from gensim.similarities._levenshtein import levdist_batch, levdist_pair
+except ImportError:
+    levdist_batch = levdist_pair = None  # fall back to the python-Levenshtein package
+
+NGRAM_SIZE = 2  # length of the character n-grams in the candidate index of LevenshteinSimilarityIndex
+BOUND_SLACK = 1e-9  # relative slack of the similarity upper bounds against rounding errors
+MIN_SCORED_CHUNK = 64  # the smallest number of candidates scored by a single call of levdist_batch
+UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'  # encoding of code points as numpy.uint32
+
 
 def levdist(t1, t2, max_distance=float("inf")):
     """Get the Levenshtein distance between two terms.
@@ -42,7 +57,16 @@ def levdist(t1, t2, max_distance=float("inf")):
     int
         The Levenshtein distance between `t1` and `t2`.
 
+    Notes
+    -----
+    The distance is computed by a compiled kernel of gensim, which releases the GIL. Without the
+    compiled kernel, the `python-Levenshtein` package is used.
+
     """
+    if levdist_pair is not None:
+        max_lengths = max(len(t1), len(t2))
+        return levdist_pair(t1, t2, int(floor(min(max(max_distance, -1), max_lengths))))
+
     import Levenshtein
 
     distance = Levenshtein.distance(t1, t2)
@@ -97,10 +121,43 @@ def levsim(t1, t2, alpha=1.8, beta=5.0, min_similarity=0.0):
     min_similarity = float(max(min(min_similarity, 1.0), 0.0))
     max_distance = int(floor(max_lengths * (1 - (min_similarity / alpha) ** (1 / beta))))
     distance = levdist(t1, t2, max_distance)
+    return _levsim_from_distance(distance, max_lengths, alpha, beta)
+
+
+def _levsim_from_distance(distance, max_lengths, alpha, beta):
+    """Get the Levenshtein similarity of two terms with a known distance, see :func:`levsim`."""
     similarity = alpha * (1 - distance * 1.0 / max_lengths)**beta
     return similarity
 
 
+def _code_points(term):
+    """Get the code points of a term (or the bytes of a bytestring) as a numpy.uint32 array."""
+    if isinstance(term, bytes):
+        return np.frombuffer(term, dtype=np.uint8).astype(np.uint32)
+    return np.frombuffer(term.encode(UTF32, 'surrogatepass'), dtype=np.uint32)
+
+
+def _padded_ngrams(term, n=NGRAM_SIZE):
+    """Get the multiset of the character n-grams of a term padded with n - 1 sentinels on each side.
+
+    Parameters
+    ----------
+    term : {bytes, str, unicode}
+        The term.
+    n : int, optional
+        The length of the n-grams.
+
+    Returns
+    -------
+    :class:`collections.Counter`
+        The `len(term) + n - 1` n-grams of `term` as tuples, along with their counts.
+
+    """
+    padding = (None, ) * (n - 1)
+    characters = padding + tuple(term) + padding
+    return Counter(characters[i:i + n] for i in range(len(term) + n - 1))
+
+
 class LevenshteinSimilarityIndex(TermSimilarityIndex):
     """
     Computes Levenshtein similarities between terms and retrieves most similar
@@ -108,9 +165,22 @@ class LevenshteinSimilarityIndex(TermSimilarityIndex):
 
     Notes
     -----
-    This is a naive implementation that iteratively computes pointwise Levenshtein similarities
-    between individual terms. Using this implementation to compute the similarity of all terms in
-    real-world dictionaries such as the English Wikipedia will take years.
+    The terms of the dictionary are indexed once at construction time, in an inverted index from
+    padded character n-grams to the terms that contain them. When retrieving the most similar terms,
+    the numbers of n-grams shared with the query give a lower bound on the Levenshtein distance of
+    every term [ukkonen92]_, which is combined with the difference of the lengths of the terms. Terms
+    that cannot be more similar than `threshold` are never scored, and the remaining terms are scored
+    in a decreasing order of their upper bounds on the similarity, until no unscored term can enter
+    the `topn` most similar terms. The results are the same as those of scoring every term.
+
+    The candidates are scored in chunks by a compiled Levenshtein distance kernel that releases the
+    GIL, so that :meth:`most_similar_batch` can retrieve the most similar terms of many terms in
+    parallel threads.
+
+    Changes to `dictionary` after the construction of the index are not reflected by the index.
+
+    .. [ukkonen92] Esko Ukkonen, "Approximate string-matching with q-grams and maximal matches", 1992,
+       https://doi.org/10.1016/0304-3975(92)90143-4.
 
     Parameters
     ----------
@@ -123,6 +193,8 @@ class LevenshteinSimilarityIndex(TermSimilarityIndex):
     threshold : float, optional
         Only terms more similar than `threshold` are considered when retrieving
         the most similar terms for a given term.
+    workers : int, optional
+        Number of threads used by :meth:`most_similar_batch`.
 
     See Also
     --------
@@ -132,22 +204,131 @@ class LevenshteinSimilarityIndex(TermSimilarityIndex):
         Build a term similarity matrix and compute the Soft Cosine Measure.
 
     """
-    def __init__(self, dictionary, alpha=1.8, beta=5.0, threshold=0.0):
+    def __init__(self, dictionary, alpha=1.8, beta=5.0, threshold=0.0, workers=1):
         self.dictionary = dictionary
         self.alpha = alpha
         self.beta = beta
         self.threshold = threshold
+        self.workers = workers
+        self._build_index()
         super(LevenshteinSimilarityIndex, self).__init__()
 
+    @classmethod
+    def load(cls, *args, **kwargs):
+        """Load a previously saved index, building the candidate index if it was saved without one."""
+        index = super(LevenshteinSimilarityIndex, cls).load(*args, **kwargs)
+        if not hasattr(index, 'term_chars'):
+            index._build_index()
+        if not hasattr(index, 'workers'):
+            index.workers = 1
+        return index
+
+    def _build_index(self):
+        """Build the inverted index from the padded character n-grams to the terms of the dictionary."""
+        self.terms = list(self.dictionary.values())
+        self.term_lengths = np.array([len(term) for term in self.terms], dtype=np.int64)
+        self.term_indptr = np.concatenate([[0], np.cumsum(self.term_lengths)]).astype(np.int64)
+        self.term_chars = np.concatenate(
+            [np.zeros(0, dtype=np.uint32)] + [_code_points(term) for term in self.terms])
+        postings = defaultdict(lambda: ([], []))
+        for term_number, term in enumerate(self.terms):
+            for ngram, count in _padded_ngrams(term).items():
+                term_numbers, counts = postings[ngram]
+                term_numbers.append(term_number)
+                counts.append(count)
+        self.postings = {
+            ngram: (np.array(term_numbers, dtype=np.int64), np.array(counts, dtype=np.int64))
+            for ngram, (term_numbers, counts) in postings.items()
+        }
+        logger.info(
+            "built a character %d-gram index of %d terms with %d distinct n-grams",
+            NGRAM_SIZE, len(self.terms), len(self.postings))
+
+    def _candidates(self, t1):
+        """Get the terms that may be more similar to `t1` than the threshold, and upper bounds on their similarity.
+
+        Parameters
+        ----------
+        t1 : {bytes, str, unicode}
+            The query term.
+
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            Positions of the candidate terms in `self.terms`, upper bounds on their Levenshtein
+            similarities to `t1`, and the largest distances from `t1` that do not fall below
+            the threshold, ordered by decreasing upper bound.
+
+        """
+        term_numbers, counts = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+        for ngram, query_count in _padded_ngrams(t1).items():
+            if ngram in self.postings:
+                ngram_term_numbers, ngram_counts = self.postings[ngram]
+                term_numbers.append(ngram_term_numbers)
+                counts.append(np.minimum(ngram_counts, query_count))
+        shared_ngrams = np.bincount(
+            np.concatenate(term_numbers), weights=np.concatenate(counts), minlength=len(self.terms))
+
+        max_lengths = np.maximum(self.term_lengths, len(t1))
+        # every edit operation destroys at most NGRAM_SIZE padded n-grams
+        min_distances = np.maximum(
+            np.abs(self.term_lengths - len(t1)),
+            np.ceil((max_lengths + NGRAM_SIZE - 1 - shared_ngrams) / NGRAM_SIZE))
+
+        # the same distance cutoff as in levsim, and a distance equal to max_lengths means zero similarity
+        min_similarity = float(max(min(self.threshold, 1.0), 0.0))
+        max_distances = np.floor(max_lengths * (1 - (min_similarity / self.alpha) ** (1 / self.beta)))
+        candidates = np.flatnonzero((min_distances <= max_distances) & (min_distances < max_lengths))
+
+        upper_bounds = self.alpha * (1 - min_distances[candidates] / max_lengths[candidates])**self.beta
+        order = np.argsort(-upper_bounds, kind='mergesort')
+        candidates = candidates[order]
+        return candidates, upper_bounds[order], max_distances[candidates].astype(np.int64)
+
+    def _distances(self, t1, query, candidates, max_distances):
+        """Get the Levenshtein distances between `t1` and the candidate terms, see :func:`levdist`."""
+        if levdist_batch is None:
+            return [
+                levdist(t1, self.terms[term_number], max_distance)
+                for term_number, max_distance in zip(candidates, max_distances)]
+        return levdist_batch(query, self.term_chars, self.term_indptr, candidates, max_distances)
+
     def most_similar(self, t1, topn=10):
-        similarities = (
-            (levsim(t1, t2, self.alpha, self.beta, self.threshold), t2)
-            for t2 in self.dictionary.values()
-            if t1 != t2
-        )
-        most_similar = (
-            (t2, similarity)
-            for (similarity, t2) in sorted(similarities, reverse=True)
-            if similarity > 0
-        )
-        return itertools.islice(most_similar, int(topn))
+        topn = int(topn)
+        if topn <= 0:
+            return iter([])
+
+        candidates, upper_bounds, max_distances = self._candidates(t1)
+        query = _code_points(t1)
+        most_similar = []  # a heap of the topn most similar terms seen so far
+        chunk_start, chunk_size = 0, max(MIN_SCORED_CHUNK, 2 * topn)
+        while chunk_start < len(candidates):
+            if len(most_similar) == topn and upper_bounds[chunk_start] * (1 + BOUND_SLACK) < most_similar[0][0]:
+                break  # no remaining term can enter the topn most similar terms
+            chunk = slice(chunk_start, chunk_start + chunk_size)
+            distances = self._distances(t1, query, candidates[chunk], max_distances[chunk])
+            for term_number, upper_bound, distance in zip(candidates[chunk], upper_bounds[chunk], distances):
+                if len(most_similar) == topn and upper_bound * (1 + BOUND_SLACK) < most_similar[0][0]:
+                    break
+                t2 = self.terms[term_number]
+                if t1 == t2:
+                    continue
+                similarity = _levsim_from_distance(int(distance), max(len(t1), len(t2)), self.alpha, self.beta)
+                if similarity > 0:
+                    if len(most_similar) < topn:
+                        heapq.heappush(most_similar, (similarity, t2))
+                    else:
+                        heapq.heappushpop(most_similar, (similarity, t2))
+            chunk_start += chunk_size
+            chunk_size *= 2  # score more candidates at once when the upper bounds prune little
+
+        return iter([(t2, similarity) for (similarity, t2) in sorted(most_similar, reverse=True)])
+
+    def most_similar_batch(self, terms, topn=10):
+        if self.workers <= 1:
+            return super(LevenshteinSimilarityIndex, self).most_similar_batch(terms, topn=topn)
+        pool = ThreadPool(self.workers)
+        try:
+            return pool.map(lambda t1: list(self.most_similar(t1, topn=topn)), terms)
+        finally:
+            pool.terminate()
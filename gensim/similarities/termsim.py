@@ -11,6 +11,7 @@ This module provides classes that deal with term similarities.
 from itertools import chain
 import logging
 from math import sqrt
+import multiprocessing
 
 import numpy as np
 from scipy import sparse
@@ -52,6 +53,28 @@ class TermSimilarityIndex(SaveLoad):
         """
         raise NotImplementedError
 
+    def most_similar_batch(self, terms, topn=10):
+        """Get most similar terms for many terms at once.
+
+        The default implementation calls :meth:`most_similar` once per term. Subclasses that can
+        retrieve the neighbours of many terms at once more cheaply should override it.
+
+        Parameters
+        ----------
+        terms : list of str
+            The terms for which we are retrieving `topn` most similar terms.
+        topn : int, optional
+            The maximum number of most similar terms that will be retrieved for each term.
+
+        Returns
+        -------
+        list of list of (str, float)
+            For every term in `terms`, the same most similar terms along with their similarities
+            that :meth:`most_similar` would return.
+
+        """
+        return [list(self.most_similar(term, topn=topn)) for term in terms]
+
 
 class UniformTermSimilarityIndex(TermSimilarityIndex):
     """
@@ -113,15 +136,27 @@ def _shortest_uint_dtype(max_value):
     return np.uint64
 
 
+def _init_most_similar_worker(index):
+    global _worker_index
+    _worker_index = index
+
+
+def _most_similar_batch_worker(args):
+    """Retrieve the neighbour lists of a chunk of columns using the index of the worker process."""
+    columns, skipped, terms, topn = args
+    return columns, skipped, _worker_index.most_similar_batch(terms, topn=topn) if terms else []
+
+
 class SparseTermSimilarityMatrix(SaveLoad):
     """
     Builds a sparse term similarity matrix using a term similarity index.
 
     Notes
     -----
-    Building a DOK matrix, and converting it to a CSC matrix carries a significant memory overhead.
-    Future work should switch to building arrays of rows, columns, and non-zero elements and
-    directly passing these arrays to the CSC matrix constructor without copying.
+    The neighbours of the terms are retrieved in chunks of columns through
+    :meth:`~gensim.similarities.termsim.TermSimilarityIndex.most_similar_batch`, optionally in several
+    worker processes. The non-zero elements are collected as (row, column, value) triplets in
+    preallocated arrays, which are directly passed to the CSC matrix constructor.
 
     Examples
     --------
@@ -173,6 +208,11 @@ class SparseTermSimilarityMatrix(SaveLoad):
         sparse term similarity matrix. If None, then no limit will be imposed.
     dtype : numpy.dtype, optional
         Data-type of the sparse term similarity matrix.
+    chunksize : int, optional
+        Number of columns whose most similar terms are retrieved from `source` at once.
+    workers : int, optional
+        Number of worker processes that retrieve the most similar terms from `source`. Each worker
+        receives a copy of `source`. The constraints on the matrix are enforced in the main process.
 
     Attributes
     ----------
@@ -182,7 +222,7 @@ class SparseTermSimilarityMatrix(SaveLoad):
     PROGRESS_MESSAGE_PERIOD = 1000  # how many columns are processed between progress messages
 
     def __init__(self, source, dictionary=None, tfidf=None, symmetric=True, positive_definite=False, nonzero_limit=100,
-                 dtype=np.float32):
+                 dtype=np.float32, chunksize=1024, workers=1):
         if sparse.issparse(source):
             self.matrix = source.tocsc()  # encapsulate the passed sparse matrix
             return
@@ -200,6 +240,7 @@ class SparseTermSimilarityMatrix(SaveLoad):
         if tfidf is None:
             logger.info("iterating over columns in dictionary order")
             columns = sorted(dictionary.keys())
+            idfs = None
         else:
             assert max(tfidf.idfs) == matrix_order - 1
             logger.info("iterating over columns in tf-idf order")
@@ -208,63 +249,146 @@ class SparseTermSimilarityMatrix(SaveLoad):
                 in sorted(
                     tfidf.idfs.items(),
                     key=lambda x: (lambda term_index, term_idf: (term_idf, -term_index))(*x), reverse=True)]
+            idfs = np.zeros(matrix_order)
+            idfs[list(tfidf.idfs.keys())] = list(tfidf.idfs.values())
 
-        column_nonzero = np.array([0] * matrix_order, dtype=_shortest_uint_dtype(nonzero_limit))
+        column_nonzero = np.zeros(matrix_order, dtype=_shortest_uint_dtype(nonzero_limit))
         column_sum = np.zeros(matrix_order, dtype=dtype)
-        matrix = sparse.identity(matrix_order, dtype=dtype, format="dok")
-
-        for column_number, t1_index in enumerate(columns):
-            if column_number % self.PROGRESS_MESSAGE_PERIOD == 0:
-                logger.info(
-                    "PROGRESS: at %.02f%% columns (%d / %d, %.06f%% density, "
-                    "%.06f%% projected density)",
-                    100.0 * (column_number + 1) / matrix_order, column_number + 1, matrix_order,
-                    100.0 * matrix.getnnz() / matrix_order**2,
-                    100.0 * np.clip(
-                        (1.0 * (matrix.getnnz() - matrix_order) / matrix_order**2)
-                        * (1.0 * matrix_order / (column_number + 1))
-                        + (1.0 / matrix_order),  # add density correspoding to the main diagonal
-                        0.0, 1.0))
-
-            t1 = dictionary[t1_index]
-            num_nonzero = column_nonzero[t1_index]
-            num_rows = nonzero_limit - num_nonzero
-            most_similar = [
-                (dictionary.token2id[term], similarity)
-                for term, similarity in index.most_similar(t1, topn=num_rows)
-                if term in dictionary.token2id
-            ] if num_rows > 0 else []
-
-            if tfidf is None:
-                rows = sorted(most_similar)
-            else:
-                rows = sorted(
-                    most_similar,
-                    key=lambda x: (lambda term_index, _: (tfidf.idfs[term_index], -term_index))(*x), reverse=True)
-
-            for row_number, (t2_index, similarity) in zip(range(num_rows), rows):
-                if positive_definite and column_sum[t1_index] + abs(similarity) >= 1.0:
-                    break
-                if symmetric:
-                    if column_nonzero[t2_index] < nonzero_limit \
-                            and (not positive_definite or column_sum[t2_index] + abs(similarity) < 1.0) \
-                            and not (t1_index, t2_index) in matrix:
-                        matrix[t1_index, t2_index] = similarity
-                        column_nonzero[t1_index] += 1
-                        column_sum[t1_index] += abs(similarity)
-                        matrix[t2_index, t1_index] = similarity
-                        column_nonzero[t2_index] += 1
-                        column_sum[t2_index] += abs(similarity)
-                else:
-                    matrix[t1_index, t2_index] = similarity
-                    column_sum[t1_index] += abs(similarity)
+        processed = np.zeros(matrix_order, dtype=bool)
+        linked = {}  # rows already set in the columns that have not been processed yet
+
+        # no column holds more than nonzero_limit elements outside the diagonal; preallocate for up to
+        # 100 elements per column (the default limit) and grow the arrays if more are needed
+        index_dtype = np.int32 if matrix_order < 2**31 else np.int64
+        capacity = matrix_order * (min(nonzero_limit, 100) + 1)
+        rows = np.empty(capacity, dtype=index_dtype)
+        cols = np.empty(capacity, dtype=index_dtype)
+        data = np.empty(capacity, dtype=dtype)
+        size = 0
+
+        def tasks():
+            for chunk_start in range(0, len(columns), chunksize):
+                chunk, skipped = [], []  # columns that still have free rows, and columns that are already full
+                for t1_index in columns[chunk_start:chunk_start + chunksize]:
+                    (chunk if column_nonzero[t1_index] < nonzero_limit else skipped).append(t1_index)
+                topn = nonzero_limit - int(column_nonzero[chunk].min()) if chunk else 0
+                yield chunk, skipped, [dictionary[t1_index] for t1_index in chunk], topn
+
+        pool = None
+        if workers > 1:
+            pool = multiprocessing.Pool(workers, initializer=_init_most_similar_worker, initargs=(index,))
+            results = pool.imap(_most_similar_batch_worker, tasks())
+        else:
+            results = (
+                (chunk, skipped, index.most_similar_batch(terms, topn=topn) if terms else [])
+                for chunk, skipped, terms, topn in tasks())
+
+        column_number = 0
+        try:
+            for chunk, skipped, neighbours in results:
+                # full columns get no neighbours, but are processed like the others
+                for t1_index, most_similar in chain(((t1_index, []) for t1_index in skipped), zip(chunk, neighbours)):
+                    if column_number % self.PROGRESS_MESSAGE_PERIOD == 0:
+                        nnz = size + matrix_order
+                        logger.info(
+                            "PROGRESS: at %.02f%% columns (%d / %d, %.06f%% density, "
+                            "%.06f%% projected density)",
+                            100.0 * (column_number + 1) / matrix_order, column_number + 1, matrix_order,
+                            100.0 * nnz / matrix_order**2,
+                            100.0 * np.clip(
+                                (1.0 * (nnz - matrix_order) / matrix_order**2)
+                                * (1.0 * matrix_order / (column_number + 1))
+                                + (1.0 / matrix_order),  # add density correspoding to the main diagonal
+                                0.0, 1.0))
+                    column_number += 1
+                    processed[t1_index] = True
+
+                    # the neighbours were retrieved ahead, possibly for more rows than are still free
+                    num_rows = nonzero_limit - int(column_nonzero[t1_index])
+                    most_similar = [
+                        (dictionary.token2id[term], similarity)
+                        for term, similarity in most_similar[:max(num_rows, 0)]
+                        if term in dictionary.token2id]
+                    existing = linked.pop(t1_index, None)
+                    if not most_similar:
+                        continue
+
+                    t2_indices = np.array([t2_index for t2_index, _ in most_similar], dtype=np.int64)
+                    similarities = np.array([similarity for _, similarity in most_similar], dtype=np.float64)
+                    if idfs is None:
+                        order = np.lexsort((similarities, t2_indices))
+                    else:
+                        order = np.lexsort((t2_indices, -idfs[t2_indices]))
+                    t2_indices, similarities = t2_indices[order], similarities[order]
+                    abs_similarities = np.abs(similarities)
+
+                    # only the first occurrence of a row may be set
+                    accepted = np.zeros(len(t2_indices), dtype=bool)
+                    accepted[np.unique(t2_indices, return_index=True)[1]] = True
+                    accepted &= t2_indices != t1_index
+                    if symmetric:
+                        accepted &= column_nonzero[t2_indices] < nonzero_limit
+                        if positive_definite:
+                            accepted &= column_sum[t2_indices] + abs_similarities < 1.0
+                        if existing:
+                            accepted &= ~np.in1d(t2_indices, existing)
+                        increments = np.where(accepted, abs_similarities, 0.0)
+                    else:
+                        increments = abs_similarities
+
+                    if positive_definite:
+                        # stop at the first row that would break the strict diagonal dominance of the column
+                        column_sums = column_sum[t1_index] + np.cumsum(increments) - increments
+                        exceeding = np.flatnonzero(column_sums + abs_similarities >= 1.0)
+                        if len(exceeding):
+                            accepted[exceeding[0]:] = False
+
+                    t2_indices, similarities = t2_indices[accepted], similarities[accepted]
+                    num_accepted = len(t2_indices) * (2 if symmetric else 1)
+                    if not num_accepted:
+                        continue
+
+                    if size + num_accepted > capacity:
+                        capacity = max(2 * capacity, size + num_accepted)
+                        rows = np.resize(rows, capacity)
+                        cols = np.resize(cols, capacity)
+                        data = np.resize(data, capacity)
+
+                    column_sum[t1_index] += abs_similarities[accepted].sum()
+                    rows[size:size + len(t2_indices)] = t2_indices
+                    cols[size:size + len(t2_indices)] = t1_index
+                    data[size:size + len(t2_indices)] = similarities
+                    size += len(t2_indices)
+                    if symmetric:
+                        column_nonzero[t1_index] += len(t2_indices)
+                        column_nonzero[t2_indices] += 1
+                        column_sum[t2_indices] += abs_similarities[accepted]
+                        rows[size:size + len(t2_indices)] = t1_index
+                        cols[size:size + len(t2_indices)] = t2_indices
+                        data[size:size + len(t2_indices)] = similarities
+                        size += len(t2_indices)
+                        for t2_index in t2_indices[~processed[t2_indices]].tolist():
+                            linked.setdefault(t2_index, []).append(t1_index)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        if size + matrix_order > capacity:
+            capacity = size + matrix_order
+            rows = np.resize(rows, capacity)
+            cols = np.resize(cols, capacity)
+            data = np.resize(data, capacity)
+        rows[size:size + matrix_order] = np.arange(matrix_order)
+        cols[size:size + matrix_order] = np.arange(matrix_order)
+        data[size:size + matrix_order] = 1.0
+        size += matrix_order
 
         logger.info(
             "constructed a sparse term similarity matrix with %0.06f%% density",
-            100.0 * matrix.getnnz() / matrix_order**2)
+            100.0 * size / matrix_order**2)
 
-        matrix = matrix.T
-        assert sparse.issparse(matrix)
+        matrix = sparse.csc_matrix(
+            (data[:size], (rows[:size], cols[:size])), shape=(matrix_order, matrix_order), dtype=dtype)
         self.__init__(matrix)
 
     def inner_product(self, X, Y, normalized=False):
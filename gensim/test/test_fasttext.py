@@ -23,6 +23,8 @@ import gensim.models._fasttext_bin
 
 
 import gensim.models.fasttext
+import gensim.models.keyedvectors
+import gensim.models.utils_any2vec
 
 try:
     from pyemd import emd  # noqa:F401
@@ -1201,6 +1203,42 @@ class HashTest(unittest.TestCase):
         self.assertTrue(np.allclose(expected[u'паровоз'], actual[u'паровоз'], atol=1e-5))
         self.assertTrue(np.allclose(expected[longword], actual[longword], atol=1e-5))
 
+    def test_word_vecs(self):
+        words = [u'landlady', u'steamtrain', u'паровоз', u'steamtrain', u'хозяйка']
+        expected = np.array([self.model.wv[w] for w in words])
+        self.model.wv.cache_size = 1
+        self.assertTrue(np.allclose(expected, self.model.wv.word_vecs(words), atol=1e-6))
+        self.assertEqual(list(self.model.wv.ngram_cache), [u'паровоз'])
+        self.assertTrue(np.allclose(expected, self.model.wv.word_vecs(words), atol=1e-6))
+
+    def test_prune_ngrams(self):
+        wv = self.model.wv
+        words = [u'landlady', u'steamtrain', u'паровоз', u'rechtsschutzversicherungsgesellschaften']
+        vectors_ngrams = wv.vectors_ngrams.copy()
+        norms = np.linalg.norm(vectors_ngrams, axis=1)
+        min_norm = np.median(norms)
+
+        num_kept = wv.prune_ngrams(min_norm=min_norm, dtype=np.float16)
+        self.assertEqual(num_kept, len(wv.vectors_ngrams))
+        self.assertTrue(0 < num_kept < wv.bucket)
+        self.assertEqual(wv.vectors_ngrams.dtype, np.float16)
+
+        # OOV vectors are averaged over the ngrams with kept buckets only
+        for word in words[1:]:
+            hashes = gensim.models.utils_any2vec.ft_ngram_hashes(word, wv.min_n, wv.max_n, wv.bucket)
+            kept = [h for h in hashes if wv.bucket_rows[h] >= 0]
+            self.assertTrue(all(norms[h] >= min_norm for h in kept))
+            expected = vectors_ngrams[kept].mean(axis=0)
+            self.assertTrue(np.allclose(expected, wv.word_vec(word), atol=1e-3))
+        self.assertTrue(np.allclose(wv[words], wv.word_vecs(words), atol=1e-6))
+
+        tmpf = get_tmpfile('gensim_fasttext_pruned.tst')
+        wv.save(tmpf)
+        loaded = gensim.models.keyedvectors.FastTextKeyedVectors.load(tmpf)
+        self.assertTrue(np.array_equal(wv.bucket_rows, loaded.bucket_rows))
+        self.assertTrue(np.allclose(wv[words], loaded[words]))
+        self.assertRaises(ValueError, gensim.models.fasttext.save_facebook_model, self.model, tmpf)
+
 
 class ZeroBucketTest(unittest.TestCase):
     def test_in_vocab(self):
@@ -40,6 +40,17 @@ class TestGlove2Word2Vec(unittest.TestCase):
                     'model file %s creation failed, check the parameters and input file format.' % self.output_file
                 )
 
+    def testConversionWorkers(self):
+        from gensim.scripts.glove2word2vec import glove2word2vec, get_glove_info
+
+        self.assertEqual(get_glove_info(self.datapath, workers=2), get_glove_info(self.datapath))
+        num_lines, num_dims = glove2word2vec(self.datapath, self.output_file, workers=2)
+        expected = gensim.models.KeyedVectors.load_word2vec_format(self.output_file)
+        test_model = gensim.models.KeyedVectors.load_word2vec_format(self.output_file, workers=2)
+        self.assertEqual((num_lines, num_dims), test_model.vectors.shape)
+        self.assertEqual(expected.index2word, test_model.index2word)
+        self.assertTrue(numpy.array_equal(expected.vectors, test_model.vectors))
+
 
 if __name__ == '__main__':
     logging.basicConfig(format='%(asctime)s : %(levelname)s : %(message)s', level=logging.DEBUG)
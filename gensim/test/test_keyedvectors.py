@@ -14,10 +14,11 @@ import unittest
 
 import numpy as np
 
+from gensim import matutils
 from gensim.corpora import Dictionary
 from gensim.models.keyedvectors import KeyedVectors as EuclideanKeyedVectors, WordEmbeddingSimilarityIndex, \
-    FastTextKeyedVectors
-from gensim.test.utils import datapath
+    FastTextKeyedVectors, QuantizedKeyedVectors, LazyKeyedVectors
+from gensim.test.utils import datapath, get_tmpfile
 
 import gensim.models.keyedvectors
 
@@ -69,6 +70,18 @@ class TestWordEmbeddingSimilarityIndex(unittest.TestCase):
         second_similarities = np.array([similarity for term, similarity in index.most_similar(u"holiday", topn=10)])
         self.assertTrue(np.allclose(first_similarities**2.0, second_similarities))
 
+    def test_most_similar_batch(self):
+        """Test most_similar_batch returns the same results as most_similar."""
+        terms = [u"holiday", u"out-of-dictionary term", u"government", u"holiday"]
+        for kwargs in ({}, {'threshold': 0.3, 'exponent': 1.0}, {'kwargs': {'restrict_vocab': 100}}):
+            index = WordEmbeddingSimilarityIndex(self.vectors, **kwargs)
+            batch_results = index.most_similar_batch(terms, topn=20)
+            self.assertEqual(len(terms), len(batch_results))
+            for term, batch_result in zip(terms, batch_results):
+                expected_result = list(index.most_similar(term, topn=20))
+                self.assertEqual([t for t, _ in expected_result], [t for t, _ in batch_result])
+                self.assertTrue(np.allclose([s for _, s in expected_result], [s for _, s in batch_result]))
+
 
 class TestEuclideanKeyedVectors(unittest.TestCase):
     def setUp(self):
@@ -159,6 +172,50 @@ class TestEuclideanKeyedVectors(unittest.TestCase):
         predicted = [result[0] for result in self.vectors.most_similar([input_vector], topn=5)]
         self.assertEqual(expected, predicted)
 
+    def test_most_similar_blocked(self):
+        """Test most_similar with a blocked scan returns the same results as the full scan."""
+        expected = self.vectors.most_similar('war', topn=10)
+        for blocksize, workers in ((1, 1), (7, 1), (50, 3), (len(self.vectors.vocab) + 1, 2)):
+            predicted = self.vectors.most_similar('war', topn=10, blocksize=blocksize, workers=workers)
+            self.assertEqual([word for word, _ in expected], [word for word, _ in predicted])
+            self.assertTrue(np.allclose([sim for _, sim in expected], [sim for _, sim in predicted]))
+
+        expected = self.vectors.similar_by_vector(self.vectors['war'], topn=5, restrict_vocab=20)
+        predicted = self.vectors.similar_by_vector(self.vectors['war'], topn=5, restrict_vocab=20, blocksize=6)
+        self.assertEqual(expected, predicted)
+
+    def test_most_similar_batch(self):
+        """Test most_similar_batch returns the same results as repeated most_similar calls."""
+        positive = ['war', 'holiday', ['war', 'conflict'], self.vectors['israel']]
+        negative = [[], 'call', [], []]
+        ids, sims = self.vectors.most_similar_batch(positive, negative, topn=7, chunksize=3)
+        self.assertEqual(ids.shape, (4, 7))
+        self.assertEqual(sims.shape, (4, 7))
+        for row, (pos, neg) in enumerate(zip(positive, negative)):
+            pos = pos if isinstance(pos, list) else [pos]
+            neg = neg if isinstance(neg, list) else [neg]
+            expected = self.vectors.most_similar(positive=pos, negative=neg, topn=7)
+            self.assertEqual([word for word, _ in expected], [self.vectors.index2word[i] for i in ids[row]])
+            self.assertTrue(np.allclose([sim for _, sim in expected], sims[row], atol=1e-6))
+
+    def test_most_similar_batch_restrict_vocab(self):
+        """Test most_similar_batch handles restrict_vocab and excludes input words."""
+        ids, sims = self.vectors.most_similar_batch(['war', self.vectors.index2word[0]], topn=5, restrict_vocab=6)
+        self.assertTrue((ids < 6).all())
+        self.assertEqual(set(ids[1]), set(range(1, 6)))
+        expected = [word for word, _ in self.vectors.most_similar('war', topn=5, restrict_vocab=6)]
+        self.assertEqual(expected, [self.vectors.index2word[i] for i in ids[0]])
+
+        # asking for more words than are left after leaving out the input words
+        ids, sims = self.vectors.most_similar_batch(['war', self.vectors.index2word[0]], topn=7, restrict_vocab=6)
+        self.assertEqual(ids.shape, (2, 6))
+        expected = [word for word, _ in self.vectors.most_similar('war', topn=6, restrict_vocab=6)]
+        self.assertEqual(expected, [self.vectors.index2word[i] for i in ids[0]])
+        self.assertTrue(np.isfinite(sims[0]).all())
+        # the second query leaves out one of the 6 words, its last column is padding
+        self.assertEqual(set(ids[1, :5]), set(range(1, 6)))
+        self.assertEqual((ids[1, 5], sims[1, 5]), (-1, -np.inf))
+
     def test_most_similar_to_given(self):
         """Test most_similar_to_given returns correct results."""
         predicted = self.vectors.most_similar_to_given('war', ['terrorism', 'call', 'waging'])
@@ -300,6 +357,311 @@ class TestEuclideanKeyedVectors(unittest.TestCase):
         self.assertEqual(actual, expected)
 
 
+class TestHalfPrecisionKeyedVectors(unittest.TestCase):
+    def setUp(self):
+        self.vectors = EuclideanKeyedVectors.load_word2vec_format(datapath('euclidean_vectors.bin'), binary=True)
+        self.half = EuclideanKeyedVectors.load_word2vec_format(
+            datapath('euclidean_vectors.bin'), binary=True, datatype=np.float16)
+
+    def test_similarity(self):
+        """Test float16 vectors stay float16 and give the same similarities as float32 vectors."""
+        self.half.init_sims()
+        self.assertEqual(self.half.vectors.dtype, np.float16)
+        self.assertEqual(self.half.vectors_norm.dtype, np.float16)
+        self.assertTrue(np.allclose(
+            self.vectors.similarity('war', 'conflict'), self.half.similarity('war', 'conflict'), atol=1e-3))
+
+        expected = self.vectors.most_similar('war', topn=5)
+        predicted = self.half.most_similar('war', topn=5)
+        self.assertEqual([word for word, _ in expected], [word for word, _ in predicted])
+        self.assertTrue(np.allclose([sim for _, sim in expected], [sim for _, sim in predicted], atol=1e-3))
+        self.assertEqual(self.half.most_similar('war', topn=None).dtype, np.float32)
+
+        ids, sims = self.half.most_similar_batch(['war'], topn=5)
+        self.assertEqual([word for word, _ in expected], [self.half.index2word[i] for i in ids[0]])
+
+    def test_persistence(self):
+        """Test float16 vectors round-trip through save/load with mmap and the word2vec format."""
+        fname = get_tmpfile('gensim_half.kv')
+        self.half.save(fname, sep_limit=0)
+        loaded = EuclideanKeyedVectors.load(fname, mmap='r')
+        self.assertEqual(loaded.vectors.dtype, np.float16)
+        self.assertEqual(self.half.most_similar('war'), loaded.most_similar('war'))
+
+        fname = get_tmpfile('gensim_half.bin')
+        self.half.save_word2vec_format(fname, binary=True)
+        loaded = EuclideanKeyedVectors.load_word2vec_format(fname, binary=True, datatype=np.float16)
+        self.assertTrue(np.array_equal(self.half.vectors, loaded.vectors))
+
+    def test_doc2vec(self):
+        """Test float16 document vectors."""
+        docvecs = gensim.models.keyedvectors.Doc2VecKeyedVectors(self.vectors.vector_size, mapfile_path=None)
+        docvecs.vectors_docs = self.half.vectors[:300]
+        docvecs.count = 300
+        docvecs.init_sims()
+        self.assertEqual(docvecs.vectors_docs_norm.dtype, np.float16)
+        expected = [word for word, _ in self.vectors.most_similar('war', topn=5, restrict_vocab=300)]
+        predicted = docvecs.most_similar(self.vectors.vocab['war'].index, topn=5)
+        self.assertEqual(expected, [self.vectors.index2word[doc] for doc, _ in predicted])
+
+        fname = get_tmpfile('gensim_half_docvecs.bin')
+        docvecs.save_word2vec_format(fname, binary=True)
+        loaded = EuclideanKeyedVectors.load_word2vec_format(fname, binary=True)
+        self.assertTrue(np.allclose(loaded['*dt_0'], docvecs[0]))
+
+
+class TestNormsOnlyKeyedVectors(unittest.TestCase):
+    def setUp(self):
+        self.vectors = EuclideanKeyedVectors.load_word2vec_format(datapath('euclidean_vectors.bin'), binary=True)
+        self.normed = EuclideanKeyedVectors.load_word2vec_format(datapath('euclidean_vectors.bin'), binary=True)
+        self.normed.init_sims(norms_only=True)
+
+    def test_similarity(self):
+        """Test similarities computed from the stored norms match the normalized matrix."""
+        self.assertIsNone(self.normed.vectors_norm)
+        self.assertEqual(self.normed.norms.shape, (len(self.normed.vocab),))
+
+        expected = self.vectors.most_similar('war', topn=10)
+        predicted = self.normed.most_similar('war', topn=10)
+        self.assertEqual([word for word, _ in expected], [word for word, _ in predicted])
+        self.assertTrue(np.allclose([sim for _, sim in expected], [sim for _, sim in predicted]))
+        self.assertIsNone(self.normed.vectors_norm)
+        predicted = self.normed.most_similar('war', topn=10, blocksize=100)
+        self.assertEqual([word for word, _ in expected], [word for word, _ in predicted])
+        self.assertTrue(np.allclose(
+            self.vectors.most_similar_cosmul(['war'], topn=None), self.normed.most_similar_cosmul(['war'], topn=None)))
+
+        ids, sims = self.normed.most_similar_batch(['war'], topn=10)
+        self.assertEqual([word for word, _ in expected], [self.normed.index2word[i] for i in ids[0]])
+        self.assertTrue(np.allclose(self.vectors.word_vec('war', use_norm=True), self.normed.word_vec('war', True)))
+        self.assertTrue(np.allclose(self.vectors.vectors_norm, self.normed.get_normed_vectors()))
+
+    def test_persistence(self):
+        """Test the norms are saved, and used after loading."""
+        fname = get_tmpfile('gensim_norms_only.kv')
+        self.normed.save(fname)
+        loaded = EuclideanKeyedVectors.load(fname)
+        self.assertTrue(np.array_equal(self.normed.norms, loaded.norms))
+        self.assertEqual(self.normed.most_similar('war'), loaded.most_similar('war'))
+        self.assertIsNone(loaded.vectors_norm)
+
+    def test_add(self):
+        """Test the stored norms follow added and replaced vectors."""
+        rand = np.random.RandomState(1)
+        weights = rand.uniform(-1, 1, (2, self.vectors.vector_size)).astype(np.float32)
+        for kv in (self.vectors, self.normed):
+            kv.add(['war', 'new_word'], weights, replace=True)
+            kv.vectors_norm = None
+        self.normed.init_sims()
+        self.assertEqual(self.normed.norms.shape, (len(self.normed.vocab),))
+        self.assertTrue(np.allclose(np.linalg.norm(self.normed.vectors, axis=1), self.normed.norms))
+        for word in ('war', 'new_word'):
+            expected = self.vectors.most_similar(word, topn=10)
+            predicted = self.normed.most_similar(word, topn=10)
+            self.assertEqual([w for w, _ in expected], [w for w, _ in predicted])
+            self.assertTrue(np.allclose([sim for _, sim in expected], [sim for _, sim in predicted]))
+
+    def test_doc2vec(self):
+        """Test document vectors with stored norms."""
+        docvecs = gensim.models.keyedvectors.Doc2VecKeyedVectors(self.vectors.vector_size, mapfile_path=None)
+        docvecs.vectors_docs = self.vectors.vectors[:300]
+        docvecs.count = 300
+        docvecs.init_sims(norms_only=True)
+        self.assertIsNone(docvecs.vectors_docs_norm)
+        expected = [word for word, _ in self.vectors.most_similar('war', topn=5, restrict_vocab=300)]
+        predicted = docvecs.most_similar(self.vectors.vocab['war'].index, topn=5)
+        self.assertEqual(expected, [self.vectors.index2word[doc] for doc, _ in predicted])
+
+
+class TestQuantizedKeyedVectors(unittest.TestCase):
+    def setUp(self):
+        self.vectors = EuclideanKeyedVectors.load_word2vec_format(datapath('euclidean_vectors.bin'), binary=True)
+
+    def assertCloseToOriginal(self, quantized, atol):
+        for word in ('war', 'holiday', 'israel'):
+            self.assertTrue(np.allclose(self.vectors[word], quantized[word], atol=atol))
+            self.assertTrue(np.allclose(
+                self.vectors.similarity(word, 'conflict'), quantized.similarity(word, 'conflict'), atol=atol))
+
+    def test_int8(self):
+        """Test int8 quantization stays close to the original vectors."""
+        quantized = QuantizedKeyedVectors.from_keyedvectors(self.vectors, method='int8')
+        self.assertEqual(quantized.codes.dtype, np.int8)
+        self.assertIsNone(quantized.vectors)
+        scale = np.abs(self.vectors.vectors).max()
+        self.assertCloseToOriginal(quantized, atol=scale / 100)
+
+        expected = [word for word, _ in self.vectors.most_similar('war', topn=10)]
+        predicted = [word for word, _ in quantized.most_similar('war', topn=10)]
+        self.assertGreaterEqual(len(set(expected[:5]) & set(predicted)), 4)
+        self.assertNotIn('war', predicted)
+
+    def test_pq(self):
+        """Test product quantization returns plausible neighbours."""
+        quantized = QuantizedKeyedVectors.from_keyedvectors(
+            self.vectors, method='pq', num_subvectors=5, num_centroids=64, iterations=10)
+        self.assertEqual(quantized.codes.shape, (len(self.vectors.vocab), 5))
+        self.assertEqual(quantized.codes.dtype, np.uint8)
+        self.assertEqual(len(quantized.most_similar('war', topn=7)), 7)
+        self.assertEqual(len(quantized.most_similar('war', topn=None)), len(self.vectors.vocab))
+        self.assertTrue(np.allclose(
+            np.linalg.norm(quantized['war']), np.linalg.norm(self.vectors['war']), rtol=0.2))
+
+        with self.assertRaises(ValueError):
+            QuantizedKeyedVectors.from_keyedvectors(self.vectors, method='pq', num_subvectors=3)
+
+    def test_rerank(self):
+        """Test exact re-ranking restores the exact most similar words."""
+        quantized = QuantizedKeyedVectors.from_keyedvectors(
+            self.vectors, method='pq', num_subvectors=5, num_centroids=64, keep_vectors=True)
+        expected = self.vectors.most_similar('war', topn=5)
+        predicted = quantized.most_similar('war', topn=5, rerank=200)
+        self.assertEqual([word for word, _ in expected], [word for word, _ in predicted])
+        self.assertTrue(np.allclose([sim for _, sim in expected], [sim for _, sim in predicted], atol=1e-5))
+
+        quantized = QuantizedKeyedVectors.from_keyedvectors(self.vectors, method='int8')
+        with self.assertRaises(ValueError):
+            quantized.most_similar('war', rerank=10)
+
+    def test_similar_by_word(self):
+        """Test the inherited query helpers work on quantized vectors."""
+        for method in ('int8', 'pq'):
+            quantized = QuantizedKeyedVectors.from_keyedvectors(self.vectors, method=method, num_subvectors=5)
+            expected = quantized.most_similar('war', topn=5)
+            self.assertEqual(quantized.similar_by_word('war', topn=5), expected)
+            self.assertEqual(quantized.similar_by_word('war', topn=5, blocksize=7, workers=2), expected)
+            self.assertEqual(
+                [word for word, _ in quantized.similar_by_vector(quantized['war'], topn=6)[1:]],
+                [word for word, _ in expected])
+            self.assertIsNone(quantized.norms)
+
+            ids, sims = quantized.most_similar_batch(['war', 'holiday'], topn=5)
+            self.assertEqual([quantized.index2word[index] for index in ids[0]], [word for word, _ in expected])
+            self.assertTrue(np.allclose(sims[0], [sim for _, sim in expected], atol=1e-6))
+
+    def test_vocabulary_scans(self):
+        """Test the methods that scan the whole vocabulary work on quantized vectors."""
+        for method in ('int8', 'pq'):
+            quantized = QuantizedKeyedVectors.from_keyedvectors(self.vectors, method=method, num_subvectors=5)
+            atol = 0.02 if method == 'int8' else 0.3
+
+            distances = quantized.distances('war')
+            self.assertEqual(distances.shape, (len(self.vectors.vocab),))
+            self.assertTrue(np.allclose(self.vectors.distances('war'), distances, atol=atol))
+            self.assertTrue(np.allclose(
+                self.vectors.distances('war', ['conflict', 'holiday']),
+                quantized.distances('war', ['conflict', 'holiday']), atol=atol))
+            self.assertTrue(np.allclose(distances, quantized.distances(self.vectors['war']), atol=atol))
+
+            closer = quantized.closer_than('war', 'conflict')
+            self.assertNotIn('war', closer)
+            self.assertEqual(len(closer) + 1, quantized.rank('war', 'conflict'))
+
+            normed = quantized.get_normed_vectors()
+            self.assertEqual(normed.shape, self.vectors.vectors.shape)
+            self.assertTrue(np.allclose(np.linalg.norm(normed, axis=1), 1.0, atol=1e-5 if method == 'int8' else 0.2))
+            self.assertTrue(np.allclose(normed[self.vectors.vocab['war'].index], quantized.word_vec('war', True)))
+
+            expected = [word for word, _ in self.vectors.most_similar_cosmul(['war', 'israel'], ['call'], topn=10)]
+            predicted = [word for word, _ in quantized.most_similar_cosmul(['war', 'israel'], ['call'], topn=10)]
+            self.assertGreaterEqual(len(set(expected) & set(predicted)), 3 if method == 'pq' else 7)
+            self.assertNotIn('war', predicted)
+            self.assertEqual(len(quantized.most_similar_cosmul('war', topn=None)), len(self.vectors.vocab))
+
+    def test_evaluate_word_pairs(self):
+        """Test word pair evaluation reads the vectors of quantized models through word_vec."""
+        expected = self.vectors.evaluate_word_pairs(datapath('wordsim353.tsv'))
+        quantized = QuantizedKeyedVectors.from_keyedvectors(self.vectors, method='int8')
+        pearson, spearman, oov_ratio = quantized.evaluate_word_pairs(datapath('wordsim353.tsv'))
+        self.assertAlmostEqual(expected[0][0], pearson[0], places=2)
+        self.assertAlmostEqual(expected[1][0], spearman[0], places=2)
+        self.assertEqual(expected[2], oov_ratio)
+
+    def test_evaluate_word_analogies(self):
+        """Test analogies are solved through the quantized similarity kernel."""
+        for method in ('int8', 'pq'):
+            quantized = QuantizedKeyedVectors.from_keyedvectors(self.vectors, method=method, num_subvectors=5)
+            for objective in ('3CosAdd', '3CosMul'):
+                expected = self.vectors.evaluate_word_analogies(datapath('questions-words.txt'), method=objective)
+                score, sections = quantized.evaluate_word_analogies(
+                    datapath('questions-words.txt'), method=objective)
+                self.assertAlmostEqual(expected[0], score, places=2)
+                self.assertEqual(
+                    sum(len(section['correct']) + len(section['incorrect']) for section in expected[1]),
+                    sum(len(section['correct']) + len(section['incorrect']) for section in sections))
+
+    def test_persistence(self):
+        """Test quantized vectors can be saved and loaded back with mmap."""
+        for method in ('int8', 'pq'):
+            quantized = QuantizedKeyedVectors.from_keyedvectors(self.vectors, method=method, num_subvectors=5)
+            fname = get_tmpfile('gensim_quantized.kv')
+            quantized.save(fname, sep_limit=0)
+            loaded = QuantizedKeyedVectors.load(fname, mmap='r')
+            self.assertIsInstance(loaded.codes, np.memmap)
+            self.assertTrue(np.allclose(quantized['war'], loaded['war']))
+            self.assertEqual(quantized.most_similar('war'), loaded.most_similar('war'))
+
+
+class TestLazyKeyedVectors(unittest.TestCase):
+    def setUp(self):
+        self.vectors = EuclideanKeyedVectors.load_word2vec_format(datapath('euclidean_vectors.bin'), binary=True)
+        self.text_file = get_tmpfile('lazy_vectors.txt')
+        self.vectors.save_word2vec_format(self.text_file, binary=False)
+
+    def assertLazy(self, lazy):
+        self.assertIsNone(lazy._vectors)
+        self.assertEqual(lazy.index2word, self.vectors.index2word)
+        for word in ('war', 'holiday', 'israel', 'war'):
+            self.assertTrue(np.allclose(self.vectors[word], lazy[word]))
+        self.assertTrue(np.allclose(matutils.unitvec(self.vectors['war']), lazy.word_vec('war', use_norm=True)))
+        self.assertAlmostEqual(self.vectors.similarity('war', 'conflict'), lazy.similarity('war', 'conflict'))
+        self.assertRaises(KeyError, lazy.word_vec, 'no_such_word')
+        self.assertIsNone(lazy._vectors)
+
+    def test_binary(self):
+        lazy = LazyKeyedVectors.load_word2vec_format(datapath('euclidean_vectors.bin'), binary=True)
+        self.assertLazy(lazy)
+
+    def test_text(self):
+        lazy = LazyKeyedVectors.load_word2vec_format(self.text_file, binary=False)
+        self.assertLazy(lazy)
+
+    def test_compressed(self):
+        for binary in (False, True):
+            fname = get_tmpfile('lazy_vectors.txt.gz')
+            self.vectors.save_word2vec_format(fname, binary=binary)
+            self.assertRaises(ValueError, LazyKeyedVectors.load_word2vec_format, fname, binary=binary)
+
+    def test_cache(self):
+        lazy = LazyKeyedVectors.load_word2vec_format(self.text_file, cache_size=2)
+        for word in ('war', 'holiday', 'war', 'israel'):
+            lazy.word_vec(word)
+        self.assertEqual(list(lazy.cache), ['war', 'israel'])
+
+        lazy = LazyKeyedVectors.load_word2vec_format(self.text_file, cache_size=0)
+        lazy.word_vec('war')
+        self.assertEqual(len(lazy.cache), 0)
+
+    def test_full_matrix(self):
+        lazy = LazyKeyedVectors.load_word2vec_format(datapath('euclidean_vectors.bin'), binary=True, limit=100)
+        self.assertIsNone(lazy._vectors)
+        self.assertEqual(
+            lazy.most_similar(self.vectors.index2word[0]),
+            self.vectors.most_similar(self.vectors.index2word[0], restrict_vocab=100)
+        )
+        self.assertTrue(np.array_equal(lazy.vectors, self.vectors.vectors[:100]))
+
+    def test_persistence(self):
+        lazy = LazyKeyedVectors.load_word2vec_format(self.text_file)
+        lazy.word_vec('war')
+        fname = get_tmpfile('lazy_vectors.kv')
+        lazy.save(fname)
+        loaded = LazyKeyedVectors.load(fname)
+        self.assertEqual(len(loaded.cache), 0)
+        self.assertTrue(np.array_equal(lazy.offsets, loaded.offsets))
+        self.assertLazy(loaded)
+
+
 class L2NormTest(unittest.TestCase):
     def test(self):
         m = np.array(range(1, 10), dtype=np.float32)
@@ -9,7 +9,10 @@ Automated tests for similarity algorithms (the similarities package).
 """
 
 
+import gc
+import glob
 import logging
+import threading
 import unittest
 import math
 import os
@@ -31,7 +34,8 @@ from gensim.similarities import UniformTermSimilarityIndex
 from gensim.similarities import SparseTermSimilarityMatrix
 from gensim.similarities import LevenshteinSimilarityIndex
 from gensim.similarities.docsim import _nlargest
-from gensim.similarities.levenshtein import levdist, levsim
+from gensim.similarities.allpairs import all_pairs
+from gensim.similarities.levenshtein import levdist, levdist_batch, levsim, _code_points
 
 try:
     from pyemd import emd  # noqa:F401
@@ -297,6 +301,56 @@ class TestMatrixSimilarity(unittest.TestCase, _TestSimilarityABC):
     def setUp(self):
         self.cls = similarities.MatrixSimilarity
 
+    def testQuantize(self):
+        """quantized index approximates the float index, re-ranking makes the num_best similarities exact"""
+        rng = numpy.random.RandomState(0)
+        documents = [list(enumerate(vector)) for vector in rng.randn(300, 20)]
+        queries = [list(enumerate(vector)) for vector in rng.randn(10, 20)]
+        expected = self.cls(documents, num_features=20)
+        for method, tolerance in [('int8', 0.02), ('float16', 0.002)]:
+            index = self.cls(documents, num_features=20, quantize=method)
+            self.assertTrue(numpy.allclose(expected[queries], index[queries], atol=tolerance))
+            self.assertTrue(numpy.allclose(expected[queries[0]], index[queries[0]], atol=tolerance))
+
+            expected.num_best = index.num_best = 5
+            index.rerank = 30
+            for expected_sims, sims in zip(expected[queries], index[queries]):
+                self.assertEqual([doc for doc, _ in expected_sims], [doc for doc, _ in sims])
+                self.assertTrue(numpy.allclose([sim for _, sim in expected_sims], [sim for _, sim in sims]))
+            self.assertEqual(expected[queries[0]], index[queries[0]])
+            index.rerank = None
+            self.assertEqual(5, len(index[queries[0]]))
+
+            fname = get_tmpfile('gensim_similarities.tst.pkl')
+            index.save(fname, sep_limit=0)
+            loaded = self.cls.load(fname, mmap='r')
+            self.assertEqual(index[queries], loaded[queries])
+            expected.num_best = None
+
+        self.assertRaises(ValueError, index.quantize, 'int4')
+
+    def testQuantizeOnDisk(self):
+        """the float index of a quantized index can be kept on disk, only the re-ranked rows are read from it"""
+        rng = numpy.random.RandomState(0)
+        documents = [list(enumerate(vector)) for vector in rng.randn(300, 20)]
+        queries = [list(enumerate(vector)) for vector in rng.randn(10, 20)]
+        expected = self.cls(documents, num_features=20, quantize='int8', num_best=5, rerank=30)
+        fname = get_tmpfile('gensim_similarities.tst.npy')
+        for index in [
+                self.cls(documents, num_features=20, quantize='int8', num_best=5, rerank=30, fname=fname),
+                self.cls(documents, num_features=20, num_best=5, rerank=30)]:
+            if index.codes is None:
+                index.quantize('int8', fname=fname)
+            self.assertIsInstance(index.index, numpy.memmap)
+            self.assertFalse(index.index.flags.writeable)
+            self.assertTrue(numpy.array_equal(expected.index, numpy.load(fname)))
+            self.assertTrue(numpy.array_equal(expected.codes, index.codes))
+            self.assertEqual(expected[queries], index[queries])
+            index.num_best = None
+            sims = numpy.asarray([sims for sims in index])  # iterating reads every document from the float index
+            self.assertTrue(numpy.allclose(numpy.dot(expected.index, expected.index.T), sims, atol=0.02))
+            del index
+
 
 class TestWmdSimilarity(unittest.TestCase, _TestSimilarityABC):
     def setUp(self):
@@ -370,6 +424,32 @@ class TestWmdSimilarity(unittest.TestCase, _TestSimilarityABC):
             self.assertTrue(numpy.alltrue(sims >= 0.0))
             self.assertTrue(numpy.alltrue(sims <= 1.0))
 
+    @unittest.skipIf(PYEMD_EXT is False, "pyemd not installed or have some issues")
+    def testWmdistance(self):
+        index = self.cls(texts, self.w2v_model)
+        for query in texts[:3] + [['trees', 'unknown'], ['unknown']]:
+            expected = [1. / (1. + self.w2v_model.wv.wmdistance(document, query)) for document in texts]
+            self.assertTrue(numpy.allclose(index[query], expected))
+
+    @unittest.skipIf(PYEMD_EXT is False, "pyemd not installed or have some issues")
+    def testPruned(self):
+        with utils.open(datapath('lee_background.cor'), 'rb') as fin:
+            corpus = [utils.simple_preprocess(line)[:40] for line in fin][:50]
+        model = Word2Vec(corpus, size=10, min_count=3, iter=1, seed=1)
+        index = self.cls(corpus, model)
+        queries = corpus[:2] + [['government', 'police', 'minister']]
+        exhaustive = index[queries]
+
+        index.num_best = 5
+        pruned = index[queries]
+        for sims, full in zip(pruned, exhaustive):
+            expected = matutils.full2sparse_clipped(full, 5)
+            self.assertEqual([docno for docno, _ in sims], [docno for docno, _ in expected])
+            self.assertTrue(numpy.allclose([sim for _, sim in sims], [sim for _, sim in expected]))
+
+        index.workers = 2
+        self.assertEqual(index[queries], pruned)
+
 
 class TestSoftCosineSimilarity(unittest.TestCase, _TestSimilarityABC):
     def setUp(self):
@@ -494,6 +574,105 @@ class TestSparseMatrixSimilarity(unittest.TestCase, _TestSimilarityABC):
         self.assertTrue(scipy.sparse.issparse(scipy_topn_sims))
         self.assertEqual(dense_topn_sims, [matutils.scipy2sparse(v) for v in scipy_topn_sims])
 
+    def testMaxscore(self):
+        """MaxScore pruning returns the same num_best similarities as scoring all documents"""
+        rng = numpy.random.RandomState(0)
+        documents = scipy.sparse.random(500, 50, density=0.1, format='csr', random_state=rng)
+        documents.data -= 0.3  # negative similarities are ranked by their magnitude as well
+        queries = scipy.sparse.random(20, 50, density=0.1, format='csr', random_state=rng)
+        index_corpus = matutils.Sparse2Corpus(documents, documents_columns=False)
+        query_corpus = list(matutils.Sparse2Corpus(queries, documents_columns=False))
+        for num_best in [0, 1, 10, 1000]:
+            expected = self.cls(index_corpus, num_features=50, num_best=num_best)
+            index = self.cls(index_corpus, num_features=50, num_best=num_best, maxscore=True)
+            for expected_sims, sims in zip(expected[query_corpus], index[query_corpus]):
+                self.assertEqual([sim for _, sim in expected_sims], [sim for _, sim in sims])
+                self.assertEqual(
+                    {doc for doc, sim in expected_sims if abs(sim) > abs(expected_sims[-1][1])},
+                    {doc for doc, sim in sims if abs(sim) > abs(sims[-1][1])})
+            self.assertEqual(expected[query_corpus[0]], index[query_corpus[0]])
+
+        fname = get_tmpfile('gensim_similarities.tst.pkl')
+        index.save(fname, sep_limit=0)
+        loaded = self.cls.load(fname, mmap='r')
+        self.assertEqual(index[query_corpus], loaded[query_corpus])
+
+
+class TestIvfSimilarity(unittest.TestCase, _TestSimilarityABC):
+    def setUp(self):
+        self.cls = similarities.IvfSimilarity
+
+    def testApproximate(self):
+        lee = KeyedVectors.load_word2vec_format(datapath('lee_fasttext.vec'))
+        lee.init_sims()
+        exact = similarities.MatrixSimilarity(lee.vectors_norm, num_features=lee.vector_size, num_best=10)
+        index = self.cls(lee.vectors_norm, num_cells=20, nprobe=20, num_best=10)
+        queries = lee.vectors_norm[:50]
+        for approx_sims, exact_sims in zip(index[queries], exact[queries]):
+            self.assertEqual([doc for doc, _ in approx_sims], [doc for doc, _ in exact_sims])
+            self.assertTrue(numpy.allclose([sim for _, sim in approx_sims], [sim for _, sim in exact_sims]))
+
+        index.nprobe = 4
+        hits = 0
+        for approx_sims, exact_sims in zip(index[queries], exact[queries]):
+            self.assertEqual(len(approx_sims), 10)
+            hits += len(set(doc for doc, _ in approx_sims) & set(doc for doc, _ in exact_sims))
+        self.assertGreater(hits / 500.0, 0.8)
+
+        sims = index[queries[0]]
+        self.assertEqual(sims[0][0], 0)
+        full = index.get_similarities(queries[0])
+        self.assertEqual(full.shape, (len(lee.vocab),))
+        self.assertEqual(sorted(numpy.nonzero(full)[0]), sorted(index._candidates(queries[0])[0]))
+
+    def testMmap(self):
+        index = self.cls(corpus, num_features=len(dictionary), num_cells=3, nprobe=1)
+        fname = get_tmpfile('gensim_similarities.tst.pkl')
+        index.save(fname, sep_limit=0)
+        index2 = self.cls.load(fname, mmap='r')
+        self.assertIsInstance(index2.index, numpy.memmap)
+        self.assertIsInstance(index2.cell_docs, numpy.memmap)
+        self.assertTrue(numpy.allclose(index[corpus], index2[corpus]))
+
+
+class TestIvfIndexer(unittest.TestCase):
+
+    def setUp(self):
+        from gensim.similarities.ivf import IvfIndexer
+
+        self.model = KeyedVectors.load_word2vec_format(datapath('lee_fasttext.vec'))
+        self.index = IvfIndexer(self.model, num_cells=10, nprobe=10)
+
+    def test_approx_neighbors_match_exact(self):
+        for word in ['night', 'fire', 'government']:
+            vector = self.model.word_vec(word, use_norm=True)
+            approx_neighbors = self.model.most_similar([vector], topn=5, indexer=self.index)
+            exact_neighbors = self.model.most_similar(positive=[vector], topn=5)
+            self.assertEqual([w for w, _ in approx_neighbors], [w for w, _ in exact_neighbors])
+
+    def test_save_load(self):
+        from gensim.similarities.ivf import IvfIndexer
+
+        fname = get_tmpfile('gensim_similarities.tst.ivf')
+        self.index.save(fname, sep_limit=0)
+        index2 = IvfIndexer.load(fname, mmap='r')
+        self.assertIsNone(index2.model)
+        self.assertEqual(self.index.labels, index2.labels)
+        self.assertIsInstance(index2.index.index, numpy.memmap)
+
+        vector = self.model.vectors_norm[5]
+        self.assertEqual(self.index.most_similar(vector, 10), index2.most_similar(vector, 10))
+
+    def test_doc2vec(self):
+        from gensim.similarities.ivf import IvfIndexer
+
+        model = doc2vec.Doc2Vec(sentences, min_count=1, seed=42)
+        index = IvfIndexer(model, num_cells=3, nprobe=3)
+        vector = model.docvecs.vectors_docs_norm[0]
+        approx_neighbors = model.docvecs.most_similar([vector], topn=5, indexer=index)
+        exact_neighbors = model.docvecs.most_similar(positive=[vector], topn=5)
+        self.assertEqual([d for d, _ in approx_neighbors], [d for d, _ in exact_neighbors])
+
 
 class TestSimilarity(unittest.TestCase, _TestSimilarityABC):
     def setUp(self):
@@ -533,6 +712,237 @@ class TestSimilarity(unittest.TestCase, _TestSimilarityABC):
         self.assertTrue(numpy.allclose(expected, sims))
         index.destroy()
 
+    def testWorkers(self):
+        """test querying the shards by a persistent pool of threads"""
+        for num_best in [None, 3]:
+            serial = self.cls(None, corpus, num_features=len(dictionary), num_best=num_best, shardsize=2)
+            index = self.cls(None, corpus, num_features=len(dictionary), num_best=num_best, shardsize=2, workers=3)
+            for query in [corpus[0], corpus]:
+                self.assertTrue(numpy.allclose(serial[query], index[query]))
+            pool = index.pool
+            self.assertIsNotNone(pool)
+            _ = index[corpus[1]]  # noqa:F841
+            self.assertIs(pool, index.pool)
+
+            fname = get_tmpfile('gensim_similarities.tst.pkl')
+            index.save(fname)
+            self.assertIs(pool, index.pool)
+            loaded = self.cls.load(fname)
+            self.assertIsNone(loaded.pool)
+            self.assertTrue(numpy.allclose(serial[corpus], loaded[corpus]))
+            loaded.close_pool()
+            serial.destroy()
+            index.destroy()
+            self.assertIsNone(index.pool)
+
+    def testWorkersCollected(self):
+        """test that the query and prefetch threads are stopped when an index is garbage collected"""
+        gc.collect()
+        threads = threading.active_count()
+        prefix = get_tmpfile('gensim_similarities.collected')
+        for i in range(5):
+            index = self.cls(
+                prefix + str(i), corpus, num_features=len(dictionary), shardsize=2, workers=4,
+                max_open_shards=1, prefetch_shards=True,
+            )
+            _ = index[corpus]  # noqa:F841
+            self.assertIsNotNone(index.shard_cache.prefetcher)
+            index.attach_shard_cache()
+            _ = index[corpus]  # noqa:F841
+            self.assertGreater(threading.active_count(), threads)
+            del index
+        gc.collect()
+        self.assertEqual(threads, threading.active_count())
+        for fname in glob.glob(prefix + '*'):
+            os.remove(fname)
+
+    def testTopk(self):
+        """test merging the num_best most similar documents of every shard"""
+        expected = similarities.MatrixSimilarity(corpus, num_features=len(dictionary), num_best=4)[corpus]
+        for shardsize in [1, 2, 5, 1000]:
+            index = self.cls(None, corpus, num_features=len(dictionary), num_best=4, shardsize=shardsize)
+            sims = index[corpus]
+            self.assertEqual(len(expected), len(sims))
+            for expected_doc, doc in zip(expected, sims):
+                # documents tied at the num_best-th similarity may be picked in either order, compare similarities
+                self.assertTrue(numpy.allclose([sim for _, sim in expected_doc], [sim for _, sim in doc]))
+
+            shard = index.shards[0]
+            shard.normalize = True
+            ids, shard_sims = shard.topk(corpus, 3)
+            self.assertEqual((len(corpus), min(3, len(shard))), ids.shape)
+            self.assertEqual(ids.shape, shard_sims.shape)
+            self.assertTrue(numpy.all(numpy.diff(numpy.abs(shard_sims), axis=1) <= 0))
+            self.assertTrue(numpy.all(ids[numpy.abs(shard_sims) <= 1e-9] == -1))
+            index.destroy()
+
+    def testShardCache(self):
+        """test keeping the open shards within a budget"""
+        expected = self.cls(None, corpus, num_features=len(dictionary), shardsize=2)
+        index = self.cls(None, corpus, num_features=len(dictionary), shardsize=2, max_open_shards=2)
+        cache = index.shard_cache
+        self.assertTrue(numpy.allclose(expected[corpus], index[corpus]))
+        for expected_chunk, chunk in zip(expected.iter_chunks(), index.iter_chunks()):
+            self.assertEqual(expected_chunk.shape, chunk.shape)
+        self.assertTrue(len(cache) <= 2)
+        self.assertTrue(cache.evictions > 0)
+        misses = cache.misses
+        _ = index[corpus[0]]  # noqa:F841 sweeps all shards again, each evicted before it is used again
+        self.assertEqual(misses + len(index.shards), cache.misses)
+        self.assertTrue(numpy.allclose(expected.vector_by_id(4).toarray(), index.vector_by_id(4).toarray()))
+
+        index.max_open_shards, index.max_open_bytes = None, 1
+        fname = get_tmpfile('gensim_similarities.tst.pkl')
+        index.save(fname)
+        index = self.cls.load(fname)
+        cache = index.shard_cache
+        self.assertEqual(0, len(cache))
+        self.assertTrue(numpy.allclose(expected[corpus], index[corpus]))
+        self.assertEqual(1, len(cache))  # the most recently used shard is kept, even though over budget
+        self.assertEqual(len(index.shards), cache.misses)
+
+        index = self.cls.load(fname)
+        index.prefetch_shards = True
+        index.attach_shard_cache()
+        cache = index.shard_cache
+        index.shards[0].get_index()
+        cache.prefetcher.apply(len, ([],))  # wait for the prefetch to finish
+        self.assertEqual(1, cache.prefetches)
+        self.assertTrue(index.shards[1] in cache.indexes)
+        self.assertTrue(numpy.allclose(expected[corpus], index[corpus]))
+        index.destroy()
+        self.assertEqual(0, len(cache))
+        expected.destroy()
+
+    def testShardCachePrefetchUnlocked(self):
+        """test that loading a shard in the background does not block requests for the open shards"""
+        index = self.cls(None, corpus, num_features=len(dictionary), shardsize=2, prefetch_shards=True)
+        cache = index.shard_cache
+        cache.clear()
+        loading, release = threading.Event(), threading.Event()
+        load = cache._load
+
+        def slow_load(shard):
+            if shard is index.shards[1]:
+                loading.set()
+                release.wait(10)
+            return load(shard)
+
+        cache._load = slow_load
+        index.shards[0].get_index()  # opens shard 0 and starts prefetching shard 1
+        self.assertTrue(loading.wait(10))
+        requested = threading.Thread(target=index.shards[0].get_index)
+        requested.start()
+        requested.join(5)
+        served = not requested.is_alive()
+        release.set()
+        requested.join()
+        self.assertTrue(served)
+        cache.prefetcher.apply(len, ([],))  # wait for the prefetch to finish
+        self.assertEqual(1, cache.prefetches)
+        self.assertTrue(index.shards[1] in cache.indexes)
+        index.destroy()
+
+    def testDeleteUpdate(self):
+        """test deleting and updating documents, and compacting their shards"""
+        changed = list(corpus)
+        changed[1], changed[4], changed[6] = [], [], corpus[0]
+        expected = similarities.MatrixSimilarity(changed, num_features=len(dictionary))
+        index = self.cls(None, corpus, num_features=len(dictionary), shardsize=2)
+        index.delete_documents([1, 4])
+        index.update_documents([6], [corpus[0]])
+        self.assertRaises(ValueError, index.delete_documents, [len(corpus)])
+
+        def check(index):
+            index.num_best = None
+            self.assertTrue(numpy.allclose(expected[corpus], index[corpus]))
+            self.assertTrue(numpy.allclose(expected[corpus[0]], index[corpus[0]]))
+            index.num_best = 3
+            for expected_doc, doc in zip(expected[corpus], index[corpus]):
+                expected_sims = [sim for sim in sorted(expected_doc, reverse=True)[:3] if sim]  # zeros are left out
+                self.assertTrue(numpy.allclose(expected_sims, [sim for _, sim in doc]))
+                self.assertFalse(set(docpos for docpos, _ in doc) & {1, 4})
+            for docpos in range(len(corpus)):
+                vector = index.vector_by_id(docpos)
+                vector = vector.toarray().ravel() if scipy.sparse.issparse(vector) else vector
+                self.assertTrue(numpy.allclose(expected.index[docpos], vector))
+            chunks = [chunk.toarray() if scipy.sparse.issparse(chunk) else chunk for chunk in index.iter_chunks()]
+            self.assertTrue(numpy.allclose(expected.index, numpy.vstack(chunks)))
+
+        check(index)
+        shards = list(index.shards)
+        index.compact()
+        self.assertEqual((set(), {}), (index.deleted, index.updates))
+        # only the shards of the changed documents 1, 4 and 6 are rewritten
+        self.assertEqual([False, True, False, False, True], [a is b for a, b in zip(shards, index.shards)])
+        check(index)
+
+        fname = get_tmpfile('gensim_similarities.tst.pkl')
+        index.save(fname)
+        self.assertFalse(os.path.exists(shards[2].fullname()))
+        self.assertTrue(os.path.exists(shards[1].fullname()))
+        index = self.cls.load(fname)
+        check(index)
+
+        # the last saved index stays loadable until the compacted index is saved
+        index.num_best = None
+        index.delete_documents([0])
+        index.save(fname)
+        index.compact()
+        self.assertTrue(numpy.allclose(index[corpus], self.cls.load(fname)[corpus]))
+        index.save(fname)
+        self.assertTrue(numpy.allclose(index[corpus], self.cls.load(fname)[corpus]))
+        changed[0] = []
+        expected = similarities.MatrixSimilarity(changed, num_features=len(dictionary))
+        index.delete_documents([8])
+        changed[8] = []
+        expected = similarities.MatrixSimilarity(changed, num_features=len(dictionary))
+        check(index)
+        index.compact(background=True).join()
+        self.assertEqual(set(), index.deleted)
+        check(index)
+        index.destroy()
+
+    def testBackgroundCompact(self):
+        """test changing the index while it is compacted in the background"""
+        changed = list(corpus) + list(corpus[:3])
+        changed[1], changed[8], changed[9] = [], [], []
+        expected = similarities.MatrixSimilarity(changed, num_features=len(dictionary))
+        for _ in range(5):
+            index = self.cls(None, corpus, num_features=len(dictionary), shardsize=2)
+            index.delete_documents([1, 8])
+            thread = index.compact(background=True)
+            index.add_documents(corpus[:3])  # reopens the last shard, which holds the deleted document 8
+            index.delete_documents([9])
+            _ = index[corpus]  # noqa:F841
+            thread.join()
+            self.assertTrue(numpy.allclose(expected[corpus], index[corpus]))
+            index.compact()
+            self.assertEqual((set(), {}), (index.deleted, index.updates))
+            self.assertTrue(numpy.allclose(expected[corpus], index[corpus]))
+            index.destroy()
+
+    def testBatchTopk(self):
+        """test storing the most similar documents of a streamed query corpus to disk"""
+        index = self.cls(None, corpus, num_features=len(dictionary), shardsize=2, workers=2)
+        index.delete_documents([1])
+        index.update_documents([6], [corpus[0]])
+        fname = get_tmpfile('gensim_similarities.tst.topk')
+        for k in [3, len(corpus) + 2]:
+            ids, sims = index.batch_topk(iter(corpus), k, fname, chunksize=4, num_queries=len(corpus))
+            self.assertEqual((numpy.int32, numpy.float32), (ids.dtype, sims.dtype))
+            self.assertEqual((len(corpus), k), ids.shape)
+            self.assertTrue(numpy.array_equal(ids, numpy.load(fname + '.ids.npy', mmap_mode='r')))
+            self.assertTrue(numpy.array_equal(sims, numpy.load(fname + '.sims.npy', mmap_mode='r')))
+            index.num_best = k
+            for doc, doc_ids, doc_sims in zip(index[corpus], ids, sims):
+                self.assertTrue(numpy.allclose([sim for _, sim in doc], doc_sims[:len(doc)]))
+                self.assertTrue(numpy.all(doc_ids[len(doc):] == -1))
+                self.assertTrue(numpy.all(doc_sims[len(doc):] == 0))
+                self.assertNotIn(1, doc_ids)
+        self.assertRaises(ValueError, index.batch_topk, corpus, 3, fname, num_queries=len(corpus) - 1)
+        index.destroy()
+
     def testNlargest(self):
         sims = ([(0, 0.8), (1, 0.2), (2, 0.0), (3, 0.0), (4, -0.1), (5, -0.15)],)
         expected = [(0, 0.8), (1, 0.2), (5, -0.15)]
@@ -852,6 +1262,109 @@ class TestDoc2VecNmslibIndexer(unittest.TestCase):
         self.assertEqual(self.index.query_time_params, self.index2.query_time_params)
 
 
+class TestHnswIndexer(unittest.TestCase):
+
+    def setUp(self):
+        from gensim.similarities import HnswIndexer
+
+        self.model = KeyedVectors.load_word2vec_format(datapath('lee_fasttext.vec'))
+        self.index = HnswIndexer(self.model, M=8, ef_construction=40, ef=50)
+
+    def test_vector_is_similar_to_itself(self):
+        vector = self.model.vectors_norm[0]
+        word, similarity = self.index.most_similar(vector, 1)[0]
+
+        self.assertEqual(word, self.model.index2word[0])
+        self.assertAlmostEqual(similarity, 1.0, places=5)
+
+    def test_approx_neighbors_match_exact(self):
+        for word in ['night', 'fire', 'government']:
+            vector = self.model.word_vec(word, use_norm=True)
+            approx_neighbors = self.model.most_similar([vector], topn=5, indexer=self.index)
+            exact_neighbors = self.model.most_similar(positive=[vector], topn=5)
+            self.assertEqual([w for w, _ in approx_neighbors], [w for w, _ in exact_neighbors])
+
+    def test_query(self):
+        vectors = self.model.vectors_norm[:10]
+        ids, sims = self.index.query(vectors, 3)
+        self.assertEqual(ids.shape, (10, 3))
+        self.assertEqual(sims.shape, (10, 3))
+        for i, vector in enumerate(vectors):
+            expected = self.index.most_similar(vector, 3)
+            self.assertEqual([self.index.labels[node] for node in ids[i]], [word for word, _ in expected])
+            self.assertTrue(numpy.allclose(sims[i], [sim for _, sim in expected]))
+
+        ids, sims = self.index.query(vectors[:2], len(self.model.vocab) + 5)
+        self.assertTrue((ids[:, -5:] == -1).all())
+        self.assertTrue(numpy.isinf(sims[:, -5:]).all())
+
+    def test_add_items(self):
+        from gensim.similarities.hnsw import HnswIndexer
+
+        index = HnswIndexer(M=8, ef_construction=40, ef=50)
+        half = len(self.model.vocab) // 2
+        index.add_items(self.model.vectors[:half], self.model.index2word[:half])
+        index.add_items(self.model.vectors[half:], self.model.index2word[half:])
+        self.assertEqual(index.count, len(self.model.vocab))
+        self.assertEqual(index.labels, self.model.index2word)
+
+        vector = self.model.word_vec('night', use_norm=True)
+        approx_neighbors = self.model.most_similar([vector], topn=5, indexer=index)
+        exact_neighbors = self.model.most_similar(positive=[vector], topn=5)
+        self.assertEqual([w for w, _ in approx_neighbors], [w for w, _ in exact_neighbors])
+
+        self.assertRaises(ValueError, index.add_items, self.model.vectors[:2], ['a'])
+        self.assertRaises(ValueError, index.add_items, self.model.vectors[:2, :5], ['a', 'b'])
+
+    def test_save_load(self):
+        from gensim.similarities.hnsw import HnswIndexer
+
+        fname = get_tmpfile('gensim_similarities.tst.hnsw')
+        self.index.save(fname, sep_limit=0)
+        index2 = HnswIndexer.load(fname, mmap='r')
+        self.assertIsNone(index2.model)
+        self.assertEqual(self.index.labels, index2.labels)
+        self.assertIsInstance(index2.layer0, numpy.memmap)
+        self.assertIsInstance(index2.upper, numpy.memmap)
+        self.assertTrue(numpy.array_equal(self.index.upper_offsets, index2.upper_offsets))
+
+        vector = self.model.vectors_norm[5]
+        self.assertEqual(self.index.most_similar(vector, 10), index2.most_similar(vector, 10))
+
+        # a memory-mapped index can still grow
+        index2.add_items(self.model.vectors[:1], ['duplicate'])
+        self.assertEqual(index2.labels[-1], 'duplicate')
+        self.assertEqual(
+            {self.model.index2word[0], 'duplicate'}, {word for word, _ in index2.most_similar(self.model.vectors[0], 2)}
+        )
+        self.assertFalse(isinstance(index2.upper, numpy.memmap))
+        self.assertEqual(len(index2.most_similar(vector, 10)), 10)
+
+    def test_word2vec(self):
+        from gensim.similarities.hnsw import HnswIndexer
+
+        model = word2vec.Word2Vec(texts, min_count=1, seed=42)
+        index = HnswIndexer(model)
+        vector = model.wv.vectors_norm[0]
+        approx_neighbors = model.wv.most_similar([vector], topn=5, indexer=index)
+        exact_neighbors = model.wv.most_similar(positive=[vector], topn=5)
+        self.assertEqual([w for w, _ in approx_neighbors], [w for w, _ in exact_neighbors])
+
+    def test_doc2vec(self):
+        from gensim.similarities.hnsw import HnswIndexer
+
+        model = doc2vec.Doc2Vec(sentences, min_count=1, seed=42)
+        index = HnswIndexer(model)
+        vector = model.docvecs.vectors_docs_norm[0]
+        doc, similarity = index.most_similar(vector, 1)[0]
+        self.assertEqual(doc, 0)
+        self.assertAlmostEqual(similarity, 1.0, places=5)
+
+        approx_neighbors = model.docvecs.most_similar([vector], topn=5, indexer=index)
+        exact_neighbors = model.docvecs.most_similar(positive=[vector], topn=5)
+        self.assertEqual([d for d, _ in approx_neighbors], [d for d, _ in exact_neighbors])
+
+
 class TestUniformTermSimilarityIndex(unittest.TestCase):
     def setUp(self):
         self.documents = [[u"government", u"denied", u"holiday"], [u"holiday", u"slowing", u"hollingworth"]]
@@ -999,6 +1512,33 @@ class TestSparseTermSimilarityMatrix(unittest.TestCase):
             [0.0, 0.0, 0.0, 0.0, 1.0]])
         self.assertTrue(numpy.all(expected_matrix == matrix))
 
+    def test_chunksize_workers(self):
+        """Test that chunked and parallel neighbour retrieval builds the same matrix."""
+        negative_index = UniformTermSimilarityIndex(self.dictionary, term_similarity=-0.3)
+        for kwargs in (
+                {'nonzero_limit': 2}, {'nonzero_limit': 2, 'symmetric': False},
+                {'nonzero_limit': 2, 'positive_definite': True}, {'nonzero_limit': 2, 'tfidf': self.tfidf},
+                {'nonzero_limit': 3, 'positive_definite': True, 'tfidf': self.tfidf}):
+            expected_matrix = SparseTermSimilarityMatrix(
+                negative_index, self.dictionary, chunksize=len(self.dictionary), **kwargs).matrix.todense()
+            for chunksize, workers in ((1, 1), (2, 1), (1, 2), (3, 2)):
+                matrix = SparseTermSimilarityMatrix(
+                    negative_index, self.dictionary, chunksize=chunksize, workers=workers, **kwargs).matrix
+                self.assertTrue(isinstance(matrix, scipy.sparse.csc_matrix))
+                self.assertTrue(numpy.all(expected_matrix == matrix.todense()))
+
+    def test_progress(self):
+        """Test that columns which are already full are counted as processed."""
+        class EagerMatrix(SparseTermSimilarityMatrix):
+            PROGRESS_MESSAGE_PERIOD = 1
+
+        for workers in (1, 2):
+            with self.assertLogs('gensim.similarities.termsim', level='INFO') as logs:
+                EagerMatrix(self.index, self.dictionary, nonzero_limit=1, chunksize=1, workers=workers)
+            progress = [message for message in logs.output if 'PROGRESS' in message]
+            self.assertEqual(len(self.dictionary), len(progress))
+            self.assertIn('(%d / %d,' % (len(self.dictionary), len(self.dictionary)), progress[-1])
+
     def test_encapsulation(self):
         """Test the matrix encapsulation."""
 
@@ -1123,6 +1663,60 @@ class TestSparseTermSimilarityMatrix(unittest.TestCase):
         self.assertTrue(numpy.allclose(expected_result, result.todense()))
 
 
+class TestAllPairs(unittest.TestCase):
+    def setUp(self):
+        rng = numpy.random.RandomState(0)
+        self.sparse = scipy.sparse.random(300, 60, density=0.08, format='csr', random_state=rng)
+        self.dense = rng.normal(size=(150, 10)).astype(numpy.float32)
+
+    def expected(self, matrix, threshold):
+        matrix = matrix.toarray() if scipy.sparse.issparse(matrix) else matrix
+        matrix = matrix / numpy.maximum(numpy.linalg.norm(matrix, axis=1), 1e-12)[:, None]
+        sims = numpy.dot(matrix, matrix.T)
+        return numpy.triu(numpy.where(sims >= threshold, sims, 0.0), k=1)
+
+    def assertPairs(self, expected, pairs):
+        self.assertTrue(scipy.sparse.isspmatrix_csr(pairs))
+        self.assertEqual(expected.shape, pairs.shape)
+        # pairs within rounding errors of the threshold may go either way
+        self.assertTrue(numpy.allclose(expected, pairs.toarray(), atol=1e-5))
+
+    def testSparse(self):
+        """test prefix filtering against all similarities"""
+        for threshold in [0.1, 0.5, 0.9, 1.0]:
+            expected = self.expected(self.sparse, threshold)
+            for blocksize in [7, 1024]:
+                self.assertPairs(expected, all_pairs(self.sparse, threshold, blocksize=blocksize))
+
+    def testDense(self):
+        """test blocked matrix products against all similarities"""
+        for threshold in [0.1, 0.5, 0.9]:
+            expected = self.expected(self.dense, threshold)
+            for blocksize in [7, 1024]:
+                self.assertPairs(expected, all_pairs(self.dense, threshold, blocksize=blocksize))
+
+    def testIndexes(self):
+        """test joining the documents of indexes"""
+        expected = self.expected(matutils.corpus2csc(corpus, len(dictionary)).T, 0.3)
+        for index in [
+                similarities.MatrixSimilarity(corpus, num_features=len(dictionary)),
+                similarities.SparseMatrixSimilarity(corpus, num_features=len(dictionary)),
+                similarities.Similarity(None, corpus, num_features=len(dictionary), shardsize=2)]:
+            self.assertPairs(expected, all_pairs(index, 0.3))
+        index.destroy()
+
+    def testWorkers(self):
+        """test joining blocks of documents in parallel"""
+        for matrix in [self.sparse, self.dense]:
+            expected = all_pairs(matrix, 0.3, blocksize=16)
+            pairs = all_pairs(matrix, 0.3, blocksize=16, workers=3, symmetric=True)
+            self.assertPairs(expected.toarray() + expected.T.toarray(), pairs)
+
+    def testThreshold(self):
+        self.assertRaises(ValueError, all_pairs, self.dense, 0.0)
+        self.assertRaises(ValueError, all_pairs, self.dense, 1.5)
+
+
 class TestLevenshteinDistance(unittest.TestCase):
     def test_max_distance(self):
         t1 = "holiday"
@@ -1134,6 +1728,33 @@ class TestLevenshteinDistance(unittest.TestCase):
         self.assertEqual(max_distance, levdist(t1, t2, 2))
         self.assertEqual(max_distance, levdist(t1, t2, -2))
 
+    @unittest.skipIf(levdist_batch is None, "the compiled Levenshtein kernel is unavailable")
+    def test_levdist_batch(self):
+        """Test that the batch kernel agrees with the dynamic programming definition of the distance."""
+        def expected_levdist(t1, t2, max_distance):
+            row = list(range(len(t1) + 1))
+            for j in range(1, len(t2) + 1):
+                diagonal, row[0] = row[0], j
+                for i in range(1, len(t1) + 1):
+                    above = row[i]
+                    row[i] = min(above + 1, row[i - 1] + 1, diagonal + (t1[i - 1] != t2[j - 1]))
+                    diagonal = above
+            return row[-1] if row[-1] <= max_distance else max(len(t1), len(t2))
+
+        terms = [
+            u"", u"a", u"holiday", u"day", u"hollingworth", u"h\u00f6liday", u"\U0001f600holiday",
+            u"abcdefghij" * 7, u"abcdefghij" * 6 + u"abcdefghi", u"bcdefghij" * 8]
+        chars = numpy.concatenate([_code_points(term) for term in terms])
+        indptr = numpy.cumsum([0] + [len(term) for term in terms]).astype(numpy.int64)
+        candidates = numpy.arange(len(terms), dtype=numpy.int64)
+        for t1 in terms:
+            for max_distance in (-1, 0, 2, 5, 100):
+                max_distances = numpy.full(len(terms), max_distance, dtype=numpy.int64)
+                distances = levdist_batch(_code_points(t1), chars, indptr, candidates, max_distances)
+                expected_distances = [expected_levdist(t1, t2, max_distance) for t2 in terms]
+                self.assertEqual(expected_distances, distances.tolist())
+                self.assertEqual(expected_distances, [levdist(t1, t2, max_distance) for t2 in terms])
+
 
 class TestLevenshteinSimilarity(unittest.TestCase):
     def test_empty_strings(self):
@@ -1236,6 +1857,33 @@ class TestLevenshteinSimilarityIndex(unittest.TestCase):
         similarity_matrix = SparseTermSimilarityMatrix(index, dictionary)
         self.assertTrue(scipy.sparse.issparse(similarity_matrix.matrix))
 
+    def test_candidate_index(self):
+        """Test that most_similar gives the same results as scoring every term."""
+        documents = self.documents + [
+            [u"holidays", u"holy", u"day", u"hollow", u"slow", u"sowing", u"government", u"governments"],
+            [u"deny", u"denies", u"worth", u"holling", u"a", u"", u"gov", u"xyz"]]
+        dictionary = Dictionary(documents)
+        for alpha, beta, threshold in ((1.8, 5.0, 0.0), (1.0, 1.0, 0.3), (1.8, 5.0, 0.05), (2.0, 2.0, 1.0)):
+            index = LevenshteinSimilarityIndex(dictionary, alpha=alpha, beta=beta, threshold=threshold, workers=2)
+            queries = list(dictionary.values()) + [u"holday", u"governmint", u"out-of-dictionary"]
+            for t1 in queries:
+                expected_results = sorted(
+                    [(levsim(t1, t2, alpha, beta, threshold), t2) for t2 in dictionary.values() if t1 != t2],
+                    reverse=True)
+                expected_results = [(t2, similarity) for similarity, t2 in expected_results if similarity > 0]
+                for topn in (1, 3, len(dictionary)):
+                    results = list(index.most_similar(t1, topn=topn))
+                    self.assertEqual(expected_results[:topn], results)
+            self.assertEqual(
+                [list(index.most_similar(t1, topn=3)) for t1 in queries], index.most_similar_batch(queries, topn=3))
+
+        # check that the candidate index survives saving and loading
+        index = LevenshteinSimilarityIndex(dictionary)
+        fname = get_tmpfile('gensim_similarities.tst.pkl')
+        index.save(fname)
+        loaded_index = LevenshteinSimilarityIndex.load(fname)
+        self.assertEqual(list(index.most_similar(u"holiday")), list(loaded_index.most_similar(u"holiday")))
+
 
 if __name__ == '__main__':
     logging.basicConfig(format='%(asctime)s : %(levelname)s : %(message)s', level=logging.DEBUG)
@@ -338,6 +338,16 @@ class HashTest(unittest.TestCase):
         actual = {k: gensim.models.utils_any2vec.ft_hash_broken(k) for k in self.expected}
         self.assertEqual(self.expected_broken, actual)
 
+    def test_ngram_hashes_batch(self):
+        words = list(self.expected) + [u'', u'a']
+        for fb_compatible in (True, False):
+            indptr, indices = gensim.models.utils_any2vec.ft_ngram_hashes_batch(
+                words, 1, 4, 2000, fb_compatible=fb_compatible)
+            self.assertEqual(len(indptr), len(words) + 1)
+            for i, word in enumerate(words):
+                expected = gensim.models.utils_any2vec.ft_ngram_hashes(word, 1, 4, 2000, fb_compatible=fb_compatible)
+                self.assertEqual(expected, indices[indptr[i]:indptr[i + 1]].tolist())
+
 
 #
 # Run with:
@@ -9,6 +9,8 @@ Automated tests for checking utils_any2vec functionality.
 """
 
 import logging
+import os
+import time
 import unittest
 
 import numpy as np
@@ -18,6 +20,11 @@ import gensim.test.utils
 
 import gensim.models.utils_any2vec
 
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
 
 logger = logging.getLogger(__name__)
 
@@ -116,6 +123,96 @@ class LoadWord2VecFormatTest(unittest.TestCase):
         self.verify_load2vec_binary_result(w2v_dict, binary_chunk_size=5, limit=None)
         self.verify_load2vec_binary_result(w2v_dict, binary_chunk_size=5, limit=1)
 
+    def verify_load2vec_binary_mmap_result(self, w2v_dict, limit):
+        tmpfile = gensim.test.utils.get_tmpfile("tmp_w2v_mmap")
+        save_dict_to_word2vec_formated_file(tmpfile, w2v_dict)
+        expected = gensim.models.utils_any2vec._load_word2vec_format(
+            cls=gensim.models.KeyedVectors, fname=tmpfile, binary=True, limit=limit)
+        for _ in range(2):  # the second load reuses the sidecar file
+            w2v_model = gensim.models.utils_any2vec._load_word2vec_format(
+                cls=gensim.models.KeyedVectors, fname=tmpfile, binary=True, limit=limit, mmap='r')
+            self.assertIsInstance(w2v_model.vectors, np.memmap)
+            self.assertEqual(expected.index2word, w2v_model.index2word)
+            np.testing.assert_array_equal(expected.vectors, w2v_model.vectors)
+
+    def test_load_word2vec_format_mmap(self):
+        w2v_dict = {"\nabc": [1, 2, 3],
+                    "cdefg": [4, 5, 6],
+                    "d": [7, 8, 9]}
+        self.verify_load2vec_binary_mmap_result(w2v_dict, limit=None)
+        self.verify_load2vec_binary_mmap_result(w2v_dict, limit=2)
+
+    def test_load_word2vec_format_mmap_sidecar(self):
+        tmpfile = gensim.test.utils.get_tmpfile("tmp_w2v_sidecar")
+        save_dict_to_word2vec_formated_file(tmpfile, {"abc": [1, 2, 3], "cde": [4, 5, 6]})
+        old_model = gensim.models.KeyedVectors.load_word2vec_format(tmpfile, binary=True, mmap='r')
+        self.assertEqual(old_model.vectors.filename, os.path.abspath(tmpfile + '.vectors.npy'))
+
+        # an outdated sidecar is replaced by a new file, the old one stays valid for whoever still maps it
+        save_dict_to_word2vec_formated_file(tmpfile, {"abc": [1, 2, 3], "cde": [4, 5, 6], "def": [7, 8, 9]})
+        os.utime(tmpfile, (time.time() + 10, time.time() + 10))
+        w2v_model = gensim.models.KeyedVectors.load_word2vec_format(tmpfile, binary=True, mmap='r')
+        self.assertEqual(w2v_model.vectors.shape, (3, 3))
+        self.assertSequenceEqual(list(w2v_model['def']), [7, 8, 9])
+        self.assertSequenceEqual(list(old_model['cde']), [4, 5, 6])
+        dirname, basename = os.path.split(tmpfile)
+        self.assertEqual(
+            [basename + '.vectors.npy'],
+            [fname for fname in os.listdir(dirname) if fname.startswith(basename + '.')])
+
+        self.assertRaises(
+            ValueError, gensim.models.KeyedVectors.load_word2vec_format, tmpfile, binary=False, mmap='r')
+
+    def test_load_word2vec_format_mmap_unseekable(self):
+        plain = gensim.test.utils.get_tmpfile("tmp_w2v_mmap")
+        save_dict_to_word2vec_formated_file(plain, {"abc": [1, 2, 3], "cde": [4, 5, 6]})
+        tmpfile = plain + '.gz'
+        with open(plain, 'rb') as fin, gensim.utils.open(tmpfile, 'wb') as fout:
+            fout.write(fin.read())
+        self.assertRaises(
+            ValueError, gensim.models.KeyedVectors.load_word2vec_format, tmpfile, binary=True, mmap='r')
+
+    def test_load_word2vec_format_mmap_read_only(self):
+        tmpfile = gensim.test.utils.get_tmpfile("tmp_w2v_read_only")
+        save_dict_to_word2vec_formated_file(tmpfile, {"abc": [1, 2, 3], "cde": [4, 5, 6]})
+        # the sidecar can't be created next to a file in a read-only directory
+        with patch('tempfile.mkstemp', side_effect=OSError(13, 'Permission denied')):
+            w2v_model = gensim.models.KeyedVectors.load_word2vec_format(tmpfile, binary=True, mmap='r')
+        self.assertNotIsInstance(w2v_model.vectors, np.memmap)
+        self.assertSequenceEqual(list(w2v_model['cde']), [4, 5, 6])
+        self.assertFalse(os.path.exists(tmpfile + '.vectors.npy'))
+
+    def test_load_word2vec_format_text_workers(self):
+        tmpfile = gensim.test.utils.get_tmpfile("tmp_w2v_text")
+        with gensim.utils.open(tmpfile, 'wb') as fout:
+            fout.write(b"40 3\n")
+            for i in range(40):
+                # one duplicate word, one line without trailing newline
+                word = "w%i" % (i if i != 7 else 3)
+                fout.write(("%s %i %i.5 -%i\n" % (word, i, i, i)).encode('utf8')[:None if i < 39 else -1])
+
+        expected = gensim.models.KeyedVectors.load_word2vec_format(tmpfile)
+        self.assertEqual(len(expected.vocab), 39)
+        for limit in (None, 5, 39):
+            expected = gensim.models.KeyedVectors.load_word2vec_format(tmpfile, limit=limit)
+            w2v_model = gensim.models.KeyedVectors.load_word2vec_format(tmpfile, limit=limit, workers=3)
+            self.assertEqual(expected.index2word, w2v_model.index2word)
+            np.testing.assert_array_equal(expected.vectors, w2v_model.vectors)
+
+        # reading only the first lines doesn't scan the whole file in parallel
+        with patch('gensim.models.utils_any2vec._count_lines') as count_lines:
+            w2v_model = gensim.models.KeyedVectors.load_word2vec_format(tmpfile, limit=5, workers=3)
+        self.assertFalse(count_lines.called)
+        self.assertEqual(w2v_model.index2word, expected.index2word[:5])
+
+        with gensim.utils.open(tmpfile, 'wb') as fout:
+            fout.write(b"3 3\nabc 1 2 3\ncde 4 5\ndef 7 8 9\n")
+        self.assertRaises(ValueError, gensim.models.KeyedVectors.load_word2vec_format, tmpfile, workers=2)
+
+        with gensim.utils.open(tmpfile, 'wb') as fout:
+            fout.write(b"4 3\nabc 1 2 3\ncde 4 5 6\ndef 7 8 9\n")
+        self.assertRaises(EOFError, gensim.models.KeyedVectors.load_word2vec_format, tmpfile, workers=2)
+
 
 if __name__ == '__main__':
     logging.basicConfig(format='%(asctime)s : %(levelname)s : %(message)s', level=logging.DEBUG)
@@ -606,6 +606,27 @@ class TestWord2VecModel(unittest.TestCase):
         self.assertIn('correct', first_section)
         self.assertIn('incorrect', first_section)
 
+    def testEvaluateWordAnalogiesBatched(self):
+        """Test that batched analogy evaluation agrees with most_similar, in threads and with 3CosMul"""
+        model = word2vec.Word2Vec(LeeCorpus())
+        score, sections = model.wv.evaluate_word_analogies(datapath('questions-words.txt'), chunksize=7)
+        for a, b, c, expected in sections[-1]['correct']:
+            predicted = model.wv.most_similar(positive=[b.lower(), c.lower()], negative=[a.lower()], topn=1)
+            self.assertEqual(expected, predicted[0][0].upper())
+
+        parallel_score, parallel_sections = model.wv.evaluate_word_analogies(
+            datapath('questions-words.txt'), chunksize=7, workers=3)
+        self.assertEqual(score, parallel_score)
+        self.assertEqual(sections, parallel_sections)
+
+        cosmul_score, cosmul_sections = model.wv.evaluate_word_analogies(
+            datapath('questions-words.txt'), method='3CosMul')
+        self.assertTrue(0.0 <= cosmul_score <= 1.0)
+        self.assertEqual(
+            sum(len(s['correct']) + len(s['incorrect']) for s in sections),
+            sum(len(s['correct']) + len(s['incorrect']) for s in cosmul_sections)
+        )
+
     def testEvaluateWordPairs(self):
         """Test Spearman and Pearson correlation coefficients give sane results on similarity datasets"""
         corpus = word2vec.LineSentence(datapath('head500.noblanks.cor.bz2'))
@@ -30,6 +30,7 @@ c_extensions = {
     'gensim.models._utils_any2vec': 'gensim/models/_utils_any2vec.c',
     'gensim._matutils': 'gensim/_matutils.c',
     'gensim.models.nmf_pgd': 'gensim/models/nmf_pgd.c',
+    'gensim.similarities._levenshtein': 'gensim/similarities/_levenshtein.c',
 }
 
 cpp_extensions = {